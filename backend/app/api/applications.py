@@ -1,28 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status, UploadFile, File, Form, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, contains_eager, joinedload
 from typing import List, Optional
 import uuid
+from datetime import datetime
+import zipfile
 from ..database import get_db
-from ..models.application import Application, ApplicationScore
+from ..models.application import Application
 from ..models.job import Job
 from ..models.user import User
 from ..schemas.application import (
     ApplicationCreate, ApplicationResponse, ApplicationUpdate, 
     ApplicationListResponse, ApplicationStatsResponse
 )
-from ..services.scoring_service import ScoringService
-from ..utils.file_utils import save_uploaded_file, validate_file_type
-from ..utils.resume_parser import parse_resume
-from ..utils.email import send_application_confirmation, send_shortlist_notification
+from ..services.scoring_service import ScoringService, AUTOMATIC_STATUSES
+from ..services.resume_cache import ResumeParseCacheService
+from ..services.bulk_import import BulkImportService
+from ..services.skill_index import SkillIndexService
+from ..services.duplicate_detection import DuplicateDetectionService
+from ..utils.file_utils import save_uploaded_file, validate_file_type, delete_file
+from ..utils.email import send_shortlist_notification
+from ..utils.skill_query import SkillQueryError, skill_key
+from ..utils.pagination import encode_cursor, decode_cursor, keyset_after
+from ..utils.metrics import timer
+from ..tasks.application_tasks import enqueue_application, run_application_pipeline
+from ..tasks.import_tasks import enqueue_bulk_import, run_bulk_import
+from ..config import settings
 from .auth import get_current_user
 import logging
 
 router = APIRouter()
 scoring_service = ScoringService()
+resume_cache = ResumeParseCacheService()
+bulk_import_service = BulkImportService()
+skill_index = SkillIndexService()
+duplicate_detection = DuplicateDetectionService()
 logger = logging.getLogger(__name__)
 
 @router.post("/apply")
+@timer("apply")
 async def submit_application(
+    background_tasks: BackgroundTasks,
     job_id: int = Form(...),
     candidate_name: str = Form(...),
     candidate_email: str = Form(...),
@@ -38,11 +56,12 @@ async def submit_application(
     """Submit a job application (public endpoint)"""
     try:
         # Validate job exists and is published
-        job = db.query(Job).filter(
-            Job.id == job_id,
-            Job.status == "published",
-            Job.is_active == True
-        ).first()
+        with timer("apply.job_lookup"):
+            job = db.query(Job).filter(
+                Job.id == job_id,
+                Job.status == "published",
+                Job.is_active == True
+            ).first()
         
         if not job:
             raise HTTPException(
@@ -58,7 +77,8 @@ async def submit_application(
             )
         
         # Save resume file
-        filename, filepath = await save_uploaded_file(resume)
+        with timer("apply.save_file"):
+            filename, filepath, file_hash = await save_uploaded_file(resume)
         
         # Generate reference number
         reference_number = f"REF-{str(uuid.uuid4())[:8].upper()}"
@@ -76,49 +96,32 @@ async def submit_application(
             additional_info=additional_info,
             resume_filename=filename,
             resume_path=filepath,
+            resume_hash=file_hash,
             job_id=job_id,
-            status="pending"
+            status="pending",
+            processing_status="queued"
         )
         
         db.add(application)
-        db.commit()
-        db.refresh(application)
-        
-        # Parse resume in background
-        try:
-            parsed_data = parse_resume(filepath, filename)
-            
-            # Update application with parsed data
-            application.parsed_skills = parsed_data.get('parsed_skills', [])
-            application.parsed_experience = parsed_data.get('parsed_experience', [])
-            application.parsed_education = parsed_data.get('parsed_education', [])
-            application.parsed_certifications = parsed_data.get('parsed_certifications', [])
-            
+        with timer("apply.db_commit"):
             db.commit()
-            
-            # Score the application
-            await scoring_service.score_application(db, application)
-            
-        except Exception as e:
-            logger.error(f"Error processing resume for application {application.id}: {e}")
+            db.refresh(application)
         
-        # Send confirmation email
-        try:
-            send_application_confirmation(
-                application.email,
-                application.full_name,
-                job.title,
-                application.reference_number
-            )
-        except Exception as e:
-            logger.error(f"Error sending confirmation email: {e}")
+        # Parse, score and notify in the background worker; publishing blocks while the broker is unreachable
+        with timer("apply.enqueue"):
+            enqueued = await run_in_threadpool(enqueue_application, application.id)
+        if not enqueued:
+            background_tasks.add_task(run_application_pipeline, application.id)
         
         return {
             "id": application.id,
             "reference_number": application.reference_number,
+            "processing_status": application.processing_status,
             "message": "Application submitted successfully"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error submitting application: {e}")
         raise HTTPException(
@@ -128,12 +131,14 @@ async def submit_application(
 
 @router.get("/")
 async def get_applications(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     job_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
     sort: Optional[str] = Query("created_at"),
     order: Optional[str] = Query("desc"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page (final_score and created_at sorts)"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -145,7 +150,8 @@ async def get_applications(
                 detail="Only HR and Admin can view applications"
             )
         
-        query = db.query(Application).join(Job)
+        # Load the job in the same query; scores are columns on the application
+        query = db.query(Application).join(Job).options(contains_eager(Application.job))
         
         # Filter by company for non-admin users
         if current_user.user_type != "admin":
@@ -161,11 +167,34 @@ async def get_applications(
         sort_field = sort or "created_at"
         sort_order = order or "desc"
         
-        if sort_field == "created_at":
-            if sort_order == "desc":
-                query = query.order_by(Application.created_at.desc())
-            else:
-                query = query.order_by(Application.created_at.asc())
+        # Score and date sorts page by keyset: (sort value, id) of the last row
+        keyset_columns = {
+            "final_score": Application.final_score,
+            "ai_score": Application.final_score,
+            "created_at": Application.created_at
+        }
+        keyset_column = keyset_columns.get(sort_field)
+        
+        if keyset_column is not None:
+            descending = sort_order == "desc"
+            if cursor:
+                try:
+                    last_value, last_id = decode_cursor(cursor)
+                    if last_value is not None and keyset_column is Application.created_at:
+                        last_value = datetime.fromisoformat(last_value)
+                except ValueError:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Invalid cursor"
+                    )
+                query = query.filter(keyset_after(keyset_column, Application.id, last_value, last_id, descending))
+            sort_column = keyset_column.desc() if descending else keyset_column.asc()
+            query = query.order_by(sort_column.nullslast(), Application.id.asc())
+        elif cursor:
+            raise HTTPException(
+                status_code=400,
+                detail="Cursor paging is only supported when sorting by final_score or created_at"
+            )
         elif sort_field == "candidate_name":
             if sort_order == "desc":
                 query = query.order_by(Application.full_name.desc())
@@ -175,7 +204,14 @@ async def get_applications(
             # Default fallback
             query = query.order_by(Application.created_at.desc())
         
-        applications = query.offset(skip).limit(limit).all()
+        # A cursor already marks where the page starts
+        if not cursor:
+            query = query.offset(skip)
+        applications = query.limit(limit).all()
+        
+        if keyset_column is not None and len(applications) == limit:
+            last = applications[-1]
+            response.headers["X-Next-Cursor"] = encode_cursor([getattr(last, keyset_column.key), last.id])
         
         # Transform to include job title and scores
         result = []
@@ -195,28 +231,21 @@ async def get_applications(
                 "resume_url": f"/api/files/{app.resume_filename}" if app.resume_filename else None,
                 "created_at": app.created_at,
                 "updated_at": app.updated_at,
-                "processed_at": getattr(app, 'processed_at', None),
-                "ai_score": None,
-                "match_score": None,
-                "ats_score": None,
-                "ai_summary": None,
+                "processed_at": app.processed_at,
+                "processing_status": app.processing_status,
+                "ai_score": app.final_score,
+                "match_score": app.match_score,
+                "ats_score": app.ats_score,
+                "ai_summary": app.ai_feedback,
                 "skills_match": []
             }
             
-            # Get scores if available
-            scores = db.query(ApplicationScore).filter(ApplicationScore.application_id == app.id).first()
-            if scores:
-                app_dict.update({
-                    "ai_score": scores.final_score,
-                    "match_score": scores.match_score,
-                    "ats_score": scores.ats_score,
-                    "ai_summary": scores.ai_feedback
-                })
-            
             result.append(app_dict)
     
         return result
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting applications: {e}")
         raise HTTPException(
@@ -275,6 +304,158 @@ async def get_application_stats(
         by_status=status_stats
     )
 
+@router.get("/search")
+async def search_applications(
+    skills: str = Query(..., description='Boolean skill query, e.g. kubernetes AND go NOT java'),
+    job_id: Optional[int] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Search applicants across jobs by skills, ranked by skill overlap (HR and Admin only)"""
+    if current_user.user_type not in ["hr", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only HR and Admin can search applications"
+        )
+    
+    company_id = None if current_user.user_type == "admin" else current_user.company_id
+    try:
+        total, rows, wanted = skill_index.search(db, skills, company_id=company_id, job_id=job_id, skip=skip, limit=limit)
+    except SkillQueryError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid skill query: {e}"
+        )
+    
+    wanted = set(wanted)
+    results = []
+    for app, overlap in rows:
+        results.append({
+            "id": app.id,
+            "reference_number": app.reference_number,
+            "candidate_name": app.full_name,
+            "candidate_email": app.email,
+            "job_title": app.job.title if app.job else "Unknown",
+            "job_id": app.job_id,
+            "status": app.status,
+            "ai_score": app.final_score,
+            "skill_overlap": overlap,
+            "matched_skills": [skill for skill in app.parsed_skills or [] if skill_key(skill) in wanted],
+            "created_at": app.created_at
+        })
+    
+    return {
+        "query": skills,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "results": results
+    }
+
+@router.get("/parse-cache/stats")
+async def get_parse_cache_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Get resume parse cache hit/miss counters (Admin only)"""
+    if current_user.user_type != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can view parse cache statistics"
+        )
+    
+    return await resume_cache.get_stats()
+
+@router.post("/bulk-import")
+async def bulk_import_applications(
+    background_tasks: BackgroundTasks,
+    job_id: int = Form(...),
+    archive: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Import a ZIP of resumes as applications for a job (HR and Admin only)"""
+    if current_user.user_type not in ["hr", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only HR and Admin can import applications"
+        )
+    
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    if current_user.user_type != "admin" and job.company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    if not (archive.filename or "").lower().endswith(".zip"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file type. Please upload a ZIP archive."
+        )
+    
+    _, archive_path, _ = await save_uploaded_file(
+        archive,
+        upload_dir=settings.bulk_import_dir,
+        max_size=settings.bulk_import_max_archive_size
+    )
+    if not zipfile.is_zipfile(archive_path):
+        delete_file(archive_path)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The uploaded file is not a valid ZIP archive"
+        )
+    
+    import_id = uuid.uuid4().hex
+    await bulk_import_service.save_progress(bulk_import_service.new_report(import_id, job_id))
+    
+    # Parse and insert in the background worker
+    if not await run_in_threadpool(enqueue_bulk_import, import_id, job_id, archive_path, cleanup=True):
+        background_tasks.add_task(run_bulk_import, import_id, job_id, archive_path, True)
+    
+    return {
+        "import_id": import_id,
+        "status": "queued",
+        "message": "Bulk import started"
+    }
+
+@router.get("/bulk-import/{import_id}")
+async def get_bulk_import_progress(
+    import_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get progress and the per-file error report of a bulk import"""
+    if current_user.user_type not in ["hr", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only HR and Admin can view imports"
+        )
+    
+    report = await bulk_import_service.get_progress(import_id)
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import not found"
+        )
+    
+    if current_user.user_type != "admin":
+        job = db.query(Job).filter(Job.id == report["job_id"]).first()
+        if not job or job.company_id != current_user.company_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied"
+            )
+    
+    return report
+
 @router.get("/{application_id}")
 async def get_application(
     application_id: int,
@@ -282,7 +463,7 @@ async def get_application(
     db: Session = Depends(get_db)
 ):
     """Get a specific application"""
-    application = db.query(Application).join(Job).filter(
+    application = db.query(Application).join(Job).options(contains_eager(Application.job)).filter(
         Application.id == application_id
     ).first()
     
@@ -319,27 +500,19 @@ async def get_application(
         "additional_info": application.additional_info,
         "resume_filename": application.resume_filename,
         "resume_url": f"/api/files/{application.resume_filename}" if application.resume_filename else None,
-        "resume_text": None,  # Would need to parse if needed
+        "resume_text": application.resume_document.text if application.resume_document else None,
         "created_at": application.created_at,
         "updated_at": application.updated_at,
-        "processed_at": getattr(application, 'processed_at', None),
-        "ai_score": None,
-        "match_score": None,
-        "ats_score": None,
-        "ai_summary": None,
-        "skills_match": []
+        "processed_at": application.processed_at,
+        "processing_status": application.processing_status,
+        "ai_score": application.final_score,
+        "match_score": application.match_score,
+        "ats_score": application.ats_score,
+        "ai_summary": application.ai_feedback,
+        "skills_match": [],
+        "duplicates": duplicate_detection.get_cluster(db, application)
     }
     
-    # Get scores if available
-    scores = db.query(ApplicationScore).filter(ApplicationScore.application_id == application.id).first()
-    if scores:
-        app_dict.update({
-            "ai_score": scores.final_score,
-            "match_score": scores.match_score,
-            "ats_score": scores.ats_score,
-            "ai_summary": scores.ai_feedback
-        })
-    
     return app_dict
 
 @router.put("/{application_id}", response_model=ApplicationResponse)
@@ -377,6 +550,8 @@ async def update_application(
     update_fields = update_data.dict(exclude_unset=True)
     for field, value in update_fields.items():
         setattr(application, field, value)
+    if update_fields.get("status"):
+        application.status_manual = True
     
     db.commit()
     db.refresh(application)
@@ -429,6 +604,7 @@ async def update_application_status(
     new_status = status_data.get("status")
     if new_status:
         application.status = new_status
+        application.status_manual = True
         db.commit()
         db.refresh(application)
         
@@ -476,7 +652,10 @@ async def rescore_application(
         )
     
     try:
-        # Rescore the application
+        # An explicit rescore hands the status back to the scorer
+        application.status_manual = False
+        if application.status not in AUTOMATIC_STATUSES:
+            application.status = "submitted"
         score = await scoring_service.score_application(db, application)
         return {"message": "Application rescored successfully", "score": score.final_score}
     except Exception as e:
@@ -492,7 +671,7 @@ async def get_application_by_reference(
     db: Session = Depends(get_db)
 ):
     """Get application by reference number (public endpoint for candidates)"""
-    application = db.query(Application).filter(
+    application = db.query(Application).options(joinedload(Application.job)).filter(
         Application.reference_number == reference_number
     ).first()
     
@@ -513,21 +692,12 @@ async def get_application_by_reference(
         "status": application.status,
         "created_at": application.created_at,
         "updated_at": application.updated_at,
-        "processed_at": getattr(application, 'processed_at', None),
-        "ai_score": None,
-        "match_score": None,
-        "ats_score": None,
-        "ai_summary": None
+        "processed_at": application.processed_at,
+        "processing_status": application.processing_status,
+        "ai_score": application.final_score,
+        "match_score": application.match_score,
+        "ats_score": application.ats_score,
+        "ai_summary": application.ai_feedback
     }
     
-    # Get scores if available
-    scores = db.query(ApplicationScore).filter(ApplicationScore.application_id == application.id).first()
-    if scores:
-        app_dict.update({
-            "ai_score": scores.final_score,
-            "match_score": scores.match_score,
-            "ats_score": scores.ats_score,
-            "ai_summary": scores.ai_feedback
-        })
-    
     return app_dict
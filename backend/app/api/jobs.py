@@ -1,19 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status, Query
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from ..database import get_db
 from ..models.job import Job, JobRequirement
 from ..models.user import User
+from ..models.application import Application
 from ..schemas.job import (
     JobCreate, JobResponse, JobUpdate, JobGenerateFieldsRequest, 
-    JobGenerateFieldsResponse, JobGenerateDescriptionRequest, JobGenerateDescriptionResponse
+    JobGenerateFieldsResponse, JobGenerateDescriptionRequest, JobGenerateDescriptionResponse,
+    ScoringSimulationRequest
 )
 from ..services.llm_service import LLMService
+from ..services.job_rescore import JobRescoreService
+from ..services.semantic_match import SemanticMatchService
+from ..services.score_simulator import ScoreSimulatorService
+from ..services.candidate_feedback import CandidateFeedbackService
+from ..config import settings
+from ..tasks.rescore_tasks import enqueue_job_rescore, run_job_rescore
+from ..tasks.feedback_tasks import enqueue_job_feedback, run_job_feedback
+from ..utils.pagination import encode_cursor, decode_cursor
 from .auth import get_current_user
 from datetime import datetime
+import json
 
 router = APIRouter()
 llm_service = LLMService()
+job_rescore_service = JobRescoreService()
+semantic_match_service = SemanticMatchService()
+score_simulator = ScoreSimulatorService()
+candidate_feedback_service = CandidateFeedbackService()
+
+# Job fields that feed into application scores
+SCORING_FIELDS = ("key_skills", "certifications")
+# Job fields behind the description vector used for semantic matching
+DESCRIPTION_FIELDS = ("title", "description")
+
+async def queue_job_run(service, job_id: int, background_tasks: BackgroundTasks, enqueue, run, *args) -> dict:
+    """Start a background run (rescore, feedback) for the job, or have the active one go again when it finishes.
+
+    The run goes to Celery, or to this process's background tasks if the broker is down.
+    """
+    progress, start = await service.tracker.request(job_id, service.new_progress(job_id))
+    if start and not await run_in_threadpool(enqueue, job_id, *args):
+        background_tasks.add_task(run, job_id, *args)
+    return progress
+
+async def queue_job_rescore(job_id: int, background_tasks: BackgroundTasks) -> dict:
+    """Start a rescore of the job's changed applications unless one is already pending"""
+    return await queue_job_run(job_rescore_service, job_id, background_tasks, enqueue_job_rescore, run_job_rescore)
 
 @router.post("/generate-fields", response_model=JobGenerateFieldsResponse)
 async def generate_job_fields(
@@ -31,7 +67,8 @@ async def generate_job_fields(
     result = await llm_service.generate_job_fields(
         request.project_name,
         request.role_title,
-        request.role_description
+        request.role_description,
+        regenerate=request.regenerate
     )
     
     return JobGenerateFieldsResponse(**result)
@@ -56,11 +93,75 @@ async def generate_job_description(
         request.key_skills,
         request.required_experience,
         request.certifications,
-        request.additional_requirements
+        request.additional_requirements,
+        regenerate=request.regenerate
     )
     
     return JobGenerateDescriptionResponse(**result)
 
+def format_sse(event: str, data: dict) -> str:
+    """One server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/generate-description/stream")
+async def stream_job_description(
+    request: JobGenerateDescriptionRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Generate a job description, streaming it as server-sent events (Account Managers only)
+
+    `delta` events carry {"field", "text"} pieces as the model writes them; the
+    final `done` event carries the complete description and short_description
+    (which replace the streamed text) and their source: model, cache or fallback.
+    """
+    if current_user.user_type not in ["account_manager", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only Account Managers can generate job descriptions"
+        )
+    
+    # get_db is only torn down after the response body ends; return the connection to the pool now
+    # rather than hold it for the whole generation (the stream needs nothing from the database)
+    db.close()
+    
+    async def events():
+        # Sent before the model call so the client sees the stream open immediately
+        yield ": generating\n\n"
+        async for event, data in llm_service.stream_job_description(
+            request.project_name,
+            request.role_title,
+            request.role_description,
+            request.key_skills,
+            request.required_experience,
+            request.certifications,
+            request.additional_requirements,
+            regenerate=request.regenerate
+        ):
+            if event == "done":
+                yield format_sse("done", data)
+            else:
+                yield format_sse("delta", {"field": event, "text": data})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/llm-cache/stats")
+async def get_llm_cache_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Get job generation cache hit/miss counters (Admin only)"""
+    if current_user.user_type != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can view LLM cache statistics"
+        )
+    
+    return await llm_service.cache.get_stats()
+
 @router.post("/", response_model=JobResponse)
 async def create_job(
     job_data: JobCreate,
@@ -199,6 +300,7 @@ async def get_public_job(job_id: int, db: Session = Depends(get_db)):
 
 @router.put("/{job_id}", response_model=JobResponse)
 async def update_job(
+    background_tasks: BackgroundTasks,
     job_id: int,
     job_data: JobUpdate,
     current_user: User = Depends(get_current_user),
@@ -226,14 +328,297 @@ async def update_job(
     
     # Update job fields
     update_data = job_data.dict(exclude_unset=True)
+    requirements_changed = any(
+        field in update_data and update_data[field] != getattr(job, field) for field in SCORING_FIELDS
+    )
+    description_changed = any(
+        field in update_data and update_data[field] != getattr(job, field) for field in DESCRIPTION_FIELDS
+    )
     for field, value in update_data.items():
         setattr(job, field, value)
     
+    if description_changed and job.description_vector is not None:
+        semantic_match_service.vectorize_job(job)
+        requirements_changed = requirements_changed or settings.semantic_score_weight > 0
+    
     db.commit()
     db.refresh(job)
     
+    # Re-evaluate existing applicants against the new requirements
+    if requirements_changed:
+        await queue_job_rescore(job.id, background_tasks)
+    
     return JobResponse.from_orm(job)
 
+@router.post("/{job_id}/rescore")
+async def rescore_job_applications(
+    background_tasks: BackgroundTasks,
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Rescore applications whose job requirements or scoring settings changed (HR and Admin only)"""
+    if current_user.user_type not in ["hr", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only HR and Admin can rescore applications"
+        )
+    
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    if current_user.user_type != "admin" and job.company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    return await queue_job_rescore(job.id, background_tasks)
+
+@router.get("/{job_id}/rescore")
+async def get_rescore_progress(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get progress of the job's latest rescore"""
+    if current_user.user_type not in ["hr", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only HR and Admin can view rescore progress"
+        )
+    
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    if current_user.user_type != "admin" and job.company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    progress = await job_rescore_service.get_progress(job_id)
+    if not progress:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No rescore found for this job"
+        )
+    return progress
+
+@router.post("/{job_id}/feedback")
+async def generate_candidate_feedback(
+    background_tasks: BackgroundTasks,
+    job_id: int,
+    regenerate: bool = Query(False, description="Also rewrite feedback that is already current"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Write LLM feedback for shortlisted and borderline candidates in the background (HR and Admin only)"""
+    if current_user.user_type not in ["hr", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only HR and Admin can generate candidate feedback"
+        )
+    
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    if current_user.user_type != "admin" and job.company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    return await queue_job_run(
+        candidate_feedback_service, job.id, background_tasks, enqueue_job_feedback, run_job_feedback, regenerate
+    )
+
+@router.get("/{job_id}/feedback")
+async def get_candidate_feedback_progress(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get progress of the job's latest candidate feedback run"""
+    if current_user.user_type not in ["hr", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only HR and Admin can view feedback progress"
+        )
+    
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    if current_user.user_type != "admin" and job.company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    progress = await candidate_feedback_service.get_progress(job_id)
+    if not progress:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No feedback run found for this job"
+        )
+    return progress
+
+def run_scoring_simulation(db: Session, request: ScoringSimulationRequest, job_id: Optional[int] = None, company_id: Optional[int] = None) -> dict:
+    """Resolve the configs and simulate them over the stored scores of a job or company"""
+    try:
+        configs = score_simulator.resolve_configs([config.dict() for config in request.configs])
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    components = score_simulator.load_components(db, job_id=job_id, company_id=company_id)
+    return score_simulator.simulate(db, components, configs, request.max_flipped)
+
+@router.post("/simulate-scoring")
+async def simulate_company_scoring(
+    request: ScoringSimulationRequest,
+    company_id: Optional[int] = Query(None, description="Admin only; defaults to your company"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Preview how statuses across the company's jobs would change under other scoring settings (HR and Admin only)"""
+    if current_user.user_type not in ["hr", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only HR and Admin can simulate scoring"
+        )
+    
+    if current_user.user_type != "admin" or company_id is None:
+        company_id = current_user.company_id
+    
+    result = run_scoring_simulation(db, request, company_id=company_id)
+    titles = dict(db.query(Job.id, Job.title).filter(Job.company_id == company_id).all())
+    for simulation in result["results"]:
+        for by_job in simulation["by_job"]:
+            by_job["job_title"] = titles.get(by_job["job_id"])
+    return {"company_id": company_id, **result}
+
+@router.post("/{job_id}/simulate-scoring")
+async def simulate_job_scoring(
+    job_id: int,
+    request: ScoringSimulationRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Preview how the job's application statuses would change under other scoring settings (HR and Admin only)"""
+    if current_user.user_type not in ["hr", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only HR and Admin can simulate scoring"
+        )
+    
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    if current_user.user_type != "admin" and job.company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    result = run_scoring_simulation(db, request, job_id=job_id)
+    for simulation in result["results"]:
+        for by_job in simulation["by_job"]:
+            by_job["job_title"] = job.title
+    return {"job_id": job_id, **result}
+
+@router.get("/{job_id}/shortlist")
+async def get_shortlist(
+    job_id: int,
+    response: Response,
+    k: int = Query(20, ge=1, le=100, description="Number of top candidates to return"),
+    min_score: Optional[float] = Query(None, ge=0, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the job's top scored candidates, best first (HR and Admin only)"""
+    if current_user.user_type not in ["hr", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only HR and Admin can view shortlists"
+        )
+    
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    if current_user.user_type != "admin" and job.company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    # Ordered like ix_applications_job_final_score so only the first k index entries are read
+    query = db.query(Application).filter(
+        Application.job_id == job_id,
+        Application.final_score.isnot(None)
+    )
+    if min_score is not None:
+        query = query.filter(Application.final_score >= min_score)
+    if cursor:
+        try:
+            last_score, last_id = decode_cursor(cursor)
+            last_score = float(last_score)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = query.filter(
+            (Application.final_score < last_score) |
+            ((Application.final_score == last_score) & (Application.id > last_id))
+        )
+    
+    applications = query.order_by(Application.final_score.desc().nullslast(), Application.id.asc()).limit(k).all()
+    if len(applications) == k:
+        response.headers["X-Next-Cursor"] = encode_cursor([applications[-1].final_score, applications[-1].id])
+    
+    return [
+        {
+            "id": app.id,
+            "reference_number": app.reference_number,
+            "candidate_name": app.full_name,
+            "candidate_email": app.email,
+            "status": app.status,
+            "ai_score": app.final_score,
+            "match_score": app.match_score,
+            "ats_score": app.ats_score,
+            "ai_summary": app.ai_feedback,
+            "created_at": app.created_at
+        }
+        for app in applications
+    ]
+
 @router.patch("/{job_id}/approve")
 async def approve_job(
     job_id: int,
@@ -296,6 +681,7 @@ async def publish_job(
     
     job.status = "published"
     job.published_at = datetime.utcnow()
+    semantic_match_service.vectorize_job(job)
     
     db.commit()
     
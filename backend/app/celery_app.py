@@ -0,0 +1,30 @@
+from celery import Celery
+from .config import settings
+
+# Create Celery application (Redis broker, shared with the API cache)
+celery_app = Celery(
+    "genai_hiring",
+    broker=settings.celery_broker_url or settings.redis_url,
+    backend=settings.celery_result_backend or settings.redis_url,
+    include=["app.tasks.application_tasks", "app.tasks.import_tasks", "app.tasks.rescore_tasks", "app.tasks.feedback_tasks"]
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    # Thread pool: tasks are I/O bound and hand CPU work to the resume parser pool,
+    # which cannot be started from daemonic prefork children
+    worker_pool="threads",
+    worker_concurrency=settings.celery_worker_concurrency,
+    task_always_eager=settings.celery_task_always_eager,
+    task_eager_propagates=False,
+    task_ignore_result=True,
+    task_publish_retry_policy={"max_retries": 2, "interval_start": 0, "interval_step": 0.5, "interval_max": 1},
+    result_expires=3600,
+    timezone="UTC",
+    enable_utc=True
+)
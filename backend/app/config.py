@@ -8,6 +8,12 @@ class Settings(BaseSettings):
     postgres_user: str = "postgres"
     postgres_password: str = "Maahi123"
     postgres_db: str = "genai_hiring"
+    # Connection pool, per process: PostgreSQL must allow (API workers + Celery workers) x (db_pool_size + db_max_overflow)
+    db_pool_size: int = 5  # Connections kept open
+    db_max_overflow: int = 10  # Extra connections opened under load, closed when returned
+    db_pool_timeout: float = 30.0  # Seconds to wait for a free connection before failing
+    db_pool_recycle: int = 1800  # Seconds before a connection is replaced (stay under server/proxy idle timeouts)
+    db_pool_pre_ping: bool = True  # Test connections on checkout, replacing ones the server dropped
     
     # Redis Configuration
     redis_url: str = "redis://localhost:6379"
@@ -27,6 +33,32 @@ class Settings(BaseSettings):
     # LLM API Configuration
     openai_api_key: str = "sk-ijkl1234ijkl1234ijkl1234ijkl1234ijkl1234"
     llm_model: str = "gpt-3.5-turbo"
+    llm_context_tokens: int = 4096  # Context window of llm_model, shared by prompt and answer
+    llm_min_completion_tokens: int = 300  # Room a prompt must leave for the answer; longer inputs are cut
+    llm_field_max_tokens: int = 600  # Longest free-text input (role description) kept in a prompt
+    llm_list_max_tokens: int = 120  # Per list input (skills, certifications, requirements)
+    llm_provider: str = "openai"  # "stub" returns canned completions in-process (offline development, load tests)
+    llm_base_url: Optional[str] = None  # OpenAI-compatible endpoint, e.g. llm_stub_server.py
+    llm_connect_timeout: float = 5.0  # Seconds
+    llm_read_timeout: float = 60.0  # Seconds between bytes of a response
+    llm_max_connections: int = 20  # Pooled HTTP connections to the provider
+    llm_max_keepalive_connections: int = 10
+    llm_keepalive_expiry: float = 60.0  # Seconds an idle connection is kept open
+    llm_cache_enabled: bool = True  # Reuse completions for identical generation inputs
+    llm_cache_ttl: int = 86400  # Seconds, both tiers; 1 day
+    llm_cache_max_entries: int = 512  # In-process LRU size
+    llm_max_concurrency: int = 4  # Completions in flight per process, across all its threads and event loops
+    llm_queue_timeout: float = 10.0  # Seconds to wait for a free slot before using the fallback
+    llm_max_retries: int = 3  # On rate limits, timeouts and 5xx responses
+    llm_retry_base_delay: float = 0.5  # Seconds, doubled per attempt with full jitter
+    llm_retry_max_delay: float = 8.0
+    llm_retry_budget: float = 20.0  # Max seconds of backoff per call, including Retry-After waits
+    llm_breaker_failure_threshold: int = 5  # Consecutive failures before skipping the provider
+    llm_breaker_reset_timeout: float = 30.0  # Seconds before probing the provider again
+    llm_stub_latency: float = 0.5  # Stub provider: seconds before the first token
+    llm_stub_token_latency: float = 0.01  # Stub provider: seconds per streamed piece
+    llm_stub_failure_rate: float = 0.0  # Stub provider: fraction of calls failing with a 503
+    llm_stub_rate_limit_rate: float = 0.0  # Stub provider: fraction of calls rejected with a 429
     
     # Email Configuration
     smtp_host: str = "smtp.gmail.com"
@@ -37,18 +69,59 @@ class Settings(BaseSettings):
     
     # File Upload Configuration
     max_file_size: int = 10485760  # 10MB
+    upload_chunk_size: int = 65536  # 64KB streamed per read
     upload_dir: str = "uploads"
+    resume_parse_cache_ttl: int = 604800  # Redis tier TTL, 7 days
+    
+    # Resume Parsing Configuration
+    resume_parser_workers: int = 2  # Dedicated parser processes
+    resume_parse_timeout: int = 30  # Wall-clock seconds per document
+    resume_max_pages: int = 20  # PDF pages read per resume
+    skill_taxonomy_path: Optional[str] = None  # Defaults to app/data/skill_taxonomy.json
     
     # Application Settings
     debug: bool = True
     environment: str = "development"
     secret_key: str = "your-super-secret-key-change-this-in-production"
     
+    # Metrics Configuration
+    metrics_enabled: bool = True  # Serve stage timings at /metrics; Server-Timing headers follow debug
+    
     # Scoring Configuration
     match_score_weight: float = 0.5
     ats_score_weight: float = 0.5
+    semantic_score_weight: float = 0.0  # TF-IDF resume/description similarity; 0 disables it
     shortlist_threshold: int = 80
     requalify_threshold: int = 60
+    score_history_enabled: bool = True  # Keep a compact ApplicationScore row per (re)score
+    
+    # Candidate Feedback Configuration
+    feedback_batch_size: int = 8  # Candidates packed into one LLM prompt
+    feedback_concurrency: int = 2  # Prompts in flight per feedback run
+    feedback_progress_ttl: int = 86400  # Progress retention in Redis, 1 day
+    
+    # Duplicate Detection Configuration
+    duplicate_similarity_threshold: float = 0.8  # Estimated Jaccard of resume shingles to flag a near-duplicate
+    
+    # Background Processing Configuration
+    celery_broker_url: Optional[str] = None  # Defaults to redis_url
+    celery_result_backend: Optional[str] = None  # Defaults to redis_url
+    celery_task_always_eager: bool = False  # Run tasks inline (offline testing)
+    application_task_max_retries: int = 3
+    application_task_retry_backoff: int = 10  # Seconds, doubled on each retry
+    celery_worker_concurrency: int = 4  # Worker threads; CPU work runs in the parser pool
+    
+    # Bulk Import Configuration
+    bulk_import_workers: int = 0  # Parser processes per import; 0 uses every CPU core
+    bulk_import_batch_size: int = 200  # Files per database transaction
+    bulk_import_max_archive_size: int = 524288000  # 500MB
+    bulk_import_dir: str = "imports"  # Uploaded archives waiting for the worker
+    bulk_import_report_ttl: int = 86400  # Progress/report retention in Redis, 1 day
+    
+    # Rescoring Configuration
+    rescore_chunk_size: int = 500  # Applications scored per transaction
+    rescore_progress_ttl: int = 86400  # Progress retention in Redis, 1 day
+    job_run_stale_after: int = 600  # Seconds without progress before a queued/running rescore or feedback run is presumed dead
     
     class Config:
         env_file = ".env"
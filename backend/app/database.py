@@ -1,21 +1,77 @@
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, exc
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import StaticPool, QueuePool
 from .config import settings
+from .utils.metrics import metrics
 import logging
 
 # Configure logging
 logging.basicConfig()
 logging.getLogger('sqlalchemy.engine').setLevel(logging.INFO)
 
+POOL_CHECKOUT_METRIC = "db_pool_checkout_seconds"
+POOL_CONNECTIONS_METRIC = "db_pool_connections"
+POOL_OVERFLOW_METRIC = "db_pool_overflow_total"
+POOL_TIMEOUTS_METRIC = "db_pool_timeouts_total"
+metrics.describe(POOL_CHECKOUT_METRIC, "Time to get a database connection, including waiting for a free one, pre-ping and connecting")
+metrics.describe(POOL_CONNECTIONS_METRIC, "Database connections of this process by state (in_use, idle, overflow) and the pool size")
+metrics.describe(POOL_OVERFLOW_METRIC, "Connections opened beyond db_pool_size because every pooled one was in use")
+metrics.describe(POOL_TIMEOUTS_METRIC, "Checkouts that gave up after db_pool_timeout seconds without a free connection")
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout took, how many timed out and how many overflowed"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            metrics.increment(POOL_TIMEOUTS_METRIC)
+            raise
+        finally:
+            metrics.observe(POOL_CHECKOUT_METRIC, time.perf_counter() - start)
+
+    def _create_connection(self):
+        # Only a new pool slot lands here, not pre-ping or recycle reconnects; the
+        # pool counts the slot first, so above zero it is an overflow one
+        record = super()._create_connection()
+        if self.overflow() > 0:
+            metrics.increment(POOL_OVERFLOW_METRIC)
+        return record
+
+def create_database_engine(database_url: str):
+    """Engine with a bounded, instrumented connection pool; SQLite (tests, local runs) shares one connection"""
+    if database_url.startswith("sqlite"):
+        return create_engine(
+            database_url,
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+            echo=settings.debug
+        )
+
+    database_engine = create_engine(
+        database_url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        echo=settings.debug
+    )
+
+    # Read through database_engine.pool, which dispose() replaces
+    metrics.gauge(POOL_CONNECTIONS_METRIC, lambda: database_engine.pool.checkedout(), state="in_use")
+    metrics.gauge(POOL_CONNECTIONS_METRIC, lambda: database_engine.pool.checkedin(), state="idle")
+    metrics.gauge(POOL_CONNECTIONS_METRIC, lambda: max(database_engine.pool.overflow(), 0), state="overflow")
+    metrics.gauge(POOL_CONNECTIONS_METRIC, lambda: database_engine.pool.size(), state="pool_size")
+
+    return database_engine
+
 # Create database engine
-engine = create_engine(
-    settings.database_url,
-    poolclass=StaticPool,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
-    echo=settings.debug
-)
+engine = create_database_engine(settings.database_url)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
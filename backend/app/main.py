@@ -1,10 +1,16 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from .database import create_tables
+from .utils.parser_pool import resume_parser_pool
+from .utils.skill_taxonomy import get_skill_taxonomy
+from .utils.metrics import metrics, collect_timings, server_timing_header
+from .services.llm_providers import close_provider
 from .config import settings
 from .api import auth, jobs, applications, companies, users
 import os
+import time
 
 # Create FastAPI app
 app = FastAPI(
@@ -30,6 +36,16 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+# Report per-stage timings to the browser dev tools while debugging
+if settings.debug:
+    @app.middleware("http")
+    async def add_server_timing(request: Request, call_next):
+        start = time.perf_counter()
+        with collect_timings() as timings:
+            response = await call_next(request)
+        response.headers["Server-Timing"] = server_timing_header(timings, time.perf_counter() - start)
+        return response
+
 # Create upload directory
 os.makedirs(settings.upload_dir, exist_ok=True)
 
@@ -48,6 +64,12 @@ app.include_router(applications.router, prefix="/api/applications", tags=["Appli
 async def health_check():
     return {"status": "healthy", "version": "1.0.0"}
 
+# Prometheus scrape endpoint for this process's stage timings
+if settings.metrics_enabled:
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    async def get_metrics():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -61,6 +83,13 @@ async def root():
 @app.on_event("startup")
 async def startup_event():
     create_tables()
+    get_skill_taxonomy()
+
+# Stop resume parser processes and close pooled LLM connections on shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    resume_parser_pool.shutdown()
+    await close_provider()
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,7 +1,8 @@
 from .user import User
 from .job import Job, JobRequirement
-from .application import Application, ApplicationScore
+from .application import Application, ApplicationScore, ApplicationSkill, ResumeBucket
 from .company import Company
+from .resume import ResumeParseCache, ResumeText, DocumentFrequency
 
 __all__ = [
     "User",
@@ -9,5 +10,10 @@ __all__ = [
     "JobRequirement",
     "Application",
     "ApplicationScore", 
-    "Company"
+    "ApplicationSkill",
+    "ResumeBucket",
+    "Company",
+    "ResumeParseCache",
+    "ResumeText",
+    "DocumentFrequency"
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, JSON
+from sqlalchemy import Column, Integer, SmallInteger, BigInteger, String, Text, DateTime, Boolean, ForeignKey, Float, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -20,6 +20,7 @@ class Application(Base):
     # Resume and Additional Info
     resume_filename = Column(String, nullable=False)
     resume_path = Column(String, nullable=False)
+    resume_hash = Column(String(64), nullable=True, index=True)  # SHA-256, key into the parse cache
     cover_letter = Column(Text, nullable=True)
     additional_info = Column(Text, nullable=True)
     
@@ -31,8 +32,14 @@ class Application(Base):
     
     # Application Status
     status = Column(String, default="submitted")  # submitted, under_review, shortlisted, rejected, interview_scheduled
+    status_manual = Column(Boolean, default=False)  # Set by HR; (re)scoring then leaves the status alone
     current_stage = Column(String, default="application")  # application, screening, interview, final
-    
+
+    # Background Processing (resume parsing, scoring, notification)
+    processing_status = Column(String, default="queued", index=True)  # queued, processing, done, failed
+    processing_attempts = Column(Integer, default=0)
+    processing_error = Column(Text, nullable=True)
+
     # Foreign Keys
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
     
@@ -40,16 +47,58 @@ class Application(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     reviewed_at = Column(DateTime(timezone=True), nullable=True)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Current Score (denormalized so list/detail reads need no extra query)
+    final_score = Column(Float, nullable=True)
+    match_score = Column(Float, nullable=True)
+    ats_score = Column(Float, nullable=True)
+    skills_match = Column(Float, nullable=True)
+    experience_match = Column(Float, nullable=True)
+    education_match = Column(Float, nullable=True)
+    certification_match = Column(Float, nullable=True)
+    semantic_match = Column(Float, nullable=True)  # Resume/description TF-IDF similarity, when weighted
+    ats_format_score = Column(Float, nullable=True)
+    ats_keywords_score = Column(Float, nullable=True)
+    ats_structure_score = Column(Float, nullable=True)
+    score_breakdown = Column(JSON, nullable=True)  # Same as ApplicationScore.scoring_details
+    ai_feedback = Column(Text, nullable=True)
+    ai_feedback_generated_at = Column(DateTime(timezone=True), nullable=True)  # When the LLM last wrote ai_feedback; stale if before scored_at
+    score_inputs_hash = Column(String(64), nullable=True, index=True)  # ScoringService.inputs_hash(job) at scoring time
+    scored_at = Column(DateTime(timezone=True), nullable=True)
     
+    # Near-duplicate resumes within the company share a group (id of the group's first application)
+    duplicate_group_id = Column(Integer, nullable=True, index=True)
+
     # Relationships
     job = relationship("Job", back_populates="applications")
-    scores = relationship("ApplicationScore", back_populates="application", cascade="all, delete-orphan")
+    scores = relationship("ApplicationScore", back_populates="application", cascade="all, delete-orphan")  # Score history
+    skills = relationship("ApplicationSkill", back_populates="application", cascade="all, delete-orphan")
+    resume_buckets = relationship("ResumeBucket", back_populates="application", cascade="all, delete-orphan")
+    # Full resume text, shared by applications with the same file; loaded only when accessed
+    resume_document = relationship(
+        "ResumeText",
+        primaryjoin="foreign(Application.resume_hash) == ResumeText.file_hash",
+        uselist=False,
+        viewonly=True,
+        lazy="select"
+    )
+
+    __table_args__ = (
+        # Serves per-job ranking (shortlist, final_score sort) as an ordered index range scan; queries
+        # must order by final_score DESC NULLS LAST, id to use it. SQLite can't declare NULLS LAST on an index
+        Index("ix_applications_job_final_score", "job_id", final_score.desc().nullslast(), "id").ddl_if(dialect="postgresql"),
+    )
 
 class ApplicationScore(Base):
+    """Score record; the current score lives on Application, rows here are optional history.
+
+    History rows keep the numeric breakdown but drop scoring_details and ai_feedback.
+    """
     __tablename__ = "application_scores"
     
     id = Column(Integer, primary_key=True, index=True)
-    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False, index=True)
     
     # Scoring Details
     match_score = Column(Float, nullable=False, default=0.0)  # Job-candidate match score
@@ -61,6 +110,7 @@ class ApplicationScore(Base):
     experience_match = Column(Float, nullable=True)
     education_match = Column(Float, nullable=True)
     certification_match = Column(Float, nullable=True)
+    semantic_match = Column(Float, nullable=True)
     
     # ATS Breakdown
     ats_format_score = Column(Float, nullable=True)
@@ -70,6 +120,7 @@ class ApplicationScore(Base):
     # Additional scoring data
     scoring_details = Column(JSON, nullable=True)  # Detailed breakdown
     ai_feedback = Column(Text, nullable=True)      # AI-generated feedback
+    inputs_hash = Column(String(64), nullable=True, index=True)  # ScoringService.inputs_hash(job) at scoring time
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -77,3 +128,41 @@ class ApplicationScore(Base):
     
     # Relationships
     application = relationship("Application", back_populates="scores")
+
+class ApplicationSkill(Base):
+    """Inverted index row: one canonical skill of one application"""
+    __tablename__ = "application_skills"
+    __table_args__ = (
+        # Term lookups within a company return application ids from the index alone
+        Index("ix_application_skills_company_skill", "company_id", "skill_key", "application_id"),
+        Index("ix_application_skills_skill", "skill_key", "application_id"),
+    )
+    
+    application_id = Column(Integer, ForeignKey("applications.id", ondelete="CASCADE"), primary_key=True)
+    skill_key = Column(String, primary_key=True)  # Lowercased canonical skill name
+    skill = Column(String, nullable=False)  # Canonical skill name as displayed
+    
+    # Denormalized for company-scoped search
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    
+    # Relationships
+    application = relationship("Application", back_populates="skills")
+
+class ResumeBucket(Base):
+    """LSH index row: the bucket one band of an application's resume MinHash falls into"""
+    __tablename__ = "resume_buckets"
+    __table_args__ = (
+        # Candidate lookup for a new resume: one probe per band within the company
+        Index("ix_resume_buckets_company_bucket", "company_id", "bucket", "application_id"),
+    )
+    
+    application_id = Column(Integer, ForeignKey("applications.id", ondelete="CASCADE"), primary_key=True)
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, nullable=False)  # utils.minhash.band_buckets (distinct per band)
+    
+    # Denormalized for company-scoped lookups
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    
+    # Relationships
+    application = relationship("Application", back_populates="resume_buckets")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -21,6 +21,7 @@ class Job(Base):
     required_experience = Column(String, nullable=True)
     certifications = Column(JSON, nullable=True)  # List of certifications
     additional_requirements = Column(JSON, nullable=True)
+    description_vector = Column(LargeBinary, nullable=True)  # Hashed term frequencies of title + description, set at publish
     
     # Status and workflow
     status = Column(String, default="draft")  # draft, pending_approval, approved, published, archived
@@ -0,0 +1,55 @@
+from typing import Dict
+from sqlalchemy import Column, Integer, String, DateTime, JSON, LargeBinary, UniqueConstraint
+from sqlalchemy.sql import func
+from ..database import Base
+from ..utils.text_processing import decompress_text, decompress_json
+
+class ResumeParseCache(Base):
+    __tablename__ = "resume_parse_cache"
+    __table_args__ = (
+        UniqueConstraint("file_hash", "parser_version", name="uq_resume_parse_cache_hash_version"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    file_hash = Column(String(64), nullable=False, index=True)  # SHA-256 of the resume file
+    parser_version = Column(String, nullable=False)  # resume_parser.PARSER_VERSION at parse time
+    
+    # Output of parse_resume (skills, experience, education, certifications, text)
+    parsed_data = Column(JSON, nullable=False)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ResumeText(Base):
+    __tablename__ = "resume_texts"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    file_hash = Column(String(64), unique=True, nullable=False, index=True)  # SHA-256 of the resume file
+    
+    # Compressed full text and normalized term frequencies
+    text_compressed = Column(LargeBinary, nullable=False)
+    term_frequencies_compressed = Column(LargeBinary, nullable=False)
+    token_count = Column(Integer, nullable=False, default=0)
+    semantic_vector = Column(LargeBinary, nullable=True)  # Hashed term frequency vector (utils.semantic_vectors.tf_vector)
+    minhash_signature = Column(LargeBinary, nullable=True)  # utils.minhash.signature of the text
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    @property
+    def text(self) -> str:
+        return decompress_text(self.text_compressed)
+    
+    @property
+    def term_frequencies(self) -> Dict[str, int]:
+        return decompress_json(self.term_frequencies_compressed)
+
+class DocumentFrequency(Base):
+    __tablename__ = "document_frequencies"
+    
+    # Hashed feature (utils.semantic_vectors.feature_index); TOTAL_DOCUMENTS holds the corpus size
+    feature = Column(Integer, primary_key=True, autoincrement=False)
+    document_count = Column(Integer, nullable=False, default=0)
+    
+    TOTAL_DOCUMENTS = -1
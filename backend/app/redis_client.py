@@ -50,6 +50,14 @@ class RedisClient:
             print(f"Redis EXISTS error: {e}")
             return False
     
+    async def increment(self, key: str, amount: int = 1) -> Optional[int]:
+        """Increment a counter in Redis"""
+        try:
+            return self.redis_client.incrby(key, amount)
+        except Exception as e:
+            print(f"Redis INCRBY error: {e}")
+            return None
+    
     async def set_hash(self, key: str, mapping: dict, expire: Optional[int] = None) -> bool:
         """Set a hash in Redis"""
         try:
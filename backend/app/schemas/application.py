@@ -28,11 +28,13 @@ class ApplicationScoreResponse(BaseModel):
     experience_match: Optional[float] = None
     education_match: Optional[float] = None
     certification_match: Optional[float] = None
+    semantic_match: Optional[float] = None
     ats_format_score: Optional[float] = None
     ats_keywords_score: Optional[float] = None
     ats_structure_score: Optional[float] = None
     scoring_details: Optional[Dict[str, Any]] = None
     ai_feedback: Optional[str] = None
+    inputs_hash: Optional[str] = None
     created_at: datetime
     
     class Config:
@@ -48,11 +50,20 @@ class ApplicationResponse(ApplicationBase):
     parsed_certifications: Optional[List[str]] = None
     status: str
     current_stage: str
+    processing_status: Optional[str] = None
+    processing_error: Optional[str] = None
     job_id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
     reviewed_at: Optional[datetime] = None
-    scores: List[ApplicationScoreResponse] = []
+    processed_at: Optional[datetime] = None
+    final_score: Optional[float] = None
+    match_score: Optional[float] = None
+    ats_score: Optional[float] = None
+    score_breakdown: Optional[Dict[str, Any]] = None
+    ai_feedback: Optional[str] = None
+    scored_at: Optional[datetime] = None
+    scores: List[ApplicationScoreResponse] = []  # Score history, when enabled
     
     class Config:
         from_attributes = True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -67,6 +67,7 @@ class JobGenerateFieldsRequest(BaseModel):
     project_name: str
     role_title: str
     role_description: str
+    regenerate: bool = False  # Skip the response cache and ask the model again
 
 class JobGenerateFieldsResponse(BaseModel):
     key_skills: List[str]
@@ -82,7 +83,21 @@ class JobGenerateDescriptionRequest(BaseModel):
     required_experience: str
     certifications: List[str]
     additional_requirements: List[str]
+    regenerate: bool = False  # Skip the response cache and ask the model again
 
 class JobGenerateDescriptionResponse(BaseModel):
     description: str
     short_description: str
+
+class ScoringConfig(BaseModel):
+    """Scoring settings to try; unset fields keep the current Settings values"""
+    name: Optional[str] = None
+    match_score_weight: Optional[float] = Field(None, ge=0)
+    ats_score_weight: Optional[float] = Field(None, ge=0)
+    semantic_score_weight: Optional[float] = Field(None, ge=0)
+    shortlist_threshold: Optional[float] = Field(None, ge=0, le=100)
+    requalify_threshold: Optional[float] = Field(None, ge=0, le=100)
+
+class ScoringSimulationRequest(BaseModel):
+    configs: List[ScoringConfig] = Field(..., min_length=1, max_length=50)
+    max_flipped: int = Field(500, ge=0, le=10000)  # Flipped applications listed per config
@@ -1,7 +1,15 @@
 from .llm_service import LLMService
 from .scoring_service import ScoringService
+from .batch_scoring import BatchScoringService
+from .bulk_import import BulkImportService
+from .job_rescore import JobRescoreService
+from .skill_index import SkillIndexService
 
 __all__ = [
     "LLMService",
-    "ScoringService"
+    "ScoringService",
+    "BatchScoringService",
+    "BulkImportService",
+    "JobRescoreService",
+    "SkillIndexService"
 ]
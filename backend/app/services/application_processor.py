@@ -0,0 +1,116 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from ..models.application import Application
+from ..models.job import Job
+from ..utils.email import send_application_confirmation
+from ..utils.metrics import timer
+from .scoring_service import ScoringService
+from .resume_cache import ResumeParseCacheService
+from .skill_index import SkillIndexService
+from .duplicate_detection import DuplicateDetectionService
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ApplicationProcessor:
+    """Runs the post-submission pipeline for an application: parse -> score -> notify"""
+
+    def __init__(self):
+        self.scoring_service = ScoringService()
+        self.resume_cache = ResumeParseCacheService()
+        self.skill_index = SkillIndexService()
+        self.duplicate_detection = DuplicateDetectionService()
+
+    def get_application(self, db: Session, application_id: int) -> Application:
+        """Load an application or raise if it no longer exists"""
+        application = db.query(Application).filter(Application.id == application_id).first()
+        if not application:
+            raise ValueError(f"Application {application_id} not found")
+        return application
+
+    def mark_processing(self, db: Session, application: Application) -> None:
+        """Flag the application as being worked on"""
+        application.processing_status = "processing"
+        application.processing_attempts = (application.processing_attempts or 0) + 1
+        application.processing_error = None
+        db.commit()
+
+    def mark_queued(self, db: Session, application_id: int, error: str) -> None:
+        """Put the application back in the queue after a failed attempt"""
+        application = db.query(Application).filter(Application.id == application_id).first()
+        if application:
+            application.processing_status = "queued"
+            application.processing_error = error
+            db.commit()
+
+    def mark_failed(self, db: Session, application_id: int, error: str) -> None:
+        """Record a permanent failure and still confirm receipt to the candidate"""
+        application = db.query(Application).filter(Application.id == application_id).first()
+        if not application:
+            return
+        application.processing_status = "failed"
+        application.processing_error = error
+        application.processed_at = datetime.utcnow()
+        db.commit()
+        self.notify(db, application)
+
+    @timer("pipeline.parse")
+    async def parse(self, db: Session, application: Application) -> None:
+        """Parse the stored resume (or reuse a cached parse) and save the extracted fields"""
+        with timer("pipeline.parse.get_or_parse"):
+            parsed_data = await self.resume_cache.get_or_parse(
+                db,
+                application.resume_path,
+                application.resume_filename,
+                application.resume_hash
+            )
+
+        self.apply_parsed_data(application, parsed_data)
+        with timer("pipeline.parse.skill_index"):
+            self.skill_index.index_application(db, application)
+        with timer("pipeline.parse.duplicate_index"):
+            self.duplicate_detection.index_application(db, application, application.job.company_id)
+        with timer("pipeline.parse.db_commit"):
+            db.commit()
+
+    @staticmethod
+    def apply_parsed_data(application: Application, parsed_data: dict) -> None:
+        """Copy parse_resume output onto the application"""
+        application.parsed_skills = parsed_data.get('parsed_skills', [])
+        application.parsed_experience = parsed_data.get('parsed_experience', [])
+        application.parsed_education = parsed_data.get('parsed_education', [])
+        application.parsed_certifications = parsed_data.get('parsed_certifications', [])
+
+    @timer("pipeline.notify")
+    def notify(self, db: Session, application: Application) -> None:
+        """Send the confirmation email (failures are logged, never retried)"""
+        job = db.query(Job).filter(Job.id == application.job_id).first()
+        try:
+            send_application_confirmation(
+                application.email,
+                application.full_name,
+                job.title if job else "the position",
+                application.reference_number
+            )
+        except Exception as e:
+            logger.error(f"Error sending confirmation email for application {application.id}: {e}")
+
+    @timer("pipeline.process")
+    async def process(self, db: Session, application_id: int) -> Application:
+        """Run parse -> score -> notify for an application"""
+        application = self.get_application(db, application_id)
+        if application.processing_status == "done":
+            logger.info(f"Application {application_id} already processed, skipping")
+            return application
+
+        self.mark_processing(db, application)
+
+        await self.parse(db, application)
+        await self.scoring_service.score_application(db, application)
+
+        application.processing_status = "done"
+        application.processed_at = datetime.utcnow()
+        db.commit()
+
+        self.notify(db, application)
+        return application
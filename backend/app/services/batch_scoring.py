@@ -0,0 +1,204 @@
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from ..models.job import Job
+from ..models.application import Application, ApplicationScore
+from ..utils.semantic_vectors import cosine_similarities
+from .semantic_match import SemanticInputs
+from .scoring_service import ScoringService, SKILLS_FEEDBACK, EXPERIENCE_FEEDBACK, ATS_FEEDBACK
+import logging
+
+logger = logging.getLogger(__name__)
+
+class BatchScoringService:
+    """Scores a job's whole cohort of applications at once with NumPy arrays.
+
+    Produces exactly the same numbers, feedback and statuses as
+    ScoringService.build_score, but encodes the job once and evaluates every
+    sub-score as a column operation instead of per-application Python sets.
+    """
+
+    def __init__(self, scoring_service: Optional[ScoringService] = None):
+        self.scoring_service = scoring_service or ScoringService()
+
+    @staticmethod
+    def encode_terms(job_terms: Optional[List[str]], candidate_terms: Iterable[Optional[List[str]]]) -> Tuple[np.ndarray, int]:
+        """Encode candidates' terms as a bitmap over the job's distinct lowercased terms.
+
+        Returns the (candidates x job terms) bool matrix and the match denominator,
+        which counts duplicate job terms like the per-application code does.
+        """
+        vocabulary = {term: index for index, term in enumerate(dict.fromkeys(t.lower() for t in job_terms or []))}
+        candidate_terms = list(candidate_terms)
+        bitmap = np.zeros((len(candidate_terms), len(vocabulary)), dtype=bool)
+        for row, terms in enumerate(candidate_terms):
+            for term in terms or []:
+                column = vocabulary.get(term.lower())
+                if column is not None:
+                    bitmap[row, column] = True
+        return bitmap, len(job_terms or [])
+
+    def match_percentages(self, job_terms: Optional[List[str]], candidate_terms: List[Optional[List[str]]]) -> np.ndarray:
+        """Percentage of the job's terms each candidate has (0 when either side is empty)"""
+        bitmap, denominator = self.encode_terms(job_terms, candidate_terms)
+        if not denominator:
+            return np.zeros(len(candidate_terms))
+        return (bitmap.sum(axis=1).astype(np.float64) / denominator) * 100
+
+    def compute(
+        self,
+        job: Job,
+        applications: List[Application],
+        semantic: Optional[SemanticInputs] = None
+    ) -> Dict[str, np.ndarray]:
+        """Compute every sub-score, average, final score and status band for the cohort"""
+        skills = [application.parsed_skills for application in applications]
+        experience_counts = np.array([len(application.parsed_experience or []) for application in applications])
+        has_education = np.array([bool(application.parsed_education) for application in applications])
+        has_bachelor = np.array([
+            any('bachelor' in edu.get('degree', '').lower() for edu in application.parsed_education or [])
+            for application in applications
+        ], dtype=bool)
+        has_master = np.array([
+            any('master' in edu.get('degree', '').lower() for edu in application.parsed_education or [])
+            for application in applications
+        ], dtype=bool)
+        skill_counts = np.array([len(application.parsed_skills or []) for application in applications])
+        good_format = np.array([
+            application.resume_filename.lower().endswith(('.pdf', '.docx')) for application in applications
+        ], dtype=bool)
+
+        # Match breakdown
+        columns = {
+            'skills_match': self.match_percentages(job.key_skills, skills),
+            'experience_match': np.select([experience_counts >= 2, experience_counts >= 1], [80.0, 60.0], 0.0),
+            'education_match': np.select(
+                [has_education & has_bachelor, has_education & has_master, has_education], [70.0, 90.0, 50.0], 0.0
+            ),
+            'certification_match': self.match_percentages(
+                job.certifications, [application.parsed_certifications for application in applications]
+            )
+        }
+
+        # ATS breakdown
+        has_experience = experience_counts > 0
+        has_skills = skill_counts > 0
+        columns['ats_format_score'] = np.where(good_format, 100.0, 30.0)
+        columns['ats_keywords_score'] = np.where(has_skills, np.minimum(skill_counts * 10, 100.0), 0.0)
+        columns['ats_structure_score'] = (
+            0.0 + np.where(has_experience, 40.0, 0.0) + np.where(has_education, 30.0, 0.0) + np.where(has_skills, 30.0, 0.0)
+        )
+
+        # Averages add left to right, matching sum() over the per-application dicts
+        match_total = np.zeros(len(applications))
+        match_count = np.zeros(len(applications), dtype=np.int64)
+        for name in ('skills_match', 'experience_match', 'education_match', 'certification_match'):
+            positive = columns[name] > 0
+            match_total = match_total + np.where(positive, columns[name], 0.0)
+            match_count += positive
+        columns['match_count'] = match_count
+        columns['match_score'] = np.divide(match_total, match_count, out=np.zeros(len(applications)), where=match_count > 0)
+
+        ats_total = columns['ats_format_score'] + columns['ats_keywords_score'] + columns['ats_structure_score']
+        columns['ats_score'] = ats_total / 3
+
+        weighted = columns['match_score'] * self.scoring_service.match_weight + columns['ats_score'] * self.scoring_service.ats_weight
+        if self.scoring_service.semantic_weight:
+            # One sparse (cohort x features) product against the job's description vector
+            if semantic is None:
+                columns['semantic_match'] = np.zeros(len(applications))
+            else:
+                columns['semantic_match'] = cosine_similarities(
+                    semantic.job_vector, [semantic.resume_vectors.get(application.resume_hash) for application in applications]
+                )
+            weighted = weighted + columns['semantic_match'] * self.scoring_service.semantic_weight
+        total_weight = self.scoring_service.total_weight()
+        weighted = weighted / total_weight if total_weight else np.zeros(len(applications))
+        # Python's round() (correctly rounded) rather than np.round, to agree with calculate_final_score
+        columns['final_score'] = np.array([round(value, 2) for value in weighted.tolist()])
+
+        columns['status_band'] = np.select(
+            [columns['final_score'] >= self.scoring_service.shortlist_threshold,
+             columns['final_score'] >= self.scoring_service.requalify_threshold],
+            [2, 1], 0
+        )
+        columns['skills_band'] = np.select([columns['skills_match'] >= 70, columns['skills_match'] >= 40], [2, 1], 0)
+        columns['experience_band'] = np.select([columns['experience_match'] >= 70, columns['experience_match'] >= 40], [2, 1], 0)
+        columns['ats_band'] = (ats_total / 3 >= 70).astype(np.int64)
+        return columns
+
+    def load_semantic_inputs(self, db: Session, job: Job, applications: List[Application]) -> Optional[SemanticInputs]:
+        """The job's and the cohort's vectors under the current IDF, if semantic scoring is on"""
+        if not self.scoring_service.semantic_weight:
+            return None
+        return self.scoring_service.semantic_service.load_inputs(db, job, applications)
+
+    def build_scores(
+        self,
+        job: Job,
+        applications: List[Application],
+        semantic: Optional[SemanticInputs] = None
+    ) -> List[Tuple[ApplicationScore, str]]:
+        """Return a score record and the resulting application status for each application"""
+        if not applications:
+            return []
+        columns = self.compute(job, applications, semantic)
+        statuses = ["rejected", "under_review", "shortlisted"]
+        inputs_hash = self.scoring_service.inputs_hash(job)
+
+        results = []
+        for row, application in enumerate(applications):
+            match_scores = {
+                name: float(columns[name][row])
+                for name in ('skills_match', 'experience_match', 'education_match', 'certification_match')
+            }
+            skill_count = len(application.parsed_skills or [])
+            ats_scores = {
+                'ats_format_score': float(columns['ats_format_score'][row]),
+                # min(int, 100.0) keeps the int, which shows up in the JSON breakdown
+                'ats_keywords_score': min(skill_count * 10, 100.0) if skill_count else 0.0,
+                'ats_structure_score': float(columns['ats_structure_score'][row])
+            }
+            semantic_match = float(columns['semantic_match'][row]) if 'semantic_match' in columns else None
+            scoring_details = {**match_scores, **ats_scores}
+            if semantic_match is not None:
+                scoring_details['semantic_match'] = semantic_match
+            ai_feedback = " ".join([
+                SKILLS_FEEDBACK[columns['skills_band'][row]],
+                EXPERIENCE_FEEDBACK[columns['experience_band'][row]],
+                ATS_FEEDBACK[columns['ats_band'][row]]
+            ])
+            score = ApplicationScore(
+                application_id=application.id,
+                match_score=float(columns['match_score'][row]) if columns['match_count'][row] else 0,
+                ats_score=float(columns['ats_score'][row]),
+                final_score=float(columns['final_score'][row]),
+                skills_match=match_scores['skills_match'],
+                experience_match=match_scores['experience_match'],
+                education_match=match_scores['education_match'],
+                certification_match=match_scores['certification_match'],
+                semantic_match=semantic_match,
+                ats_format_score=ats_scores['ats_format_score'],
+                ats_keywords_score=ats_scores['ats_keywords_score'],
+                ats_structure_score=ats_scores['ats_structure_score'],
+                scoring_details=scoring_details,
+                ai_feedback=ai_feedback,
+                inputs_hash=inputs_hash
+            )
+            results.append((score, statuses[columns['status_band'][row]]))
+        return results
+
+    def score_job(self, db: Session, job: Job, applications: Optional[List[Application]] = None) -> int:
+        """Score all (or the given) applications of a job and save the results in one transaction"""
+        if applications is None:
+            applications = db.query(Application).filter(Application.job_id == job.id).all()
+        try:
+            results = self.build_scores(job, applications, self.load_semantic_inputs(db, job, applications))
+            for application, (score, status) in zip(applications, results):
+                self.scoring_service.save_score(db, application, score, status)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error batch scoring applications for job {job.id}: {e}")
+            db.rollback()
+            raise
+        return len(results)
@@ -0,0 +1,350 @@
+import asyncio
+import os
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Optional, Tuple, BinaryIO
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..models.application import Application
+from ..models.job import Job
+from ..models.resume import ResumeParseCache, ResumeText
+from ..redis_client import redis_client
+from ..utils.file_utils import store_file
+from ..utils.parser_pool import ResumeParserPool
+from ..utils.text_processing import tokenize, term_frequencies, compress_text, compress_json
+from ..utils.minhash import signature
+from ..config import settings
+from .application_processor import ApplicationProcessor
+from .resume_cache import ResumeParseCacheService
+from .batch_scoring import BatchScoringService
+from .skill_index import SkillIndexService
+from .duplicate_detection import DuplicateDetectionService
+import logging
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+# (display name, callable opening the file for binary reading)
+ImportSource = Tuple[str, Callable[[], BinaryIO]]
+
+class BulkImportService:
+    """Imports a directory or ZIP of resumes into one job.
+
+    Files are parsed in parallel on a dedicated parser pool and written in one
+    transaction per batch. No emails are sent for imported applications.
+    """
+
+    def __init__(self, workers: Optional[int] = None, batch_size: Optional[int] = None):
+        self.workers = workers or settings.bulk_import_workers or os.cpu_count() or 1
+        self.batch_size = batch_size or settings.bulk_import_batch_size
+        self.batch_scoring = BatchScoringService()
+        self.semantic_service = self.batch_scoring.scoring_service.semantic_service
+        self.resume_cache = ResumeParseCacheService()
+        self.skill_index = SkillIndexService()
+        self.duplicate_detection = DuplicateDetectionService()
+
+    @staticmethod
+    def progress_key(import_id: str) -> str:
+        return f"bulk_import:{import_id}"
+
+    def collect_sources(self, source: str, archive: Optional[zipfile.ZipFile] = None) -> List[ImportSource]:
+        """List the resumes in a directory (recursively) or an open ZIP archive"""
+        def supported(name: str) -> bool:
+            path = Path(name)
+            return path.suffix.lower() in SUPPORTED_EXTENSIONS and not path.name.startswith(".") \
+                and "__MACOSX" not in path.parts
+
+        if archive is not None:
+            # Members are streamed into the store by digest, never extracted by their own path
+            return [
+                (info.filename, lambda info=info: archive.open(info))
+                for info in archive.infolist()
+                if not info.is_dir() and supported(info.filename)
+            ]
+
+        root = Path(source)
+        return [
+            (str(path.relative_to(root)), lambda path=path: open(path, "rb"))
+            for path in sorted(root.rglob("*"))
+            if path.is_file() and supported(str(path.relative_to(root)))
+        ]
+
+    async def get_progress(self, import_id: str) -> Optional[Dict[str, Any]]:
+        """Return the progress report for an import, or None if unknown or expired"""
+        report = await redis_client.get(self.progress_key(import_id))
+        return report if isinstance(report, dict) else None
+
+    async def save_progress(self, report: Dict[str, Any]) -> None:
+        await redis_client.set(self.progress_key(report["import_id"]), report, expire=settings.bulk_import_report_ttl)
+
+    @staticmethod
+    def new_report(import_id: str, job_id: int, status: str = "queued") -> Dict[str, Any]:
+        return {
+            "import_id": import_id,
+            "job_id": job_id,
+            "status": status,
+            "total": 0,
+            "processed": 0,
+            "imported": 0,
+            "skipped": 0,
+            "failed": 0,
+            "near_duplicates": 0,  # Imported resumes matching an existing application of the company
+            "files_per_second": 0.0,
+            "started_at": None,
+            "finished_at": None,
+            "errors": []
+        }
+
+    async def run(
+        self,
+        db: Session,
+        job_id: int,
+        source: str,
+        import_id: Optional[str] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """Import every resume under source (directory or .zip) as an application for job_id"""
+        import_id = import_id or uuid.uuid4().hex
+        report = self.new_report(import_id, job_id, status="running")
+        report["started_at"] = datetime.utcnow().isoformat()
+        started = time.perf_counter()
+
+        async def publish() -> None:
+            elapsed = time.perf_counter() - started
+            report["files_per_second"] = round(report["processed"] / elapsed, 2) if elapsed else 0.0
+            await self.save_progress(report)
+            if on_progress:
+                on_progress(report)
+
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            report["status"] = "failed"
+            report["errors"].append({"file": None, "status": "failed", "error": f"Job {job_id} not found"})
+            await publish()
+            return report
+
+        archive = zipfile.ZipFile(source) if zipfile.is_zipfile(source) else None
+        pool = ResumeParserPool(workers=self.workers)
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            sources = self.collect_sources(source, archive)
+            report["total"] = len(sources)
+            await publish()
+
+            seen_hashes: set = set()
+            for offset in range(0, len(sources), self.batch_size):
+                batch = sources[offset:offset + self.batch_size]
+                await self.import_batch(db, job, batch, import_id, pool, executor, seen_hashes, report)
+                await publish()
+
+            report["status"] = "completed"
+        except Exception as e:
+            logger.error(f"Bulk import {import_id} for job {job_id} failed: {e}")
+            db.rollback()
+            report["status"] = "failed"
+            report["errors"].append({"file": None, "status": "failed", "error": str(e)})
+        finally:
+            executor.shutdown(wait=True)
+            pool.shutdown()
+            if archive is not None:
+                archive.close()
+
+        report["finished_at"] = datetime.utcnow().isoformat()
+        await publish()
+        logger.info(
+            f"Bulk import {import_id}: {report['imported']} imported, {report['skipped']} skipped, "
+            f"{report['failed']} failed ({report['files_per_second']} files/s)"
+        )
+        return report
+
+    async def import_batch(
+        self,
+        db: Session,
+        job: Job,
+        batch: List[ImportSource],
+        import_id: str,
+        pool: ResumeParserPool,
+        executor: ThreadPoolExecutor,
+        seen_hashes: set,
+        report: Dict[str, Any]
+    ) -> None:
+        """Store, parse, score and insert one batch of files in a single transaction"""
+        def record(name: Optional[str], outcome: str, error: str) -> None:
+            report[outcome] += 1
+            report["processed"] += 1
+            report["errors"].append({"file": name, "status": outcome, "error": error})
+
+        # Copy into the content-addressed store
+        stored = []
+        for name, opener in batch:
+            try:
+                with opener() as file:
+                    stored.append((name, *store_file(file, name, max_size=settings.max_file_size)))
+            except Exception as e:
+                record(name, "failed", f"Could not store file: {e}")
+
+        # Skip resumes already submitted to this job, by this import or earlier
+        hashes = [file_hash for _, _, _, file_hash in stored]
+        seen_hashes.update(
+            file_hash for (file_hash,) in db.query(Application.resume_hash).filter(
+                Application.job_id == job.id,
+                Application.resume_hash.in_(hashes)
+            )
+        )
+        pending = []
+        for entry in stored:
+            if entry[3] in seen_hashes:
+                record(entry[0], "skipped", "Resume already submitted for this job")
+            else:
+                seen_hashes.add(entry[3])
+                pending.append(entry)
+
+        # Reuse cached parses, parse the rest in parallel
+        parser_version = self.resume_cache.parser_version
+        cached = {
+            entry.file_hash: entry.parsed_data
+            for entry in db.query(ResumeParseCache).filter(
+                ResumeParseCache.file_hash.in_([entry[3] for entry in pending]),
+                ResumeParseCache.parser_version == parser_version
+            )
+        }
+        misses = [entry for entry in pending if entry[3] not in cached]
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, pool.parse_sync, filepath, filename) for _, filename, filepath, _ in misses),
+            return_exceptions=True
+        )
+
+        parsed: Dict[str, Dict[str, Any]] = dict(cached)
+        texts: Dict[str, str] = {}
+        for (name, _, _, file_hash), result in zip(misses, results):
+            if isinstance(result, BaseException):
+                record(name, "failed", str(result))
+                continue
+            text = result.pop('raw_text', '')
+            parsed[file_hash] = result
+            if text:
+                texts[file_hash] = text
+
+        new_documents = self.save_parse_results(db, texts, {file_hash: parsed[file_hash] for file_hash in texts}, parser_version)
+
+        # Build application and score rows
+        applications = []
+        for name, filename, filepath, file_hash in pending:
+            if file_hash not in parsed:
+                continue
+            contact = parsed[file_hash].get('contact') or {}
+            if not contact.get('email'):
+                record(name, "failed", "No email address found in resume")
+                continue
+
+            application = Application(
+                reference_number=f"REF-{str(uuid.uuid4())[:8].upper()}",
+                full_name=contact.get('name') or Path(name).stem.replace('_', ' ').title(),
+                email=contact['email'],
+                phone=contact.get('phone') or None,
+                additional_info=f"Imported from {name} (bulk import {import_id})",
+                resume_filename=filename,
+                resume_path=filepath,
+                resume_hash=file_hash,
+                job_id=job.id,
+                processing_status="done",
+                processed_at=datetime.utcnow()
+            )
+            ApplicationProcessor.apply_parsed_data(application, parsed[file_hash])
+            applications.append((name, application))
+
+        try:
+            cohort = [application for _, application in applications]
+            db.add_all(cohort)
+            db.flush()
+            self.skill_index.index_applications(db, cohort, job.company_id)
+            near_duplicates = self.duplicate_detection.index_applications(db, cohort, job.company_id)
+            results = self.batch_scoring.build_scores(job, cohort, self.batch_scoring.load_semantic_inputs(db, job, cohort))
+            for (_, application), (score, status) in zip(applications, results):
+                self.batch_scoring.scoring_service.save_score(db, application, score, status)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error inserting bulk import batch for job {job.id}: {e}")
+            db.rollback()
+            for name, _ in applications:
+                record(name, "failed", f"Database error: {e}")
+            return
+
+        # After the batch's commit, so its transaction never holds the corpus-size row
+        self.semantic_service.record_documents(db, new_documents)
+        report["imported"] += len(applications)
+        report["near_duplicates"] += near_duplicates
+        report["processed"] += len(applications)
+
+    def save_parse_results(
+        self,
+        db: Session,
+        texts: Dict[str, str],
+        parsed: Dict[str, Dict[str, Any]],
+        parser_version: str
+    ) -> List[Dict[str, int]]:
+        """Store full texts and parse cache rows for freshly parsed files.
+
+        Rows another submission stored first are skipped one by one, so a
+        conflicting cache entry never drops the batch's new texts. Returns the
+        term frequencies of the texts inserted here, for the document frequencies.
+        """
+        if not texts:
+            return []
+        existing_texts = {
+            file_hash for (file_hash,) in db.query(ResumeText.file_hash).filter(ResumeText.file_hash.in_(list(texts)))
+        }
+        new_texts = {}
+        for file_hash, text in texts.items():
+            if file_hash not in existing_texts:
+                tokens = tokenize(text)
+                new_texts[file_hash] = (text, term_frequencies(tokens), len(tokens))
+
+        inserted = self.insert_missing(db, ResumeText, [
+            {
+                "file_hash": file_hash,
+                "text_compressed": compress_text(text),
+                "term_frequencies_compressed": compress_json(frequencies),
+                "token_count": token_count,
+                "semantic_vector": self.semantic_service.vectorize(frequencies),
+                "minhash_signature": signature(text)
+            }
+            for file_hash, (text, frequencies, token_count) in new_texts.items()
+        ])
+        cached = self.insert_missing(db, ResumeParseCache, [
+            {"file_hash": file_hash, "parser_version": parser_version, "parsed_data": parsed[file_hash]}
+            for file_hash in texts
+        ])
+        if len(cached) < len(texts):
+            # A concurrent submission cached some of these files first; the cache is optional here
+            logger.info(f"{len(texts) - len(cached)} parse cache entries for a bulk import batch already existed")
+        return [new_texts[file_hash][1] for file_hash in new_texts if file_hash in inserted]
+
+    def insert_missing(self, db: Session, model, rows: List[Dict[str, Any]]) -> set:
+        """Insert rows, skipping any that hit a unique constraint; returns the file hashes inserted (no commit)"""
+        if not rows:
+            return set()
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            statement = insert(model).values(rows).on_conflict_do_nothing().returning(model.file_hash)
+            return {file_hash for (file_hash,) in db.execute(statement)}
+
+        inserted = set()
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    db.add(model(**row))
+            except IntegrityError:
+                continue
+            inserted.add(row["file_hash"])
+        return inserted
@@ -0,0 +1,184 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+from ..models.application import Application
+from ..models.job import Job
+from ..config import settings
+from .llm_service import LLMService
+from .job_runs import JobRunTracker
+import logging
+
+logger = logging.getLogger(__name__)
+
+class CandidateFeedbackService:
+    """Writes LLM feedback for a job's shortlisted and borderline candidates, several per prompt.
+
+    Candidates are the scored applications at or above the requalify
+    threshold whose feedback predates their current score. Their score
+    breakdowns are packed `batch_size` to a prompt, at most `concurrency`
+    prompts run at once, and each batch is saved as soon as it returns.
+    Candidates rescored while the run is going are picked up before it ends.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None, concurrency: Optional[int] = None, llm_service: Optional[LLMService] = None):
+        self.batch_size = batch_size or settings.feedback_batch_size
+        self.concurrency = concurrency or settings.feedback_concurrency
+        self.llm_service = llm_service or LLMService()
+        self.tracker = JobRunTracker("job_feedback", settings.feedback_progress_ttl)
+
+    async def get_progress(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Return the progress of the job's latest feedback run, or None if there is none"""
+        return await self.tracker.get_progress(job_id)
+
+    async def save_progress(self, progress: Dict[str, Any]) -> None:
+        await self.tracker.save_progress(progress)
+
+    @staticmethod
+    def new_progress(job_id: int, status: str = "queued") -> Dict[str, Any]:
+        return {
+            "job_id": job_id,
+            "status": status,
+            "total": 0,
+            "generated": 0,
+            "pending": 0,
+            "failed": 0,
+            "batches": 0,
+            "started_at": None,
+            "finished_at": None,
+            "error": None
+        }
+
+    def find_candidates(self, db: Session, job: Job, regenerate: bool = False) -> List[Application]:
+        """Scored applications in the shortlist or borderline band needing feedback, best first"""
+        query = db.query(Application).filter(
+            Application.job_id == job.id,
+            Application.processing_status == "done",
+            Application.final_score >= settings.requalify_threshold
+        )
+        if not regenerate:
+            query = query.filter(or_(
+                Application.ai_feedback_generated_at.is_(None),
+                Application.ai_feedback_generated_at < Application.scored_at
+            ))
+        return query.order_by(Application.final_score.desc().nullslast(), Application.id).all()
+
+    @staticmethod
+    def candidate_summary(job: Job, application: Application) -> Dict[str, Any]:
+        """What the model sees of a candidate: scores and skill overlap, no personal details"""
+        candidate_skills = {skill.lower() for skill in application.parsed_skills or []}
+        job_skills = job.key_skills or []
+
+        def score(value: Optional[float]) -> Optional[float]:
+            return round(value, 1) if value is not None else None
+
+        return {
+            "id": application.id,
+            "final_score": score(application.final_score),
+            "skills_match": score(application.skills_match),
+            "experience_match": score(application.experience_match),
+            "education_match": score(application.education_match),
+            "certification_match": score(application.certification_match),
+            "ats_score": score(application.ats_score),
+            "matched_skills": [skill for skill in job_skills if skill.lower() in candidate_skills],
+            "missing_skills": [skill for skill in job_skills if skill.lower() not in candidate_skills],
+            "experience_entries": len(application.parsed_experience or []),
+            "certifications": len(application.parsed_certifications or [])
+        }
+
+    def save_feedback(self, db: Session, feedback: Dict[int, str], scored_at: Dict[int, Optional[datetime]]) -> int:
+        """Store one batch's feedback as the applications' current feedback.
+
+        Only applications still carrying the score the feedback was written for
+        (scored_at as when the batch was built) are updated; returns how many were.
+        """
+        if not feedback:
+            return 0
+        generated_at = datetime.utcnow()
+        written = 0
+        for application_id, text in feedback.items():
+            if application_id not in scored_at:
+                continue
+            result = db.execute(
+                update(Application)
+                .where(Application.id == application_id, Application.scored_at == scored_at[application_id])
+                .values(ai_feedback=text, ai_feedback_generated_at=generated_at)
+                .execution_options(synchronize_session=False)
+            )
+            written += result.rowcount
+        db.commit()
+        return written
+
+    async def run(self, db: Session, job_id: int, regenerate: bool = False) -> Dict[str, Any]:
+        """Generate feedback for the job's candidates that lack current LLM feedback, again if asked to meanwhile"""
+        passes = 0
+
+        async def run_once() -> Dict[str, Any]:
+            nonlocal passes
+            passes += 1
+            # Later passes only catch up on what changed; regenerating everything once is enough
+            return await self.generate(db, job_id, regenerate and passes == 1)
+
+        return await self.tracker.run(job_id, run_once)
+
+    async def generate(self, db: Session, job_id: int, regenerate: bool = False) -> Dict[str, Any]:
+        """One feedback pass; repeats while candidates are rescored underneath it"""
+        progress = self.new_progress(job_id, status="running")
+        progress["started_at"] = datetime.utcnow().isoformat()
+
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+            if not job:
+                raise ValueError(f"Job {job_id} not found")
+
+            slots = asyncio.Semaphore(self.concurrency)
+
+            async def run_batch(batch: List[Dict[str, Any]]) -> None:
+                async with slots:
+                    try:
+                        feedback = await self.llm_service.generate_candidate_feedback(
+                            job.title, job.key_skills or [], batch, regenerate
+                        )
+                    except Exception as e:
+                        logger.warning(f"Feedback batch for job {job_id} failed: {e}")
+                        feedback = {}
+                written = self.save_feedback(db, feedback, attempted)
+                # Feedback for candidates rescored meanwhile is dropped; the next round redoes them
+                progress["generated"] += written
+                progress["pending"] += len(feedback) - written
+                progress["failed"] += len(batch) - len(feedback)
+                progress["batches"] += 1
+                await self.save_progress(progress)
+
+            # Each score is tried once per pass, so failed candidates don't loop but rescored ones are redone
+            attempted: Dict[int, Optional[datetime]] = {}
+            while True:
+                candidates = [
+                    application for application in self.find_candidates(db, job, regenerate)
+                    if application.id not in attempted or attempted[application.id] != application.scored_at
+                ]
+                if not candidates:
+                    break
+                attempted.update((application.id, application.scored_at) for application in candidates)
+                # Summaries are built up front; commits expire the loaded applications
+                summaries = [self.candidate_summary(job, application) for application in candidates]
+                batches = [summaries[offset:offset + self.batch_size] for offset in range(0, len(summaries), self.batch_size)]
+                progress["total"] += len(summaries)
+                await self.save_progress(progress)
+
+                await asyncio.gather(*(run_batch(batch) for batch in batches))
+            progress["status"] = "completed"
+        except Exception as e:
+            logger.error(f"Error generating feedback for job {job_id}: {e}")
+            db.rollback()
+            progress["status"] = "failed"
+            progress["error"] = str(e)
+
+        progress["finished_at"] = datetime.utcnow().isoformat()
+        await self.save_progress(progress)
+        logger.info(
+            f"Feedback for job {job_id} {progress['status']}: {progress['generated']} generated, "
+            f"{progress['pending']} outdated by a rescore, {progress['failed']} without feedback"
+        )
+        return progress
@@ -0,0 +1,183 @@
+from typing import Dict, List, Any, Iterable, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..models.application import Application, ResumeBucket
+from ..models.job import Job
+from ..models.resume import ResumeText
+from ..utils.minhash import signature, band_buckets, similarity
+from ..config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Caps the verification work when a bucket is crowded (e.g. many near-empty resumes)
+MAX_CANDIDATES = 1000
+
+class DuplicateDetectionService:
+    """Flags near-duplicate resumes within a company using MinHash signatures and an LSH index.
+
+    Each application's signature is split into bands; applications sharing a
+    band bucket are candidates, confirmed by their estimated Jaccard
+    similarity. A lookup costs one index probe per band, independent of the
+    number of stored resumes.
+    """
+
+    def __init__(self, threshold: Optional[float] = None):
+        self.threshold = threshold or settings.duplicate_similarity_threshold
+
+    def load_signatures(self, db: Session, file_hashes: Iterable[str]) -> Dict[str, bytes]:
+        """MinHash signatures of stored resume texts, computing any that predate duplicate detection"""
+        hashes = list({file_hash for file_hash in file_hashes if file_hash})
+        signatures: Dict[str, bytes] = {}
+        if not hashes:
+            return signatures
+        for resume_text in db.query(ResumeText).filter(ResumeText.file_hash.in_(hashes)):
+            if resume_text.minhash_signature is None:
+                resume_text.minhash_signature = signature(resume_text.text)
+            if resume_text.minhash_signature is not None:
+                signatures[resume_text.file_hash] = resume_text.minhash_signature
+        return signatures
+
+    def find_duplicates(self, db: Session, application: Application, company_id: int, resume_signature: bytes) -> List[Dict[str, Any]]:
+        """Other applications of the company whose resume is at least threshold-similar"""
+        buckets = band_buckets(resume_signature)
+        # Most shared bands first, so the cap drops the least similar candidates
+        candidate_ids = [
+            application_id for (application_id,) in db.query(ResumeBucket.application_id).filter(
+                ResumeBucket.company_id == company_id,
+                ResumeBucket.bucket.in_(buckets),
+                ResumeBucket.application_id != application.id
+            ).group_by(ResumeBucket.application_id).order_by(
+                func.count().desc(), ResumeBucket.application_id
+            ).limit(MAX_CANDIDATES)
+        ]
+        if not candidate_ids:
+            return []
+
+        candidates = db.query(Application.id, Application.duplicate_group_id, ResumeText.minhash_signature).join(
+            ResumeText, ResumeText.file_hash == Application.resume_hash
+        ).filter(Application.id.in_(candidate_ids)).all()
+
+        duplicates = []
+        for candidate_id, group_id, candidate_signature in candidates:
+            if candidate_signature is None:
+                continue
+            score = similarity(resume_signature, candidate_signature)
+            if score >= self.threshold:
+                duplicates.append({"id": candidate_id, "duplicate_group_id": group_id, "similarity": score})
+        return duplicates
+
+    def assign_group(self, db: Session, application: Application, duplicates: List[Dict[str, Any]]) -> None:
+        """Put the application and its duplicates in one group, merging existing groups (no commit)"""
+        groups = {duplicate["duplicate_group_id"] or duplicate["id"] for duplicate in duplicates}
+        if application.duplicate_group_id:
+            groups.add(application.duplicate_group_id)
+        group_id = min(groups)
+
+        application.duplicate_group_id = group_id
+        ungrouped = [duplicate["id"] for duplicate in duplicates if not duplicate["duplicate_group_id"]]
+        if ungrouped:
+            db.query(Application).filter(Application.id.in_(ungrouped)).update(
+                {Application.duplicate_group_id: group_id}, synchronize_session=False
+            )
+        merged = [group for group in groups if group != group_id]
+        if merged:
+            db.query(Application).filter(Application.duplicate_group_id.in_(merged)).update(
+                {Application.duplicate_group_id: group_id}, synchronize_session=False
+            )
+
+    def index_application(
+        self,
+        db: Session,
+        application: Application,
+        company_id: int,
+        resume_signature: Optional[bytes] = None
+    ) -> List[Dict[str, Any]]:
+        """Add the application to the LSH index and group it with its near-duplicates (no commit)"""
+        if resume_signature is None:
+            resume_signature = self.load_signatures(db, [application.resume_hash]).get(application.resume_hash)
+        db.query(ResumeBucket).filter(ResumeBucket.application_id == application.id).delete(synchronize_session=False)
+        if resume_signature is None:
+            return []
+
+        duplicates = self.find_duplicates(db, application, company_id, resume_signature)
+        if duplicates:
+            self.assign_group(db, application, duplicates)
+            logger.info(
+                f"Application {application.id} is a near-duplicate of applications "
+                f"{[duplicate['id'] for duplicate in duplicates]} (group {application.duplicate_group_id})"
+            )
+
+        db.add_all([
+            ResumeBucket(application_id=application.id, band=band, bucket=bucket, company_id=company_id)
+            for band, bucket in enumerate(band_buckets(resume_signature))
+        ])
+        # Sessions don't autoflush; later lookups in the same transaction must see these rows
+        db.flush()
+        return duplicates
+
+    def index_applications(self, db: Session, applications: List[Application], company_id: int) -> int:
+        """Index freshly inserted applications of one company, in order (no commit); returns how many were flagged"""
+        signatures = self.load_signatures(db, [application.resume_hash for application in applications])
+        flagged = 0
+        for application in applications:
+            if self.index_application(db, application, company_id, signatures.get(application.resume_hash)):
+                flagged += 1
+        return flagged
+
+    def get_cluster(self, db: Session, application: Application, limit: int = 50) -> Optional[Dict[str, Any]]:
+        """The application's duplicate group with each member's similarity to it, or None"""
+        if not application.duplicate_group_id:
+            return None
+        members = db.query(Application, Job.title, ResumeText.minhash_signature).join(Job).outerjoin(
+            ResumeText, ResumeText.file_hash == Application.resume_hash
+        ).filter(
+            Application.duplicate_group_id == application.duplicate_group_id,
+            Application.id != application.id
+        ).order_by(Application.id).limit(limit).all()
+        own_signature = self.load_signatures(db, [application.resume_hash]).get(application.resume_hash)
+
+        return {
+            "group_id": application.duplicate_group_id,
+            "applications": [
+                {
+                    "id": member.id,
+                    "reference_number": member.reference_number,
+                    "candidate_name": member.full_name,
+                    "candidate_email": member.email,
+                    "job_id": member.job_id,
+                    "job_title": job_title,
+                    "status": member.status,
+                    "similarity": round(similarity(own_signature, member_signature), 4)
+                    if own_signature and member_signature else None,
+                    "created_at": member.created_at
+                }
+                for member, job_title, member_signature in members
+            ]
+        }
+
+    def rebuild(self, db: Session, batch_size: int = 1000) -> Dict[str, int]:
+        """Rebuild the LSH index and duplicate groups from scratch, oldest application first"""
+        db.query(ResumeBucket).delete(synchronize_session=False)
+        db.query(Application).update({Application.duplicate_group_id: None}, synchronize_session=False)
+        db.commit()
+
+        indexed = 0
+        flagged = 0
+        last_id = 0
+        while True:
+            batch = db.query(Application, Job.company_id).join(Job).filter(
+                Application.id > last_id
+            ).order_by(Application.id).limit(batch_size).all()
+            if not batch:
+                break
+            signatures = self.load_signatures(db, [application.resume_hash for application, _ in batch])
+            for application, company_id in batch:
+                if self.index_application(db, application, company_id, signatures.get(application.resume_hash)):
+                    flagged += 1
+            db.commit()
+            indexed += len(batch)
+            last_id = batch[-1][0].id
+            db.expunge_all()
+        logger.info(f"Rebuilt duplicate index for {indexed} applications, {flagged} flagged as near-duplicates")
+        return {"indexed": indexed, "flagged": flagged}
@@ -0,0 +1,104 @@
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from ..models.application import Application
+from ..models.job import Job
+from ..config import settings
+from .batch_scoring import BatchScoringService
+from .job_runs import JobRunTracker
+import logging
+
+logger = logging.getLogger(__name__)
+
+class JobRescoreService:
+    """Rescores the applications of a job whose scoring inputs changed, in chunks, with progress in Redis"""
+
+    def __init__(self, chunk_size: Optional[int] = None):
+        self.chunk_size = chunk_size or settings.rescore_chunk_size
+        self.batch_scoring = BatchScoringService()
+        self.tracker = JobRunTracker("job_rescore", settings.rescore_progress_ttl)
+
+    async def get_progress(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Return the progress of the job's latest rescore, or None if there is none"""
+        return await self.tracker.get_progress(job_id)
+
+    async def save_progress(self, progress: Dict[str, Any]) -> None:
+        await self.tracker.save_progress(progress)
+
+    @staticmethod
+    def new_progress(job_id: int, status: str = "queued") -> Dict[str, Any]:
+        return {
+            "job_id": job_id,
+            "status": status,
+            "inputs_hash": None,
+            "total": 0,
+            "stale": 0,
+            "unchanged": 0,
+            "rescored": 0,
+            "started_at": None,
+            "finished_at": None,
+            "error": None
+        }
+
+    def find_stale(self, db: Session, job: Job, inputs_hash: str) -> Tuple[List[int], int]:
+        """Return ids of processed applications whose current score used other inputs, and the processed total"""
+        processed = db.query(Application.id).filter(
+            Application.job_id == job.id,
+            Application.processing_status == "done"
+        )
+        stale = processed.filter(
+            or_(Application.score_inputs_hash.is_(None), Application.score_inputs_hash != inputs_hash)
+        ).order_by(Application.id)
+
+        return [application_id for (application_id,) in stale], processed.count()
+
+    async def run(self, db: Session, job_id: int) -> Dict[str, Any]:
+        """Rescore every application of the job whose inputs changed, again if asked to meanwhile"""
+        return await self.tracker.run(job_id, lambda: self.rescore(db, job_id))
+
+    async def rescore(self, db: Session, job_id: int) -> Dict[str, Any]:
+        """One rescore pass; repeats while the job's inputs change underneath it"""
+        progress = self.new_progress(job_id, status="running")
+        progress["started_at"] = datetime.utcnow().isoformat()
+
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+            if not job:
+                raise ValueError(f"Job {job_id} not found")
+
+            inputs_hash = None
+            while inputs_hash != self.batch_scoring.scoring_service.inputs_hash(job):
+                inputs_hash = self.batch_scoring.scoring_service.inputs_hash(job)
+                stale_ids, total = self.find_stale(db, job, inputs_hash)
+                progress.update({
+                    "inputs_hash": inputs_hash,
+                    "total": total,
+                    "stale": len(stale_ids),
+                    "unchanged": total - len(stale_ids)
+                })
+                await self.save_progress(progress)
+
+                for offset in range(0, len(stale_ids), self.chunk_size):
+                    chunk_ids = stale_ids[offset:offset + self.chunk_size]
+                    applications = db.query(Application).filter(Application.id.in_(chunk_ids)).all()
+                    progress["rescored"] += self.batch_scoring.score_job(db, job, applications)
+                    await self.save_progress(progress)
+
+                # Requirements edited meanwhile make the scores just written stale again
+                db.refresh(job)
+
+            progress["status"] = "completed"
+        except Exception as e:
+            logger.error(f"Error rescoring applications for job {job_id}: {e}")
+            db.rollback()
+            progress["status"] = "failed"
+            progress["error"] = str(e)
+
+        progress["finished_at"] = datetime.utcnow().isoformat()
+        await self.save_progress(progress)
+        logger.info(
+            f"Rescore of job {job_id} {progress['status']}: {progress['rescored']} rescored, "
+            f"{progress['unchanged']} unchanged"
+        )
+        return progress
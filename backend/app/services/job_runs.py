@@ -0,0 +1,70 @@
+import time
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple
+from ..redis_client import redis_client
+from ..config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+class JobRunTracker:
+    """Progress and de-duplication of one kind of per-job background run (rescore, feedback), kept in Redis.
+
+    At most one run per job is queued or running. A request made meanwhile
+    marks the job pending instead, and the run goes again when it finishes,
+    so changes made mid-run are picked up. Every progress save refreshes a
+    heartbeat; a queued or running run that hasn't saved for
+    `settings.job_run_stale_after` seconds is presumed dead and no longer
+    blocks new runs.
+    """
+
+    def __init__(self, name: str, progress_ttl: int):
+        self.name = name
+        self.progress_ttl = progress_ttl
+
+    def progress_key(self, job_id: int) -> str:
+        return f"{self.name}:{job_id}"
+
+    def pending_key(self, job_id: int) -> str:
+        return f"{self.name}:{job_id}:pending"
+
+    async def get_progress(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Return the progress of the job's latest run, or None if there is none"""
+        progress = await redis_client.get(self.progress_key(job_id))
+        return progress if isinstance(progress, dict) else None
+
+    async def save_progress(self, progress: Dict[str, Any]) -> None:
+        progress["heartbeat_at"] = time.time()
+        await redis_client.set(self.progress_key(progress["job_id"]), progress, expire=self.progress_ttl)
+
+    @staticmethod
+    def is_active(progress: Optional[Dict[str, Any]]) -> bool:
+        """Whether a run is queued or running and its worker has reported recently"""
+        if not progress or progress.get("status") not in ACTIVE_STATUSES:
+            return False
+        return time.time() - (progress.get("heartbeat_at") or 0) < settings.job_run_stale_after
+
+    async def request(self, job_id: int, new_progress: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """Ask for a run; returns the progress to report and whether the caller must start the run"""
+        progress = await self.get_progress(job_id)
+        if self.is_active(progress):
+            await redis_client.set(self.pending_key(job_id), True, expire=self.progress_ttl)
+            # The run may have finished (and checked the flag) in between; if so start another
+            progress = await self.get_progress(job_id)
+            if self.is_active(progress):
+                return progress, False
+        elif progress and progress.get("status") in ACTIVE_STATUSES:
+            logger.warning(f"{self.name} run for job {job_id} stopped reporting; starting a new one")
+
+        await self.save_progress(new_progress)
+        return new_progress, True
+
+    async def run(self, job_id: int, run_once: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Run until no request arrived during the last pass; returns the last pass's progress"""
+        while True:
+            await redis_client.delete(self.pending_key(job_id))
+            progress = await run_once()
+            if progress["status"] != "completed" or not await redis_client.get(self.pending_key(job_id)):
+                return progress
+            logger.info(f"{self.name} for job {job_id} was requested again while running; running again")
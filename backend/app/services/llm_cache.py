@@ -0,0 +1,122 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+from ..redis_client import redis_client
+from ..utils.metrics import metrics
+from ..config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump when prompts or result handling change so old completions stop being served
+CACHE_VERSION = "1"
+HITS_KEY = "llm_cache:hits"
+MISSES_KEY = "llm_cache:misses"
+REQUESTS_METRIC = "llm_cache_requests_total"
+
+metrics.describe(REQUESTS_METRIC, "LLM response cache lookups by outcome (memory hit, redis hit, miss, bypass)")
+
+def normalize_prompt(text: str) -> str:
+    """Prompt text with indentation, blank lines and runs of whitespace removed"""
+    return "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
+
+class LLMResponseCache:
+    """Two-tier (in-process LRU, then Redis) cache of parsed LLM completions.
+
+    Entries are keyed by a digest of the model, the normalized messages and
+    the sampling parameters, so regenerating a role with identical inputs is
+    served without calling the model. Only real completions are stored;
+    callers decide what counts as one.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[int] = None, enabled: Optional[bool] = None):
+        self.max_entries = max_entries or settings.llm_cache_max_entries
+        self.ttl = ttl or settings.llm_cache_ttl
+        self.enabled = settings.llm_cache_enabled if enabled is None else enabled
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        payload = json.dumps({
+            "model": model,
+            "messages": [{"role": message["role"], "content": normalize_prompt(message["content"])} for message in messages],
+            "params": params
+        }, sort_keys=True)
+        return f"llm_cache:{CACHE_VERSION}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set_local(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Cached completion for the key, or None on a miss"""
+        if not self.enabled:
+            return None
+        value = self._get_local(key)
+        if value is not None:
+            metrics.increment(REQUESTS_METRIC, result="hit_memory")
+            await redis_client.increment(HITS_KEY)
+            return value
+
+        value = await redis_client.get(key)
+        if value is not None and not isinstance(value, str):
+            # Promote to the in-process tier for the next lookup
+            self._set_local(key, value)
+            metrics.increment(REQUESTS_METRIC, result="hit_redis")
+            await redis_client.increment(HITS_KEY)
+            return value
+
+        metrics.increment(REQUESTS_METRIC, result="miss")
+        await redis_client.increment(MISSES_KEY)
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store a completion in both tiers"""
+        if not self.enabled:
+            return
+        self._set_local(key, value)
+        await redis_client.set(key, value, expire=self.ttl)
+
+    def record_bypass(self) -> None:
+        """Count a lookup skipped because the caller asked for a fresh completion"""
+        metrics.increment(REQUESTS_METRIC, result="bypass")
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters shared through Redis, plus this process's tier breakdown"""
+        hits = int(await redis_client.get(HITS_KEY) or 0)
+        misses = int(await redis_client.get(MISSES_KEY) or 0)
+        total = hits + misses
+        local = {
+            result: int(metrics.counter_value(REQUESTS_METRIC, result=result))
+            for result in ["hit_memory", "hit_redis", "miss", "bypass"]
+        }
+        local_total = local["hit_memory"] + local["hit_redis"] + local["miss"]
+        return {
+            "enabled": self.enabled,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "process": {
+                **local,
+                "hit_rate": round((local["hit_memory"] + local["hit_redis"]) / local_total, 4) if local_total else 0.0,
+                "entries": len(self._entries)
+            }
+        }
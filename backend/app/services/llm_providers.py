@@ -0,0 +1,231 @@
+import abc
+import asyncio
+import hashlib
+import json
+import random
+import weakref
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple, Type
+import httpx
+import openai
+from ..config import settings
+from ..utils.token_budget import count_tokens, count_message_tokens
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Completion:
+    """Text of a chat completion and the tokens it used"""
+
+    def __init__(self, content: str, prompt_tokens: int = 0, completion_tokens: int = 0, model: Optional[str] = None):
+        self.content = content
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.model = model
+
+class LLMProvider(abc.ABC):
+    """Chat completion backend used by LLMService"""
+
+    name = "base"
+    # Provider-specific exceptions worth retrying besides timeouts, 429s and 5xx responses
+    transient_errors: Tuple[Type[BaseException], ...] = ()
+
+    @abc.abstractmethod
+    async def complete(self, model: str, messages: List[Dict[str, str]], **params) -> Completion:
+        """Run a chat completion to the end"""
+
+    @abc.abstractmethod
+    async def stream(self, model: str, messages: List[Dict[str, str]], **params) -> AsyncIterator[str]:
+        """Open a streaming completion and return an iterator over its text pieces.
+
+        Awaiting this makes the request, so connection errors surface here
+        (where they can still be retried) rather than mid-iteration.
+        """
+
+    async def close(self) -> None:
+        pass
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI (or an OpenAI-compatible server) through one pooled AsyncOpenAI client per event loop.
+
+    The client keeps connections alive between calls and applies explicit
+    connect/read timeouts. Its own retries are off; LLMService retries with
+    backoff and a circuit breaker.
+    """
+
+    name = "openai"
+    transient_errors = (openai.APIConnectionError,)
+
+    def __init__(self):
+        # httpx connections are bound to the loop that opened them; the API runs one loop
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, openai.AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+    def client(self) -> openai.AsyncOpenAI:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.llm_read_timeout, connect=settings.llm_connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=settings.llm_max_connections,
+                    max_keepalive_connections=settings.llm_max_keepalive_connections,
+                    keepalive_expiry=settings.llm_keepalive_expiry
+                )
+            )
+            client = openai.AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                base_url=settings.llm_base_url,
+                max_retries=0,
+                http_client=http_client
+            )
+            self._clients[loop] = client
+        return client
+
+    async def complete(self, model: str, messages: List[Dict[str, str]], **params) -> Completion:
+        response = await self.client().chat.completions.create(model=model, messages=messages, **params)
+        usage = response.usage
+        return Completion(
+            response.choices[0].message.content or "",
+            usage.prompt_tokens if usage else 0,
+            usage.completion_tokens if usage else 0,
+            response.model
+        )
+
+    async def stream(self, model: str, messages: List[Dict[str, str]], **params) -> AsyncIterator[str]:
+        response = await self.client().chat.completions.create(model=model, messages=messages, stream=True, **params)
+
+        async def pieces():
+            try:
+                async for chunk in response:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                # Give the connection back to the pool when the reader stops early or fails
+                await response.response.aclose()
+        return pieces()
+
+    async def close(self) -> None:
+        clients = list(self._clients.items())
+        self._clients = weakref.WeakKeyDictionary()
+        for loop, client in clients:
+            if loop is asyncio.get_running_loop():
+                await client.close()
+
+class StubProviderError(Exception):
+    """Simulated provider failure, shaped like an HTTP error (status_code, response headers)"""
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        headers = {"retry-after": f"{retry_after:g}"} if retry_after is not None else {}
+        self.response = httpx.Response(status_code, headers=headers)
+
+def stub_content(messages: List[Dict[str, str]]) -> str:
+    """Deterministic, well-formed JSON answer for the kind of prompt sent"""
+    prompt = messages[-1]["content"] if messages else ""
+    seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+    pick = random.Random(seed)
+    skills = ["Python", "SQL", "Docker", "Kubernetes", "AWS", "React", "Go", "Communication", "Leadership", "Testing"]
+    if '"key_skills"' in prompt:
+        return json.dumps({
+            "key_skills": pick.sample(skills, 5),
+            "required_experience": f"{pick.randint(2, 8)}+ years of relevant experience",
+            "certifications": pick.sample(["AWS Certified", "CKA", "PMP", "Scrum Master"], 2),
+            "additional_requirements": ["Strong communication skills", "Experience working in agile teams"]
+        })
+    if '"short_description"' in prompt:
+        paragraphs = [
+            "About the role: you will design, build and operate services used by thousands of people every day.",
+            "Responsibilities: " + " ".join(f"Deliver {skill} work with the team." for skill in pick.sample(skills, 6)),
+            "Requirements: " + ", ".join(pick.sample(skills, 4)) + " and a habit of writing things down.",
+            "Benefits: competitive salary, learning budget, flexible hours and a collaborative team."
+        ]
+        return json.dumps({
+            "description": "\n\n".join(paragraphs),
+            "short_description": "A hands-on role building reliable services with a collaborative team."
+        })
+    if '"feedback"' in prompt:
+        candidates = []
+        for line in prompt.splitlines():
+            line = line.strip()
+            if line.startswith('{"id"'):
+                try:
+                    candidates.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return json.dumps({"feedback": [
+            {
+                "id": candidate["id"],
+                "feedback": (
+                    f"Final score {candidate.get('final_score')}. Matches {', '.join(candidate.get('matched_skills') or ['none'])}; "
+                    f"missing {', '.join(candidate.get('missing_skills') or ['none'])}. "
+                    + ("Worth an interview." if (candidate.get("final_score") or 0) >= 80 else "Review before inviting.")
+                )
+            }
+            for candidate in candidates
+        ]})
+    return json.dumps({"text": "Stub completion."})
+
+class StubProvider(LLMProvider):
+    """In-process fake provider for offline development and load tests.
+
+    Waits `latency` seconds (plus `token_latency` per streamed piece), then
+    returns deterministic JSON matching the prompt. A `failure_rate`
+    fraction of calls raise a 503 and a `rate_limit_rate` fraction a 429
+    with Retry-After, so retries and the circuit breaker can be exercised.
+    """
+
+    name = "stub"
+
+    def __init__(
+        self,
+        latency: Optional[float] = None,
+        token_latency: Optional[float] = None,
+        failure_rate: Optional[float] = None,
+        rate_limit_rate: Optional[float] = None
+    ):
+        self.latency = settings.llm_stub_latency if latency is None else latency
+        self.token_latency = settings.llm_stub_token_latency if token_latency is None else token_latency
+        self.failure_rate = settings.llm_stub_failure_rate if failure_rate is None else failure_rate
+        self.rate_limit_rate = settings.llm_stub_rate_limit_rate if rate_limit_rate is None else rate_limit_rate
+
+    async def _respond(self) -> None:
+        """Simulate time to first token and injected failures"""
+        await asyncio.sleep(self.latency)
+        draw = random.random()
+        if draw < self.failure_rate:
+            raise StubProviderError(503, "Stub provider failure")
+        if draw < self.failure_rate + self.rate_limit_rate:
+            raise StubProviderError(429, "Stub provider rate limit", retry_after=1)
+
+    async def complete(self, model: str, messages: List[Dict[str, str]], **params) -> Completion:
+        await self._respond()
+        content = stub_content(messages)
+        await asyncio.sleep(self.token_latency * count_tokens(content) / 4)
+        return Completion(content, count_message_tokens(messages), count_tokens(content), model)
+
+    async def stream(self, model: str, messages: List[Dict[str, str]], **params) -> AsyncIterator[str]:
+        await self._respond()
+        content = stub_content(messages)
+
+        async def pieces():
+            for start in range(0, len(content), 16):
+                await asyncio.sleep(self.token_latency)
+                yield content[start:start + 16]
+        return pieces()
+
+PROVIDERS = {"openai": OpenAIProvider, "stub": StubProvider}
+_provider: Optional[LLMProvider] = None
+
+def get_provider() -> LLMProvider:
+    """The process-wide provider selected by LLM_PROVIDER"""
+    global _provider
+    if _provider is None:
+        if settings.llm_provider not in PROVIDERS:
+            raise ValueError(f"Unknown LLM provider {settings.llm_provider!r}; expected one of {sorted(PROVIDERS)}")
+        _provider = PROVIDERS[settings.llm_provider]()
+        logger.info(f"Using LLM provider {_provider.name}")
+    return _provider
+
+async def close_provider() -> None:
+    if _provider is not None:
+        await _provider.close()
@@ -1,61 +1,356 @@
-import openai
-from typing import List, Dict, Any
+import asyncio
+import time
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Optional, Tuple
 from ..config import settings
+from ..utils.json_stream import JsonFieldStream
+from ..utils.metrics import metrics, record, timer
+from ..utils.resilience import (
+    SingleFlight, ConcurrencyLimiter, CircuitBreaker, CircuitOpenError, ConcurrencyTimeoutError,
+    is_retryable, retry_after_seconds, backoff_delay, status_code
+)
+from .llm_cache import LLMResponseCache
+from ..utils.token_budget import PromptBudget, compact, count_tokens, count_message_tokens, truncate, truncate_items
+from .llm_providers import LLMProvider, Completion, get_provider
 import logging
 import json
 
 logger = logging.getLogger(__name__)
 
+# Keys a completion must contain to be used (and cached)
+JOB_FIELDS_KEYS = ("key_skills", "required_experience", "certifications", "additional_requirements")
+JOB_DESCRIPTION_KEYS = ("description", "short_description")
+FEEDBACK_KEYS = ("feedback",)
+FEEDBACK_TOKENS_PER_CANDIDATE = 120
+# Project names and role titles are cut to this many tokens in prompts
+TITLE_MAX_TOKENS = 40
+
+REQUESTS_METRIC = "llm_requests_total"
+RETRIES_METRIC = "llm_retries_total"
+TOKENS_METRIC = "llm_tokens_total"
+PROMPT_TOKENS_METRIC = "llm_prompt_tokens"
+COMPLETION_TOKENS_METRIC = "llm_completion_tokens"
+TOKEN_BUCKETS = (32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+metrics.describe(REQUESTS_METRIC, "LLM completions by outcome (success, failure, circuit_open, queue_timeout, coalesced)")
+metrics.describe(RETRIES_METRIC, "LLM calls repeated after a retryable error")
+metrics.describe(TOKENS_METRIC, "Tokens sent to and generated by the LLM provider (estimated for streams)")
+metrics.describe(PROMPT_TOKENS_METRIC, "Prompt tokens per LLM call, by call", TOKEN_BUCKETS)
+metrics.describe(COMPLETION_TOKENS_METRIC, "Completion tokens per LLM call, by call", TOKEN_BUCKETS)
+
+# Shared by every LLMService in the process so limits and provider health are global
+single_flight = SingleFlight()
+concurrency_limiter = ConcurrencyLimiter(settings.llm_max_concurrency, settings.llm_queue_timeout)
+circuit_breaker = CircuitBreaker("llm", settings.llm_breaker_failure_threshold, settings.llm_breaker_reset_timeout)
+
+def counts_as_provider_failure(exc: BaseException) -> bool:
+    """Errors that say the provider is unhealthy, as opposed to a bad request"""
+    code = status_code(exc)
+    return code is None or is_retryable(exc)
+
 class LLMService:
-    def __init__(self):
-        if settings.openai_api_key:
-            openai.api_key = settings.openai_api_key
+    def __init__(self, provider: Optional[LLMProvider] = None):
+        self._provider = provider
+        self.cache = LLMResponseCache()
+        self.single_flight = single_flight
+        self.concurrency = concurrency_limiter
+        self.breaker = circuit_breaker
     
-    async def generate_job_fields(self, project_name: str, role_title: str, role_description: str) -> Dict[str, Any]:
-        """Generate additional job fields using LLM"""
+    @property
+    def provider(self) -> LLMProvider:
+        # Resolved lazily so importing the API doesn't build an HTTP client
+        return self._provider or get_provider()
+    
+    def _record_tokens(self, name: str, model: str, prompt_tokens: int, completion_tokens: int, max_tokens: int) -> None:
+        metrics.increment(TOKENS_METRIC, prompt_tokens, kind="prompt", model=model)
+        metrics.increment(TOKENS_METRIC, completion_tokens, kind="completion", model=model)
+        metrics.observe(PROMPT_TOKENS_METRIC, prompt_tokens, call=name)
+        metrics.observe(COMPLETION_TOKENS_METRIC, completion_tokens, call=name)
+        logger.info(f"LLM {name}: {prompt_tokens} prompt + {completion_tokens} completion tokens (max_tokens {max_tokens})")
+    
+    def _fit_request(
+        self,
+        system: str,
+        template: str,
+        fields: Dict[str, str],
+        params: Dict[str, Any],
+        shrinkable: Optional[str] = None,
+        min_completion_tokens: Optional[int] = None
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """Compacted messages, and params with max_tokens lowered to what the context window has left.
+
+        params["max_tokens"] is the most the answer may need. If the prompt
+        leaves less than the minimum for it, the `shrinkable` field is cut
+        to fit; a prompt that still doesn't fit raises ValueError.
+        """
+        budget = PromptBudget(
+            settings.llm_context_tokens,
+            params["max_tokens"],
+            settings.llm_min_completion_tokens if min_completion_tokens is None else min_completion_tokens
+        )
+        # Dedent the template before filling it, so multi-line values don't defeat the dedent
+        template = compact(template)
+        
+        def build() -> List[Dict[str, str]]:
+            return [
+                {"role": "system", "content": system},
+                {"role": "user", "content": template.format(**fields)}
+            ]
+        
+        messages = build()
+        for _ in range(3):
+            overflow = budget.overflow(count_message_tokens(messages))
+            if not overflow or not shrinkable:
+                break
+            text = fields[shrinkable]
+            fields = {**fields, shrinkable: truncate(text, count_tokens(text) - overflow)}
+            messages = build()
+        
+        prompt_tokens = count_message_tokens(messages)
+        if budget.overflow(prompt_tokens):
+            raise ValueError(
+                f"Prompt of about {prompt_tokens} tokens leaves under {budget.min_completion_tokens} "
+                f"for the answer in a {settings.llm_context_tokens}-token context"
+            )
+        return messages, {**params, "max_tokens": budget.completion_tokens(prompt_tokens)}
+    
+    def _check_circuit(self) -> None:
+        """Fail fast while the provider is failing"""
+        if not self.breaker.allow():
+            metrics.increment(REQUESTS_METRIC, outcome="circuit_open")
+            raise CircuitOpenError("LLM provider is failing; using the fallback until it recovers")
+    
+    def _record_outcome(self, exc: Optional[BaseException] = None) -> None:
+        if exc is None:
+            self.breaker.record_success()
+            metrics.increment(REQUESTS_METRIC, outcome="success")
+        elif isinstance(exc, ConcurrencyTimeoutError):
+            # Says nothing about the provider's health
+            metrics.increment(REQUESTS_METRIC, outcome="queue_timeout")
+        elif counts_as_provider_failure(exc):
+            self.breaker.record_failure()
+            metrics.increment(REQUESTS_METRIC, outcome="failure")
+        else:
+            # The provider answered, it just rejected this request
+            self.breaker.record_success()
+            metrics.increment(REQUESTS_METRIC, outcome="failure")
+    
+    async def _with_retries(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a provider call, backing off with jitter on retryable errors and honouring Retry-After"""
+        deadline = time.monotonic() + settings.llm_retry_budget
+        attempt = 0
+        while True:
+            try:
+                return await call()
+            except Exception as e:
+                if attempt >= settings.llm_max_retries or not is_retryable(e, self.provider.transient_errors):
+                    raise
+                delay = backoff_delay(
+                    attempt, settings.llm_retry_base_delay, settings.llm_retry_max_delay, retry_after_seconds(e)
+                )
+                if time.monotonic() + delay > deadline:
+                    raise
+                attempt += 1
+                metrics.increment(RETRIES_METRIC)
+                logger.warning(f"LLM call failed ({e}); retry {attempt}/{settings.llm_max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+    
+    async def _call_model(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """A provider call behind the circuit breaker, the concurrency limit and retries"""
+        self._check_circuit()
         try:
-            prompt = f"""
-            Based on the following job information, suggest relevant fields for a job posting:
-            
-            Project Name: {project_name}
-            Role Title: {role_title}
-            Role Description: {role_description}
-            
-            Please provide a JSON response with the following structure:
-            {{
-                "key_skills": ["skill1", "skill2", "skill3"],
-                "required_experience": "X years of experience in...",
-                "certifications": ["cert1", "cert2"],
-                "additional_requirements": ["req1", "req2"]
-            }}
-            
-            Make sure the suggestions are relevant to the role and realistic.
-            """
-            
-            response = await openai.ChatCompletion.acreate(
-                model=settings.llm_model,
-                messages=[
-                    {"role": "system", "content": "You are an expert HR assistant helping to create detailed job descriptions. Always respond with valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=500
+            async with self.concurrency.slot():
+                response = await self._with_retries(call)
+        except Exception as e:
+            self._record_outcome(e)
+            raise
+        self._record_outcome()
+        return response
+    
+    async def _complete(
+        self,
+        name: str,
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any],
+        required_keys: tuple,
+        cache_key: str
+    ) -> Optional[Dict[str, Any]]:
+        """Call the model, parse the completion and cache it if usable"""
+        with timer("llm.completion"):
+            completion: Completion = await self._call_model(
+                lambda: self.provider.complete(settings.llm_model, messages, **params)
             )
+        self._record_tokens(name, settings.llm_model, completion.prompt_tokens, completion.completion_tokens, params["max_tokens"])
+        
+        result = self._parse_completion(completion.content, required_keys)
+        if result is None:
+            return None
+        
+        # A fresh completion replaces any cached one, so regenerating updates what later calls see
+        await self.cache.set(cache_key, result)
+        return result
+    
+    async def _cached_completion(
+        self,
+        name: str,
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any],
+        required_keys: tuple,
+        regenerate: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Parsed JSON completion, served from the cache unless regenerating; None if the output is unusable"""
+        cache_key = self.cache.key(settings.llm_model, messages, params)
+        if regenerate:
+            self.cache.record_bypass()
+        else:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        # Identical prompts already in flight share that call
+        result, shared = await self.single_flight.run(
+            cache_key, lambda: self._complete(name, messages, params, required_keys, cache_key)
+        )
+        if shared:
+            metrics.increment(REQUESTS_METRIC, outcome="coalesced")
+        return result
+    
+    async def _stream_completion(self, name: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> AsyncIterator[str]:
+        """Completion text as the model produces it; retries only happen before the first chunk"""
+        self._check_circuit()
+        try:
+            async with self.concurrency.slot():
+                pieces = await self._with_retries(
+                    lambda: self.provider.stream(settings.llm_model, messages, **params)
+                )
+                content = []
+                async for text in pieces:
+                    content.append(text)
+                    yield text
+            # Stream responses carry no usage; estimate it
+            self._record_tokens(
+                name, settings.llm_model, count_message_tokens(messages), count_tokens("".join(content)), params["max_tokens"]
+            )
+        except Exception as e:
+            self._record_outcome(e)
+            raise
+        self._record_outcome()
+    
+    @staticmethod
+    def _parse_completion(content: str, required_keys: tuple) -> Optional[Dict[str, Any]]:
+        """JSON object from completion text, or None if it is not valid or lacks a required key"""
+        try:
+            result = json.loads(content.strip())
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(result, dict) or any(key not in result for key in required_keys):
+            return None
+        return result
+    
+    async def generate_job_fields(
+        self,
+        project_name: str,
+        role_title: str,
+        role_description: str,
+        regenerate: bool = False
+    ) -> Dict[str, Any]:
+        """Generate additional job fields using LLM"""
+        try:
+            messages, params = self._job_fields_request(project_name, role_title, role_description)
+            result = await self._cached_completion("job_fields", messages, params, JOB_FIELDS_KEYS, regenerate)
             
-            content = response.choices[0].message.content.strip()
-            
-            # Try to extract JSON from the response
-            try:
-                result = json.loads(content)
-                return result
-            except json.JSONDecodeError:
-                # Fallback if JSON parsing fails
-                return self._fallback_job_fields(role_title)
+            # Fallback if the response isn't usable JSON (never cached)
+            return result if result is not None else self._fallback_job_fields(role_title)
                 
         except Exception as e:
             logger.error(f"Error generating job fields: {e}")
             return self._fallback_job_fields(role_title)
     
+    def _job_fields_request(
+        self,
+        project_name: str,
+        role_title: str,
+        role_description: str
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """Messages and sampling parameters for a job fields completion"""
+        prompt = """
+        Based on the following job information, suggest relevant fields for a job posting:
+        
+        Project Name: {project_name}
+        Role Title: {role_title}
+        Role Description: {role_description}
+        
+        Please provide a JSON response with the following structure:
+        {{
+            "key_skills": ["skill1", "skill2", "skill3"],
+            "required_experience": "X years of experience in...",
+            "certifications": ["cert1", "cert2"],
+            "additional_requirements": ["req1", "req2"]
+        }}
+        
+        Make sure the suggestions are relevant to the role and realistic.
+        """
+        
+        return self._fit_request(
+            "You are an expert HR assistant helping to create detailed job descriptions. Always respond with valid JSON.",
+            prompt,
+            {
+                "project_name": truncate(compact(project_name), TITLE_MAX_TOKENS),
+                "role_title": truncate(compact(role_title), TITLE_MAX_TOKENS),
+                "role_description": truncate(compact(role_description), settings.llm_field_max_tokens)
+            },
+            {"temperature": 0.7, "max_tokens": 500},
+            shrinkable="role_description"
+        )
+    
+    def _job_description_request(
+        self,
+        project_name: str,
+        role_title: str,
+        role_description: str,
+        key_skills: List[str],
+        required_experience: str,
+        certifications: List[str],
+        additional_requirements: List[str]
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """Messages and sampling parameters for a job description completion"""
+        prompt = """
+        Create a professional job description based on the following information:
+        
+        Project Name: {project_name}
+        Role Title: {role_title}
+        Basic Description: {role_description}
+        Key Skills: {skills_str}
+        Required Experience: {required_experience}
+        Certifications: {certs_str}
+        Additional Requirements: {reqs_str}
+        
+        Please provide a JSON response with:
+        {{
+            "description": "A comprehensive job description with sections for responsibilities, requirements, and benefits",
+            "short_description": "A brief 2-3 sentence summary of the role"
+        }}
+        
+        Make the description professional, engaging, and well-structured.
+        """
+        
+        def items(values: List[str]) -> str:
+            return ", ".join(truncate_items([compact(value) for value in values], settings.llm_list_max_tokens))
+        
+        return self._fit_request(
+            "You are an expert HR professional creating compelling job descriptions. Always respond with valid JSON.",
+            prompt,
+            {
+                "project_name": truncate(compact(project_name), TITLE_MAX_TOKENS),
+                "role_title": truncate(compact(role_title), TITLE_MAX_TOKENS),
+                "role_description": truncate(compact(role_description), settings.llm_field_max_tokens),
+                "skills_str": items(key_skills),
+                "required_experience": truncate(compact(required_experience), settings.llm_list_max_tokens),
+                "certs_str": items(certifications),
+                "reqs_str": items(additional_requirements)
+            },
+            {"temperature": 0.7, "max_tokens": 1000},
+            shrinkable="role_description"
+        )
+    
     async def generate_job_description(
         self, 
         project_name: str, 
@@ -64,56 +359,139 @@ class LLMService:
         key_skills: List[str],
         required_experience: str,
         certifications: List[str],
-        additional_requirements: List[str]
+        additional_requirements: List[str],
+        regenerate: bool = False
     ) -> Dict[str, str]:
         """Generate complete job description using LLM"""
         try:
-            skills_str = ", ".join(key_skills)
-            certs_str = ", ".join(certifications)
-            reqs_str = ", ".join(additional_requirements)
-            
-            prompt = f"""
-            Create a professional job description based on the following information:
-            
-            Project Name: {project_name}
-            Role Title: {role_title}
-            Basic Description: {role_description}
-            Key Skills: {skills_str}
-            Required Experience: {required_experience}
-            Certifications: {certs_str}
-            Additional Requirements: {reqs_str}
-            
-            Please provide a JSON response with:
-            {{
-                "description": "A comprehensive job description with sections for responsibilities, requirements, and benefits",
-                "short_description": "A brief 2-3 sentence summary of the role"
-            }}
-            
-            Make the description professional, engaging, and well-structured.
-            """
-            
-            response = await openai.ChatCompletion.acreate(
-                model=settings.llm_model,
-                messages=[
-                    {"role": "system", "content": "You are an expert HR professional creating compelling job descriptions. Always respond with valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000
+            messages, params = self._job_description_request(
+                project_name, role_title, role_description, key_skills,
+                required_experience, certifications, additional_requirements
             )
+            result = await self._cached_completion("job_description", messages, params, JOB_DESCRIPTION_KEYS, regenerate)
             
-            content = response.choices[0].message.content.strip()
-            
-            try:
-                result = json.loads(content)
-                return result
-            except json.JSONDecodeError:
-                return self._fallback_job_description(role_title, role_description)
+            return result if result is not None else self._fallback_job_description(role_title, role_description)
                 
         except Exception as e:
             logger.error(f"Error generating job description: {e}")
             return self._fallback_job_description(role_title, role_description)
     
+    async def stream_job_description(
+        self,
+        project_name: str,
+        role_title: str,
+        role_description: str,
+        key_skills: List[str],
+        required_experience: str,
+        certifications: List[str],
+        additional_requirements: List[str],
+        regenerate: bool = False
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream a job description as (field, text) pieces while the model writes it, then ("done", result).
+
+        The final result is authoritative: the complete parsed completion, a
+        cached one, or the fallback if the model failed part-way.
+        """
+        result = None
+        source = "model"
+        try:
+            messages, params = self._job_description_request(
+                project_name, role_title, role_description, key_skills,
+                required_experience, certifications, additional_requirements
+            )
+            cache_key = self.cache.key(settings.llm_model, messages, params)
+            if regenerate:
+                self.cache.record_bypass()
+            else:
+                result = await self.cache.get(cache_key)
+            
+            if result is not None:
+                source = "cache"
+                for field in JOB_DESCRIPTION_KEYS:
+                    yield field, result[field]
+            else:
+                fields = JsonFieldStream()
+                content = []
+                start = time.perf_counter()
+                async for text in self._stream_completion("job_description", messages, params):
+                    if not content:
+                        record("llm.stream.first_token", time.perf_counter() - start)
+                    content.append(text)
+                    for field, piece in fields.feed(text):
+                        if field in JOB_DESCRIPTION_KEYS:
+                            yield field, piece
+                
+                result = self._parse_completion("".join(content), JOB_DESCRIPTION_KEYS)
+                if result is not None:
+                    await self.cache.set(cache_key, result)
+        except Exception as e:
+            logger.error(f"Error streaming job description: {e}")
+            result = None
+        
+        if result is None:
+            source = "fallback"
+            result = self._fallback_job_description(role_title, role_description)
+        yield "done", {**result, "source": source}
+    
+    async def generate_candidate_feedback(
+        self,
+        job_title: str,
+        key_skills: List[str],
+        candidates: List[Dict[str, Any]],
+        regenerate: bool = False
+    ) -> Dict[int, str]:
+        """Screening feedback for several candidates from one completion, keyed by application id.
+
+        candidates are score summaries with an "id"; ids the model leaves out
+        or garbles are missing from the result. Provider errors (and a batch
+        too large for the context window) propagate.
+        """
+        prompt = """
+        Write screening feedback for each candidate below, who applied for the role "{job_title}" (key skills: {key_skills}).
+        Each line is one candidate: scores from 0 to 100 and the required skills they match or miss.
+        
+        {candidate_lines}
+        
+        For every candidate write 2-3 sentences for the hiring team: main strengths, main gaps, and whether to prioritise an interview.
+        Use only the data given.
+        
+        Please provide a JSON response with:
+        {{
+            "feedback": [{{"id": <candidate id>, "feedback": "..."}}]
+        }}
+        containing every candidate exactly once.
+        """
+        
+        answer_tokens = FEEDBACK_TOKENS_PER_CANDIDATE * len(candidates) + 50
+        messages, params = self._fit_request(
+            "You are an experienced recruiter reviewing candidate scores. Always respond with valid JSON.",
+            prompt,
+            {
+                "job_title": truncate(compact(job_title), TITLE_MAX_TOKENS),
+                "key_skills": ", ".join(truncate_items(key_skills, settings.llm_list_max_tokens)),
+                "candidate_lines": "\n".join(json.dumps(candidate, separators=(",", ":")) for candidate in candidates)
+            },
+            {"temperature": 0.3, "max_tokens": answer_tokens},
+            # A cut-off answer would lose candidates, so the whole answer must fit
+            min_completion_tokens=answer_tokens
+        )
+        result = await self._cached_completion("candidate_feedback", messages, params, FEEDBACK_KEYS, regenerate)
+        if result is None or not isinstance(result["feedback"], list):
+            return {}
+        
+        expected = {candidate["id"] for candidate in candidates}
+        feedback = {}
+        for item in result["feedback"]:
+            if not isinstance(item, dict) or not isinstance(item.get("feedback"), str) or not item["feedback"].strip():
+                continue
+            try:
+                application_id = int(item.get("id"))
+            except (TypeError, ValueError):
+                continue
+            if application_id in expected:
+                feedback[application_id] = item["feedback"].strip()
+        return feedback
+    
     def _fallback_job_fields(self, role_title: str) -> Dict[str, Any]:
         """Fallback job fields if LLM fails"""
         # Simple keyword-based suggestions
@@ -0,0 +1,134 @@
+from typing import Dict, Any, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..models.resume import ResumeParseCache, ResumeText
+from ..redis_client import redis_client
+from ..utils.resume_parser import get_parser_version
+from ..utils.parser_pool import resume_parser_pool
+from ..utils.text_processing import tokenize, term_frequencies, compress_text, compress_json
+from ..utils.minhash import signature
+from ..config import settings
+from .semantic_match import SemanticMatchService
+import logging
+
+logger = logging.getLogger(__name__)
+
+HITS_KEY = "resume_parse_cache:hits"
+MISSES_KEY = "resume_parse_cache:misses"
+
+class ResumeParseCacheService:
+    """Two-tier (Redis, then Postgres) cache of parse_resume output keyed by file digest.
+
+    The full text is kept out of the cached payload and stored once per digest in resume_texts.
+    """
+
+    def __init__(self, parser_version: Optional[str] = None):
+        self._parser_version = parser_version
+        self.semantic_service = SemanticMatchService()
+
+    @property
+    def parser_version(self) -> str:
+        # Resolved lazily so the taxonomy is only loaded when the cache is used
+        return self._parser_version or get_parser_version()
+
+    def _redis_key(self, file_hash: str) -> str:
+        return f"resume_parse:{self.parser_version}:{file_hash}"
+
+    async def get(self, db: Session, file_hash: str) -> Optional[Dict[str, Any]]:
+        """Return cached parse output for a digest, or None on a miss"""
+        parsed_data = await redis_client.get(self._redis_key(file_hash))
+        if isinstance(parsed_data, dict):
+            return parsed_data
+
+        entry = db.query(ResumeParseCache).filter(
+            ResumeParseCache.file_hash == file_hash,
+            ResumeParseCache.parser_version == self.parser_version
+        ).first()
+        if not entry:
+            return None
+
+        # Promote to the Redis tier for the next lookup
+        await redis_client.set(self._redis_key(file_hash), entry.parsed_data, expire=settings.resume_parse_cache_ttl)
+        return entry.parsed_data
+
+    async def set(self, db: Session, file_hash: str, parsed_data: Dict[str, Any]) -> None:
+        """Store parse output in both tiers"""
+        try:
+            with db.begin_nested():
+                db.add(ResumeParseCache(
+                    file_hash=file_hash,
+                    parser_version=self.parser_version,
+                    parsed_data=parsed_data
+                ))
+            db.commit()
+        except IntegrityError:
+            # Another worker parsed the same file concurrently
+            logger.info(f"Parse cache entry for {file_hash} already exists")
+
+        await redis_client.set(self._redis_key(file_hash), parsed_data, expire=settings.resume_parse_cache_ttl)
+
+    async def get_or_parse(self, db: Session, file_path: str, filename: str, file_hash: Optional[str]) -> Dict[str, Any]:
+        """Return cached parse output for the file, parsing and caching it on a miss"""
+        if not file_hash:
+            parsed_data = await resume_parser_pool.parse(file_path, filename)
+            parsed_data.pop('raw_text', None)
+            return parsed_data
+
+        parsed_data = await self.get(db, file_hash)
+        if parsed_data is not None:
+            await redis_client.increment(HITS_KEY)
+            return parsed_data
+
+        await redis_client.increment(MISSES_KEY)
+        parsed_data = await resume_parser_pool.parse(file_path, filename)
+        # Empty text usually means an unreadable file; don't pin that result
+        text = parsed_data.pop('raw_text', '')
+        if text:
+            self.save_text(db, file_hash, text)
+            await self.set(db, file_hash, parsed_data)
+        return parsed_data
+
+    def save_text(self, db: Session, file_hash: str, text: str) -> ResumeText:
+        """Store the full extracted text and its term frequencies, compressed, once per digest"""
+        tokens = tokenize(text)
+        frequencies = term_frequencies(tokens)
+        values = {
+            "text_compressed": compress_text(text),
+            "term_frequencies_compressed": compress_json(frequencies),
+            "token_count": len(tokens),
+            "minhash_signature": signature(text)
+        }
+
+        resume_text = db.query(ResumeText).filter(ResumeText.file_hash == file_hash).first()
+        is_new = resume_text is None
+        try:
+            with db.begin_nested():
+                if resume_text:
+                    for field, value in values.items():
+                        setattr(resume_text, field, value)
+                else:
+                    values["semantic_vector"] = self.semantic_service.vectorize(frequencies)
+                    resume_text = ResumeText(file_hash=file_hash, **values)
+                    db.add(resume_text)
+            db.commit()
+        except IntegrityError:
+            # Another worker stored the same file concurrently
+            logger.info(f"Resume text for {file_hash} already exists")
+            return db.query(ResumeText).filter(ResumeText.file_hash == file_hash).first()
+
+        # Only a new file adds to the document frequencies
+        if is_new:
+            self.semantic_service.record_documents(db, [frequencies])
+        return resume_text
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters shared by the API and the workers"""
+        hits = int(await redis_client.get(HITS_KEY) or 0)
+        misses = int(await redis_client.get(MISSES_KEY) or 0)
+        total = hits + misses
+        return {
+            "parser_version": self.parser_version,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0
+        }
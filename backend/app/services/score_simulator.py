@@ -0,0 +1,175 @@
+from typing import Dict, List, Any, Optional
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..models.application import Application
+from ..models.job import Job
+from .scoring_service import ScoringService
+
+# Status bands, in the order of determine_candidate_status's thresholds
+STATUSES = ["rejected", "under_review", "shortlisted"]
+CONFIG_FIELDS = ["match_score_weight", "ats_score_weight", "semantic_score_weight", "shortlist_threshold", "requalify_threshold"]
+
+class ScoreSimulatorService:
+    """What-if scoring: re-derives statuses from stored sub-scores under other weights and thresholds.
+
+    The stored match, ATS and semantic averages are loaded once into column
+    arrays and every candidate config is evaluated with array arithmetic.
+    Nothing is written.
+    """
+
+    def __init__(self, scoring_service: Optional[ScoringService] = None):
+        self.scoring_service = scoring_service or ScoringService()
+
+    def current_config(self) -> Dict[str, float]:
+        return {
+            "match_score_weight": self.scoring_service.match_weight,
+            "ats_score_weight": self.scoring_service.ats_weight,
+            "semantic_score_weight": self.scoring_service.semantic_weight,
+            "shortlist_threshold": self.scoring_service.shortlist_threshold,
+            "requalify_threshold": self.scoring_service.requalify_threshold
+        }
+
+    def resolve_configs(self, configs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill unset fields from the current settings; raises ValueError for inconsistent thresholds"""
+        current = self.current_config()
+        resolved = []
+        for index, config in enumerate(configs):
+            values = {field: current[field] if config.get(field) is None else config[field] for field in CONFIG_FIELDS}
+            if values["match_score_weight"] + values["ats_score_weight"] + values["semantic_score_weight"] <= 0:
+                raise ValueError(f"Config {index + 1}: at least one weight must be positive")
+            if values["requalify_threshold"] > values["shortlist_threshold"]:
+                raise ValueError(f"Config {index + 1}: requalify_threshold must not exceed shortlist_threshold")
+            resolved.append({"name": config.get("name") or f"config_{index + 1}", **values})
+        return resolved
+
+    def load_components(self, db: Session, job_id: Optional[int] = None, company_id: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Stored score components of every scored application of the job or company, as arrays"""
+        query = select(
+            Application.id,
+            Application.job_id,
+            Application.match_score,
+            Application.ats_score,
+            Application.semantic_match
+        ).where(Application.final_score.isnot(None))
+        if job_id is not None:
+            query = query.where(Application.job_id == job_id)
+        if company_id is not None:
+            query = query.join(Job).where(Job.company_id == company_id)
+        # Plain rows from the connection; ORM row handling would dominate the run time
+        rows = db.connection().execute(query).fetchall()
+
+        # Flattened in one pass (np.array over Row objects is far slower); missing components count as 0
+        table = np.fromiter(
+            (np.nan if value is None else value for row in rows for value in row),
+            dtype=np.float64,
+            count=len(rows) * 5
+        ).reshape(len(rows), 5)
+        # Semantic similarity is only stored while its weight is on; rows without it leave that term out
+        has_semantic = ~np.isnan(table[:, 4])
+        table = np.nan_to_num(table)
+        return {
+            "ids": table[:, 0].astype(np.int64),
+            "job_ids": table[:, 1].astype(np.int64),
+            "match_score": table[:, 2],
+            "ats_score": table[:, 3],
+            "semantic_match": table[:, 4],
+            "has_semantic": has_semantic
+        }
+
+    def simulate(
+        self,
+        db: Session,
+        components: Dict[str, np.ndarray],
+        configs: List[Dict[str, Any]],
+        max_flipped: int = 500
+    ) -> Dict[str, Any]:
+        """Outcome distribution of each config compared with the current settings"""
+        baseline = {"name": "current", **self.current_config()}
+        every = [baseline] + configs
+
+        def parameter(field: str) -> np.ndarray:
+            return np.array([config[field] for config in every], dtype=np.float64)[:, None]
+
+        # (configs x applications); same operation order as ScoringService.calculate_final_score
+        scores = components["match_score"] * parameter("match_score_weight") + components["ats_score"] * parameter("ats_score_weight")
+        # Applications scored without semantic similarity are averaged over the other two components
+        semantic_weights = parameter("semantic_score_weight") * components["has_semantic"]
+        scores = scores + components["semantic_match"] * semantic_weights
+        total_weights = parameter("match_score_weight") + parameter("ats_score_weight") + semantic_weights
+        scores = np.divide(scores, total_weights, out=np.zeros_like(scores), where=total_weights > 0)
+        scores = np.round(scores, 2)
+        bands = np.select([scores >= parameter("shortlist_threshold"), scores >= parameter("requalify_threshold")], [2, 1], 0)
+
+        job_ids, job_index = np.unique(components["job_ids"], return_inverse=True)
+        current_bands = bands[0]
+        current_counts = np.bincount(current_bands, minlength=3)
+
+        flipped_by_config = [np.flatnonzero(bands[row] != current_bands) for row in range(1, len(every))]
+        listed_by_config = []
+        for row, flipped in enumerate(flipped_by_config, start=1):
+            # Largest score changes first
+            delta = scores[row, flipped] - scores[0, flipped]
+            listed_by_config.append(flipped[np.argsort(-np.abs(delta), kind="stable")[:max_flipped]])
+
+        # Names only for the listed applications, in one query
+        listed_ids = np.unique(np.concatenate(listed_by_config)) if listed_by_config else np.zeros(0, dtype=np.int64)
+        names = {}
+        for offset in range(0, len(listed_ids), 5000):
+            names.update(db.query(Application.id, Application.full_name).filter(
+                Application.id.in_(components["ids"][listed_ids[offset:offset + 5000]].tolist())
+            ).all())
+
+        results = []
+        for row, config in enumerate(configs, start=1):
+            simulated = bands[row]
+            counts = np.bincount(simulated, minlength=3)
+            transitions = np.bincount(current_bands * 3 + simulated, minlength=9).reshape(3, 3)
+            flipped = flipped_by_config[row - 1]
+            listed = listed_by_config[row - 1]
+
+            by_job_counts = np.bincount(job_index * 3 + simulated, minlength=len(job_ids) * 3).reshape(len(job_ids), 3)
+            by_job_flipped = np.bincount(job_index[flipped], minlength=len(job_ids))
+
+            results.append({
+                "config": config,
+                "counts": {status: int(counts[band]) for band, status in enumerate(STATUSES)},
+                "changes": {status: int(counts[band] - current_counts[band]) for band, status in enumerate(STATUSES)},
+                "transitions": {
+                    f"{STATUSES[source]}->{STATUSES[target]}": int(transitions[source, target])
+                    for source in range(3) for target in range(3)
+                    if source != target and transitions[source, target]
+                },
+                "flipped_total": int(len(flipped)),
+                "flipped": [
+                    {
+                        "id": int(components["ids"][index]),
+                        "job_id": int(components["job_ids"][index]),
+                        "candidate_name": names.get(int(components["ids"][index])),
+                        "current_score": float(scores[0, index]),
+                        "simulated_score": float(scores[row, index]),
+                        "from": STATUSES[current_bands[index]],
+                        "to": STATUSES[simulated[index]]
+                    }
+                    for index in listed.tolist()
+                ],
+                "by_job": [
+                    {
+                        "job_id": int(job_id),
+                        "counts": {status: int(by_job_counts[position, band]) for band, status in enumerate(STATUSES)},
+                        "flipped": int(by_job_flipped[position])
+                    }
+                    for position, job_id in enumerate(job_ids.tolist())
+                ]
+            })
+
+        return {
+            "total_applications": int(len(components["ids"])),
+            # Left out of the semantic term of every config; rescore with SEMANTIC_SCORE_WEIGHT on to include them
+            "missing_semantic_match": int(len(components["ids"]) - components["has_semantic"].sum()),
+            "current": {
+                "config": baseline,
+                "counts": {status: int(current_counts[band]) for band, status in enumerate(STATUSES)}
+            },
+            "results": results
+        }
@@ -1,18 +1,69 @@
-from typing import Dict, List, Any, Tuple
+import hashlib
+import json
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from ..models.job import Job, JobRequirement
 from ..models.application import Application, ApplicationScore
+from ..utils.semantic_vectors import cosine_similarities
+from ..utils.metrics import timer
 from ..config import settings
+from .semantic_match import SemanticMatchService, SemanticInputs
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Feedback sentences by band (low, middle, high), shared with BatchScoringService
+SKILLS_FEEDBACK = (
+    "Limited skill match with job requirements.",
+    "Good skill alignment with some areas for improvement.",
+    "Strong skill match with job requirements.",
+)
+EXPERIENCE_FEEDBACK = (
+    "Limited relevant work experience for this role.",
+    "Some relevant experience, but could benefit from more exposure.",
+    "Relevant work experience aligns well with the role.",
+)
+ATS_FEEDBACK = (
+    "Resume could be better optimized for ATS systems.",
+    "Resume is well-formatted for ATS systems.",
+)
+
+# Statuses the scorer assigns; any other status was set by hand
+AUTOMATIC_STATUSES = ("submitted", "under_review", "rejected", "shortlisted")
+
 class ScoringService:
     def __init__(self):
         self.match_weight = settings.match_score_weight
         self.ats_weight = settings.ats_score_weight
+        self.semantic_weight = settings.semantic_score_weight
         self.shortlist_threshold = settings.shortlist_threshold
         self.requalify_threshold = settings.requalify_threshold
+        self.semantic_service = SemanticMatchService()
+    
+    def inputs_hash(self, job: Job) -> str:
+        """Digest of everything outside the application that a score depends on"""
+        inputs = {
+            'key_skills': job.key_skills or [],
+            'certifications': job.certifications or [],
+            'match_weight': self.match_weight,
+            'ats_weight': self.ats_weight,
+            'shortlist_threshold': self.shortlist_threshold,
+            'requalify_threshold': self.requalify_threshold
+        }
+        if self.semantic_weight:
+            # Only present when enabled, so existing hashes stay valid with the default weight
+            inputs['semantic_weight'] = self.semantic_weight
+            inputs['description_vector'] = hashlib.sha256(job.description_vector or b"").hexdigest()
+        if self.total_weight() != 1.0:
+            # Scores were not divided by the weight total before; such hashes are stale
+            inputs['total_weight'] = self.total_weight()
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+    
+    def total_weight(self) -> float:
+        """Sum of the score weights; final scores are divided by it to stay on the 0-100 scale"""
+        return self.match_weight + self.ats_weight + self.semantic_weight
     
     def calculate_match_score(self, job: Job, application: Application) -> Dict[str, float]:
         """Calculate job-candidate match score"""
@@ -93,7 +144,14 @@ class ScoringService:
         
         return scores
     
-    def calculate_final_score(self, match_scores: Dict[str, float], ats_scores: Dict[str, float]) -> float:
+    def calculate_semantic_match(self, application: Application, semantic: Optional[SemanticInputs]) -> float:
+        """TF-IDF cosine similarity (0-100) between the resume and the job description"""
+        if semantic is None:
+            return 0.0
+        resume_vector = semantic.resume_vectors.get(application.resume_hash)
+        return float(cosine_similarities(semantic.job_vector, [resume_vector])[0])
+    
+    def calculate_final_score(self, match_scores: Dict[str, float], ats_scores: Dict[str, float], semantic_match: float = 0.0) -> float:
         """Calculate final weighted score"""
         # Calculate average match score
         match_values = [score for score in match_scores.values() if score > 0]
@@ -103,8 +161,12 @@ class ScoringService:
         ats_values = list(ats_scores.values())
         avg_ats_score = sum(ats_values) / len(ats_values) if ats_values else 0.0
         
-        # Weighted final score
+        # Weighted average, so weights that don't sum to 1 keep scores on the 0-100 scale
         final_score = (avg_match_score * self.match_weight) + (avg_ats_score * self.ats_weight)
+        if self.semantic_weight:
+            final_score += semantic_match * self.semantic_weight
+        total_weight = self.total_weight()
+        final_score = final_score / total_weight if total_weight else 0.0
         return round(final_score, 2)
     
     def determine_candidate_status(self, final_score: float) -> Tuple[str, str]:
@@ -122,83 +184,168 @@ class ScoringService:
         
         # Skills feedback
         if scores.get('skills_match', 0) >= 70:
-            feedback_parts.append("Strong skill match with job requirements.")
+            feedback_parts.append(SKILLS_FEEDBACK[2])
         elif scores.get('skills_match', 0) >= 40:
-            feedback_parts.append("Good skill alignment with some areas for improvement.")
+            feedback_parts.append(SKILLS_FEEDBACK[1])
         else:
-            feedback_parts.append("Limited skill match with job requirements.")
+            feedback_parts.append(SKILLS_FEEDBACK[0])
         
         # Experience feedback
         if scores.get('experience_match', 0) >= 70:
-            feedback_parts.append("Relevant work experience aligns well with the role.")
+            feedback_parts.append(EXPERIENCE_FEEDBACK[2])
         elif scores.get('experience_match', 0) >= 40:
-            feedback_parts.append("Some relevant experience, but could benefit from more exposure.")
+            feedback_parts.append(EXPERIENCE_FEEDBACK[1])
         else:
-            feedback_parts.append("Limited relevant work experience for this role.")
+            feedback_parts.append(EXPERIENCE_FEEDBACK[0])
         
         # ATS feedback
         avg_ats = (scores.get('ats_format_score', 0) + scores.get('ats_keywords_score', 0) + scores.get('ats_structure_score', 0)) / 3
         if avg_ats >= 70:
-            feedback_parts.append("Resume is well-formatted for ATS systems.")
+            feedback_parts.append(ATS_FEEDBACK[1])
         else:
-            feedback_parts.append("Resume could be better optimized for ATS systems.")
+            feedback_parts.append(ATS_FEEDBACK[0])
         
         return " ".join(feedback_parts)
     
+    def build_score(self, job: Job, application: Application, semantic: Optional[SemanticInputs] = None) -> ApplicationScore:
+        """Compute the score record for an application in memory, without touching the database.
+
+        semantic holds the job's and resume's vectors from SemanticMatchService.load_inputs; it is
+        only used when semantic_score_weight is set.
+        """
+        # Calculate match scores
+        match_scores = self.calculate_match_score(job, application)
+        semantic_match = self.calculate_semantic_match(application, semantic) if self.semantic_weight else None
+        
+        # Calculate ATS scores
+        parsed_data = {
+            'parsed_skills': application.parsed_skills,
+            'parsed_experience': application.parsed_experience,
+            'parsed_education': application.parsed_education,
+            'parsed_certifications': application.parsed_certifications
+        }
+        ats_scores = self.calculate_ats_score_breakdown(parsed_data, application.resume_filename)
+        
+        # Calculate final score
+        match_score = sum(score for score in match_scores.values() if score > 0) / len([s for s in match_scores.values() if s > 0]) if any(match_scores.values()) else 0
+        ats_score = sum(ats_scores.values()) / len(ats_scores) if ats_scores else 0
+        final_score = self.calculate_final_score(match_scores, ats_scores, semantic_match or 0.0)
+        
+        # Generate feedback
+        all_scores = {**match_scores, **ats_scores}
+        if semantic_match is not None:
+            all_scores['semantic_match'] = semantic_match
+        ai_feedback = self.generate_ai_feedback(job, application, all_scores)
+        
+        return ApplicationScore(
+            application_id=application.id,
+            match_score=match_score,
+            ats_score=ats_score,
+            final_score=final_score,
+            skills_match=match_scores.get('skills_match'),
+            experience_match=match_scores.get('experience_match'),
+            education_match=match_scores.get('education_match'),
+            certification_match=match_scores.get('certification_match'),
+            semantic_match=semantic_match,
+            ats_format_score=ats_scores.get('ats_format_score'),
+            ats_keywords_score=ats_scores.get('ats_keywords_score'),
+            ats_structure_score=ats_scores.get('ats_structure_score'),
+            scoring_details=all_scores,
+            ai_feedback=ai_feedback,
+            inputs_hash=self.inputs_hash(job)
+        )
+    
+    @staticmethod
+    def apply_score(application: Application, score: ApplicationScore) -> None:
+        """Copy a score record's values onto the application's current score columns"""
+        application.final_score = score.final_score
+        application.match_score = score.match_score
+        application.ats_score = score.ats_score
+        application.skills_match = score.skills_match
+        application.experience_match = score.experience_match
+        application.education_match = score.education_match
+        application.certification_match = score.certification_match
+        application.semantic_match = score.semantic_match
+        application.ats_format_score = score.ats_format_score
+        application.ats_keywords_score = score.ats_keywords_score
+        application.ats_structure_score = score.ats_structure_score
+        application.score_breakdown = score.scoring_details
+        # Feedback written by the LLM stays until it is regenerated; the canned sentences only fill in for it
+        if application.ai_feedback_generated_at is None:
+            application.ai_feedback = score.ai_feedback
+        application.score_inputs_hash = score.inputs_hash
+    
+    @staticmethod
+    def status_is_automatic(application: Application) -> bool:
+        """Whether scoring may change the application's status: HR hasn't set it by hand"""
+        return not application.status_manual and (application.status or "submitted") in AUTOMATIC_STATUSES
+    
+    def save_score(self, db: Session, application: Application, score: ApplicationScore, status: str) -> None:
+        """Make score the application's current score and, if enabled, add a compact history row (no commit).
+
+        The status is only changed while it is still one the scorer assigned.
+        """
+        self.apply_score(application, score)
+        application.scored_at = datetime.utcnow()
+        if self.status_is_automatic(application):
+            application.status = status
+        
+        if settings.score_history_enabled:
+            # The breakdown and feedback are already on the application
+            score.scoring_details = None
+            score.ai_feedback = None
+            db.add(score)
+    
+    def backfill_current_scores(self, db: Session, batch_size: int = 500) -> int:
+        """Give applications scored before scores moved onto Application their latest ApplicationScore.
+
+        Only applications without a current score are touched; returns how many were filled.
+        """
+        latest_scores = db.query(func.max(ApplicationScore.id)).group_by(ApplicationScore.application_id)
+        filled = 0
+        last_id = 0
+        while True:
+            rows = db.query(Application, ApplicationScore).join(
+                ApplicationScore, ApplicationScore.application_id == Application.id
+            ).filter(
+                Application.id > last_id,
+                Application.final_score.is_(None),
+                ApplicationScore.id.in_(latest_scores)
+            ).order_by(Application.id).limit(batch_size).all()
+            if not rows:
+                return filled
+            for application, score in rows:
+                self.apply_score(application, score)
+                application.scored_at = score.created_at
+                # Applications from before background processing were parsed and scored on upload
+                if application.processing_status is None:
+                    application.processing_status = "done"
+            db.commit()
+            filled += len(rows)
+            last_id = rows[-1][0].id
+            logger.info(f"Backfilled current scores for {filled} applications")
+    
+    @timer("score_application")
     async def score_application(self, db: Session, application: Application) -> ApplicationScore:
-        """Score an application and return the score object"""
+        """Score an application, store it as the current score and return the score object"""
         try:
             # Get job details
-            job = db.query(Job).filter(Job.id == application.job_id).first()
+            with timer("score_application.load_job"):
+                job = db.query(Job).filter(Job.id == application.job_id).first()
             if not job:
                 raise ValueError(f"Job not found for application {application.id}")
             
-            # Calculate match scores
-            match_scores = self.calculate_match_score(job, application)
-            
-            # Calculate ATS scores
-            parsed_data = {
-                'parsed_skills': application.parsed_skills,
-                'parsed_experience': application.parsed_experience,
-                'parsed_education': application.parsed_education,
-                'parsed_certifications': application.parsed_certifications
-            }
-            ats_scores = self.calculate_ats_score_breakdown(parsed_data, application.resume_filename)
-            
-            # Calculate final score
-            match_score = sum(score for score in match_scores.values() if score > 0) / len([s for s in match_scores.values() if s > 0]) if any(match_scores.values()) else 0
-            ats_score = sum(ats_scores.values()) / len(ats_scores) if ats_scores else 0
-            final_score = self.calculate_final_score(match_scores, ats_scores)
-            
-            # Generate feedback
-            all_scores = {**match_scores, **ats_scores}
-            ai_feedback = self.generate_ai_feedback(job, application, all_scores)
-            
-            # Create score record
-            application_score = ApplicationScore(
-                application_id=application.id,
-                match_score=match_score,
-                ats_score=ats_score,
-                final_score=final_score,
-                skills_match=match_scores.get('skills_match'),
-                experience_match=match_scores.get('experience_match'),
-                education_match=match_scores.get('education_match'),
-                certification_match=match_scores.get('certification_match'),
-                ats_format_score=ats_scores.get('ats_format_score'),
-                ats_keywords_score=ats_scores.get('ats_keywords_score'),
-                ats_structure_score=ats_scores.get('ats_structure_score'),
-                scoring_details=all_scores,
-                ai_feedback=ai_feedback
-            )
-            
-            db.add(application_score)
-            db.commit()
-            db.refresh(application_score)
-            
-            # Update application status based on score
-            decision, status = self.determine_candidate_status(final_score)
-            application.status = status
-            db.commit()
+            # Create score record and update application status based on score
+            semantic = None
+            if self.semantic_weight:
+                with timer("score_application.semantic_vectors"):
+                    semantic = self.semantic_service.load_inputs(db, job, [application])
+            with timer("score_application.build_score"):
+                application_score = self.build_score(job, application, semantic)
+            decision, status = self.determine_candidate_status(application_score.final_score)
+            self.save_score(db, application, application_score, status)
+            with timer("score_application.db_commit"):
+                db.commit()
             
             return application_score
             
@@ -0,0 +1,172 @@
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional
+import numpy as np
+from sqlalchemy.orm import Session
+from ..models.job import Job
+from ..models.application import Application
+from ..models.resume import DocumentFrequency, ResumeText
+from ..utils.text_processing import tokenize, term_frequencies
+from ..utils.semantic_vectors import hashed_frequencies, tf_vector, idf_weights, apply_idf, decode_vector
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SemanticInputs(NamedTuple):
+    """TF-IDF vectors for scoring one job's applications, weighted by the current document frequencies"""
+    job_vector: Optional[bytes]
+    resume_vectors: Dict[str, Optional[bytes]]  # By resume hash
+
+class SemanticMatchService:
+    """Hashed TF-IDF vectors for resumes and job descriptions, computed locally.
+
+    Resumes and job descriptions are stored as term frequency vectors.
+    Document frequencies come from the resume corpus (one count per distinct
+    resume file) and are kept in document_frequencies; IDF is applied when a
+    job's applications are scored, so stored vectors never go stale as the
+    corpus grows.
+    """
+
+    def vectorize(self, frequencies: Dict[str, int]) -> bytes:
+        """Stored (term frequency) vector of a document's token counts"""
+        return tf_vector(hashed_frequencies(frequencies))
+
+    def record_documents(self, db: Session, term_frequency_maps: List[Dict[str, int]]) -> None:
+        """Add new resumes' features to the document frequencies in a transaction of their own.
+
+        Called after the resumes are committed, so the corpus-size row is only
+        locked briefly. A failed update is logged and skipped; it skews IDF
+        slightly until rebuild_semantic_index.py is next run.
+        """
+        if not term_frequency_maps:
+            return
+        counts = Counter()
+        for frequencies in term_frequency_maps:
+            counts.update(hashed_frequencies(frequencies).keys())
+        counts[DocumentFrequency.TOTAL_DOCUMENTS] = len(term_frequency_maps)
+        try:
+            self.add_counts(db, counts)
+            db.commit()
+        except Exception as e:
+            logger.warning(f"Could not update document frequencies for {len(term_frequency_maps)} resumes: {e}")
+            db.rollback()
+
+    def add_counts(self, db: Session, counts: Dict[int, int]) -> None:
+        """Add to the document count of each feature (no commit)"""
+        # Sorted so concurrent writers lock rows in the same order
+        rows = [{"feature": feature, "document_count": count} for feature, count in sorted(counts.items())]
+
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            for offset in range(0, len(rows), 5000):
+                statement = insert(DocumentFrequency).values(rows[offset:offset + 5000])
+                db.execute(statement.on_conflict_do_update(
+                    index_elements=[DocumentFrequency.feature],
+                    set_={"document_count": DocumentFrequency.document_count + statement.excluded.document_count}
+                ))
+            return
+
+        existing = {
+            row.feature: row
+            for row in db.query(DocumentFrequency).filter(DocumentFrequency.feature.in_(list(counts)))
+        }
+        for feature, count in counts.items():
+            if feature in existing:
+                existing[feature].document_count += count
+            else:
+                db.add(DocumentFrequency(feature=feature, document_count=count))
+        db.flush()
+
+    def document_counts(self, db: Session, features: Iterable[int]) -> Dict[int, int]:
+        """Document frequency of each feature plus the corpus size under TOTAL_DOCUMENTS"""
+        wanted = list(features) + [DocumentFrequency.TOTAL_DOCUMENTS]
+        counts: Dict[int, int] = {}
+        # Chunked to stay under bind-parameter limits
+        for offset in range(0, len(wanted), 5000):
+            counts.update(
+                db.query(DocumentFrequency.feature, DocumentFrequency.document_count).filter(
+                    DocumentFrequency.feature.in_(wanted[offset:offset + 5000])
+                ).all()
+            )
+        return counts
+
+    def vectorize_job(self, job: Job) -> None:
+        """Compute the job's description vector"""
+        job.description_vector = self.vectorize(term_frequencies(tokenize(f"{job.title or ''}\n{job.description or ''}")))
+
+    def ensure_job_vector(self, job: Job) -> None:
+        """Vectorize jobs published before semantic matching existed"""
+        if job.description_vector is None:
+            self.vectorize_job(job)
+
+    def load_resume_vectors(self, db: Session, applications: List[Application]) -> Dict[str, Optional[bytes]]:
+        """Stored resume vectors of the applications, keyed by resume hash"""
+        hashes = list({application.resume_hash for application in applications if application.resume_hash})
+        vectors: Dict[str, Optional[bytes]] = {}
+        for offset in range(0, len(hashes), 5000):
+            vectors.update(
+                db.query(ResumeText.file_hash, ResumeText.semantic_vector).filter(
+                    ResumeText.file_hash.in_(hashes[offset:offset + 5000])
+                ).all()
+            )
+        return vectors
+
+    def load_inputs(self, db: Session, job: Job, applications: List[Application]) -> SemanticInputs:
+        """The job's and the applications' resume vectors with the current IDF applied"""
+        self.ensure_job_vector(job)
+        resume_vectors = self.load_resume_vectors(db, applications)
+        stored = [job.description_vector] + [vector for vector in resume_vectors.values() if vector]
+        features = np.unique(np.concatenate([decode_vector(vector)[0] for vector in stored]))
+        counts = self.document_counts(db, features.tolist())
+        total = counts.pop(DocumentFrequency.TOTAL_DOCUMENTS, 0)
+        weights = idf_weights(counts, total)
+        return SemanticInputs(
+            job_vector=apply_idf(job.description_vector, weights),
+            resume_vectors={
+                resume_hash: apply_idf(vector, weights) if vector else None
+                for resume_hash, vector in resume_vectors.items()
+            }
+        )
+
+    def rebuild(self, db: Session, batch_size: int = 500) -> Dict[str, int]:
+        """Recount document frequencies from every stored resume and recompute all vectors"""
+        db.query(DocumentFrequency).delete(synchronize_session=False)
+        documents = 0
+        last_id = 0
+        counts = Counter()
+        while True:
+            batch = db.query(ResumeText).filter(ResumeText.id > last_id).order_by(ResumeText.id).limit(batch_size).all()
+            if not batch:
+                break
+            for resume_text in batch:
+                counts.update(hashed_frequencies(resume_text.term_frequencies).keys())
+            documents += len(batch)
+            last_id = batch[-1].id
+            db.expunge_all()
+        counts[DocumentFrequency.TOTAL_DOCUMENTS] = documents
+        db.bulk_insert_mappings(DocumentFrequency, [
+            {"feature": feature, "document_count": count} for feature, count in counts.items()
+        ])
+        db.commit()
+
+        last_id = 0
+        while True:
+            batch = db.query(ResumeText).filter(ResumeText.id > last_id).order_by(ResumeText.id).limit(batch_size).all()
+            if not batch:
+                break
+            # Also converts vectors stored with IDF applied by earlier versions
+            for resume_text in batch:
+                resume_text.semantic_vector = self.vectorize(resume_text.term_frequencies)
+            db.commit()
+            last_id = batch[-1].id
+            db.expunge_all()
+
+        jobs = db.query(Job).filter(Job.status == "published").all()
+        for job in jobs:
+            self.vectorize_job(job)
+        db.commit()
+        logger.info(f"Rebuilt semantic vectors for {documents} resumes and {len(jobs)} jobs")
+        return {"resumes": documents, "jobs": len(jobs)}
@@ -0,0 +1,133 @@
+from typing import Dict, List, Iterable, Optional, Tuple
+from sqlalchemy import select, intersect, union, except_, func, literal
+from sqlalchemy.orm import Session, contains_eager
+from ..models.application import Application, ApplicationSkill
+from ..models.job import Job
+from ..utils.skill_query import SkillQuery, parse_skill_query, positive_terms, skill_key
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SkillIndexService:
+    """Maintains the application_skills inverted index and answers boolean skill searches from it"""
+
+    def skill_rows(self, application: Application, company_id: int) -> List[ApplicationSkill]:
+        """Index rows for an application's parsed skills, one per distinct canonical skill"""
+        rows: Dict[str, ApplicationSkill] = {}
+        for skill in application.parsed_skills or []:
+            key = skill_key(skill)
+            if key and key not in rows:
+                rows[key] = ApplicationSkill(
+                    application_id=application.id,
+                    skill_key=key,
+                    skill=skill,
+                    job_id=application.job_id,
+                    company_id=company_id
+                )
+        return list(rows.values())
+
+    def index_application(self, db: Session, application: Application) -> None:
+        """Replace the application's index rows with its current parsed skills (no commit)"""
+        db.query(ApplicationSkill).filter(ApplicationSkill.application_id == application.id).delete(synchronize_session=False)
+        db.add_all(self.skill_rows(application, application.job.company_id))
+
+    def index_applications(self, db: Session, applications: Iterable[Application], company_id: int) -> None:
+        """Index freshly inserted applications of one company (no commit)"""
+        for application in applications:
+            db.add_all(self.skill_rows(application, company_id))
+
+    def rebuild(self, db: Session, batch_size: int = 1000) -> int:
+        """Rebuild the whole index from applications.parsed_skills"""
+        db.query(ApplicationSkill).delete(synchronize_session=False)
+        db.commit()
+
+        indexed = 0
+        last_id = 0
+        while True:
+            batch = db.query(Application, Job.company_id).join(Job).filter(
+                Application.id > last_id
+            ).order_by(Application.id).limit(batch_size).all()
+            if not batch:
+                break
+            for application, company_id in batch:
+                db.add_all(self.skill_rows(application, company_id))
+            db.commit()
+            indexed += len(batch)
+            last_id = batch[-1][0].id
+            db.expunge_all()
+        logger.info(f"Rebuilt skill index for {indexed} applications")
+        return indexed
+
+    def _universe(self, company_id: Optional[int], job_id: Optional[int]):
+        query = select(Application.id.label("application_id"))
+        if company_id is not None:
+            query = query.join(Job, Job.id == Application.job_id).where(Job.company_id == company_id)
+        if job_id is not None:
+            query = query.where(Application.job_id == job_id)
+        return query
+
+    def _compile(self, node: SkillQuery, company_id: Optional[int], job_id: Optional[int]):
+        """Translate a parsed query into a SELECT of matching application ids"""
+        kind, value = node
+        if kind == "term":
+            query = select(ApplicationSkill.application_id).where(ApplicationSkill.skill_key == value)
+            if company_id is not None:
+                query = query.where(ApplicationSkill.company_id == company_id)
+            if job_id is not None:
+                query = query.where(ApplicationSkill.job_id == job_id)
+            return query
+
+        if kind == "not":
+            compound = except_(self._universe(company_id, job_id), self._compile(value, company_id, job_id))
+        elif kind == "or":
+            compound = union(*[self._compile(child, company_id, job_id) for child in value])
+        else:
+            # A AND NOT B is evaluated as A EXCEPT B rather than against the whole universe
+            positives = [self._compile(child, company_id, job_id) for child in value if child[0] != "not"]
+            negatives = [self._compile(child[1], company_id, job_id) for child in value if child[0] == "not"]
+            if not positives:
+                compound = except_(self._universe(company_id, job_id), self._wrap(union(*negatives)) if len(negatives) > 1 else negatives[0])
+            elif not negatives:
+                compound = intersect(*positives)
+            else:
+                base = positives[0] if len(positives) == 1 else self._wrap(intersect(*positives))
+                compound = except_(base, *negatives)
+        return self._wrap(compound)
+
+    @staticmethod
+    def _wrap(query):
+        """Nest a compound SELECT so it can be combined again (needed by SQLite)"""
+        subquery = query.subquery()
+        return select(subquery.c[0].label("application_id"))
+
+    def search(
+        self,
+        db: Session,
+        query: str,
+        company_id: Optional[int] = None,
+        job_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 50
+    ) -> Tuple[int, List[Tuple[Application, int]], List[str]]:
+        """Return the total match count, a page of (application, matched skill count) with the best
+        overlap first, and the skill keys the query asks for"""
+        node = parse_skill_query(query)
+        matches = self._compile(node, company_id, job_id).subquery()
+        total = db.query(func.count()).select_from(matches).scalar()
+
+        # Overlap per matched application, looked up through the (application_id, skill_key) primary key
+        wanted = positive_terms(node)
+        overlap = select(func.count()).where(
+            ApplicationSkill.application_id == Application.id,
+            ApplicationSkill.skill_key.in_(wanted)
+        ).correlate(Application).scalar_subquery() if wanted else literal(0)
+
+        rows = db.query(Application, overlap).join(
+            matches, matches.c.application_id == Application.id
+        ).join(Job).options(contains_eager(Application.job)).order_by(
+            overlap.desc(),
+            func.coalesce(Application.final_score, -1).desc(),
+            Application.id
+        ).offset(skip).limit(limit).all()
+
+        return total, rows, wanted
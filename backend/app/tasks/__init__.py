@@ -0,0 +1,19 @@
+from .application_tasks import process_application, enqueue_application, run_application_pipeline
+from .import_tasks import bulk_import_resumes, enqueue_bulk_import, run_bulk_import
+from .rescore_tasks import rescore_job, enqueue_job_rescore, run_job_rescore
+from .feedback_tasks import generate_job_feedback, enqueue_job_feedback, run_job_feedback
+
+__all__ = [
+    "process_application",
+    "enqueue_application",
+    "run_application_pipeline",
+    "bulk_import_resumes",
+    "enqueue_bulk_import",
+    "run_bulk_import",
+    "rescore_job",
+    "enqueue_job_rescore",
+    "run_job_rescore",
+    "generate_job_feedback",
+    "enqueue_job_feedback",
+    "run_job_feedback"
+]
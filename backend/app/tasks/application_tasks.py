@@ -0,0 +1,85 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ..celery_app import celery_app
+from ..config import settings
+from ..database import SessionLocal
+from ..services.application_processor import ApplicationProcessor
+from ..utils.parser_pool import ResumeParseError
+import logging
+
+logger = logging.getLogger(__name__)
+processor = ApplicationProcessor()
+
+_thread_state = threading.local()
+# Runs coroutines for eager tasks started from inside a running loop (BackgroundTasks, tests)
+_loop_runner = ThreadPoolExecutor(max_workers=4, thread_name_prefix="coroutine-runner")
+
+def thread_loop() -> asyncio.AbstractEventLoop:
+    """This thread's long-lived event loop.
+
+    Loop-bound clients (the LLM provider's connection pool, the async Redis
+    client) are created once per worker thread and reused across tasks
+    instead of being rebuilt, and leaked, by a fresh loop per task.
+    """
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_state.loop = loop
+    return loop
+
+def run_coroutine(coro):
+    """Run a coroutine to completion from sync code, even if an event loop is already running"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return thread_loop().run_until_complete(coro)
+    # Eager mode inside an async request handler: run on a helper thread's loop
+    return _loop_runner.submit(lambda: thread_loop().run_until_complete(coro)).result()
+
+def run_application_pipeline(application_id: int) -> None:
+    """Process an application in-process (used when the queue is unavailable)"""
+    db = SessionLocal()
+    try:
+        run_coroutine(processor.process(db, application_id))
+    except Exception as e:
+        logger.error(f"Error processing application {application_id}: {e}")
+        db.rollback()
+        processor.mark_failed(db, application_id, str(e))
+    finally:
+        db.close()
+
+@celery_app.task(
+    bind=True,
+    name="applications.process_application",
+    max_retries=settings.application_task_max_retries
+)
+def process_application(self, application_id: int) -> str:
+    """Parse, score and notify for a submitted application"""
+    db = SessionLocal()
+    try:
+        application = run_coroutine(processor.process(db, application_id))
+        return application.processing_status
+    except Exception as exc:
+        db.rollback()
+        # Timeouts and crashes repeat on the same file, so don't retry them
+        if isinstance(exc, ResumeParseError) or self.request.retries >= self.max_retries:
+            logger.error(f"Giving up on application {application_id} after {self.request.retries} retries: {exc}")
+            processor.mark_failed(db, application_id, str(exc))
+            return "failed"
+
+        logger.warning(f"Retrying application {application_id} ({self.request.retries + 1}/{self.max_retries}): {exc}")
+        processor.mark_queued(db, application_id, str(exc))
+        countdown = settings.application_task_retry_backoff * (2 ** self.request.retries)
+        raise self.retry(exc=exc, countdown=countdown)
+    finally:
+        db.close()
+
+def enqueue_application(application_id: int) -> bool:
+    """Queue an application for background processing; returns False if the broker is unreachable"""
+    try:
+        process_application.delay(application_id)
+        return True
+    except Exception as e:
+        logger.error(f"Error enqueuing application {application_id}: {e}")
+        return False
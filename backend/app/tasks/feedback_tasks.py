@@ -0,0 +1,30 @@
+from typing import Dict, Any
+from ..celery_app import celery_app
+from ..database import SessionLocal
+from ..services.candidate_feedback import CandidateFeedbackService
+from .application_tasks import run_coroutine
+import logging
+
+logger = logging.getLogger(__name__)
+
+def run_job_feedback(job_id: int, regenerate: bool = False) -> Dict[str, Any]:
+    """Generate candidate feedback for a job in-process"""
+    db = SessionLocal()
+    try:
+        return run_coroutine(CandidateFeedbackService().run(db, job_id, regenerate))
+    finally:
+        db.close()
+
+@celery_app.task(name="jobs.generate_feedback")
+def generate_job_feedback(job_id: int, regenerate: bool = False) -> str:
+    """Write LLM feedback for a job's shortlisted and borderline candidates"""
+    return run_job_feedback(job_id, regenerate)["status"]
+
+def enqueue_job_feedback(job_id: int, regenerate: bool = False) -> bool:
+    """Queue a feedback run; returns False if the broker is unreachable"""
+    try:
+        generate_job_feedback.delay(job_id, regenerate)
+        return True
+    except Exception as e:
+        logger.error(f"Error enqueuing feedback for job {job_id}: {e}")
+        return False
@@ -0,0 +1,33 @@
+from typing import Dict, Any
+from ..celery_app import celery_app
+from ..database import SessionLocal
+from ..services.bulk_import import BulkImportService
+from ..utils.file_utils import delete_file
+from .application_tasks import run_coroutine
+import logging
+
+logger = logging.getLogger(__name__)
+
+def run_bulk_import(import_id: str, job_id: int, source: str, cleanup: bool = False) -> Dict[str, Any]:
+    """Run a bulk import in-process; cleanup removes an uploaded archive once it is imported"""
+    db = SessionLocal()
+    try:
+        return run_coroutine(BulkImportService().run(db, job_id, source, import_id=import_id))
+    finally:
+        db.close()
+        if cleanup:
+            delete_file(source)
+
+@celery_app.task(name="applications.bulk_import")
+def bulk_import_resumes(import_id: str, job_id: int, source: str, cleanup: bool = False) -> str:
+    """Import a directory or ZIP of resumes for a job"""
+    return run_bulk_import(import_id, job_id, source, cleanup)["status"]
+
+def enqueue_bulk_import(import_id: str, job_id: int, source: str, cleanup: bool = False) -> bool:
+    """Queue a bulk import; returns False if the broker is unreachable"""
+    try:
+        bulk_import_resumes.delay(import_id, job_id, source, cleanup)
+        return True
+    except Exception as e:
+        logger.error(f"Error enqueuing bulk import {import_id}: {e}")
+        return False
@@ -0,0 +1,30 @@
+from typing import Dict, Any
+from ..celery_app import celery_app
+from ..database import SessionLocal
+from ..services.job_rescore import JobRescoreService
+from .application_tasks import run_coroutine
+import logging
+
+logger = logging.getLogger(__name__)
+
+def run_job_rescore(job_id: int) -> Dict[str, Any]:
+    """Rescore a job's changed applications in-process"""
+    db = SessionLocal()
+    try:
+        return run_coroutine(JobRescoreService().run(db, job_id))
+    finally:
+        db.close()
+
+@celery_app.task(name="jobs.rescore_job")
+def rescore_job(job_id: int) -> str:
+    """Rescore the applications of a job whose scoring inputs changed"""
+    return run_job_rescore(job_id)["status"]
+
+def enqueue_job_rescore(job_id: int) -> bool:
+    """Queue a job rescore; returns False if the broker is unreachable"""
+    try:
+        rescore_job.delay(job_id)
+        return True
+    except Exception as e:
+        logger.error(f"Error enqueuing rescore for job {job_id}: {e}")
+        return False
@@ -1,11 +1,13 @@
 from .auth import create_access_token, verify_token, get_password_hash, verify_password
 from .email import send_email, send_application_confirmation, send_shortlist_notification
-from .file_utils import save_uploaded_file, generate_filename
+from .file_utils import save_uploaded_file, store_file, generate_filename, generate_content_filename
 from .resume_parser import parse_resume, extract_text_from_pdf, extract_text_from_docx
+from .parser_pool import resume_parser_pool, ResumeParserPool, ResumeParseError
 
 __all__ = [
     "create_access_token", "verify_token", "get_password_hash", "verify_password",
     "send_email", "send_application_confirmation", "send_shortlist_notification",
-    "save_uploaded_file", "generate_filename",
-    "parse_resume", "extract_text_from_pdf", "extract_text_from_docx"
+    "save_uploaded_file", "store_file", "generate_filename", "generate_content_filename",
+    "parse_resume", "extract_text_from_pdf", "extract_text_from_docx",
+    "resume_parser_pool", "ResumeParserPool", "ResumeParseError"
 ]
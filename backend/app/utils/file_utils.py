@@ -1,6 +1,9 @@
 import os
 import uuid
+import hashlib
+import aiofiles
 from pathlib import Path
+from typing import BinaryIO
 from fastapi import UploadFile, HTTPException
 from ..config import settings
 
@@ -10,31 +13,98 @@ def generate_filename(original_filename: str) -> str:
     unique_id = str(uuid.uuid4())
     return f"{unique_id}{file_extension}"
 
-async def save_uploaded_file(file: UploadFile, upload_dir: str = None) -> tuple[str, str]:
-    """Save uploaded file and return filename and filepath"""
+def generate_content_filename(digest: str, original_filename: str) -> str:
+    """Generate a content-addressed filename from a SHA-256 digest"""
+    file_extension = Path(original_filename).suffix.lower()
+    return f"{digest}{file_extension}"
+
+async def save_uploaded_file(file: UploadFile, upload_dir: str = None, max_size: int = None) -> tuple[str, str, str]:
+    """Stream uploaded file into the content-addressed store and return filename, filepath and SHA-256 digest"""
     if not upload_dir:
         upload_dir = settings.upload_dir
+    if not max_size:
+        max_size = settings.max_file_size
     
     # Create upload directory if it doesn't exist
     Path(upload_dir).mkdir(parents=True, exist_ok=True)
     
-    # Check file size
-    content = await file.read()
-    if len(content) > settings.max_file_size:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File too large. Maximum size is {settings.max_file_size} bytes"
-        )
+    # Reject early when the client reported size is already over the limit
+    if file.size is not None and file.size > max_size:
+        raise_file_too_large(max_size)
+    
+    # Stream into a uniquely named temp file; the final name depends on the content
+    temp_path = os.path.join(upload_dir, f".{generate_filename(file.filename)}.part")
+    
+    # Write chunk by chunk, enforcing the size limit as we go
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as buffer:
+            while True:
+                chunk = await file.read(settings.upload_chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise_file_too_large(max_size)
+                digest.update(chunk)
+                await buffer.write(chunk)
+        
+        # Store by digest so identical resumes are kept once
+        file_hash = digest.hexdigest()
+        filename = generate_content_filename(file_hash, file.filename)
+        filepath = os.path.join(upload_dir, filename)
+        if os.path.exists(filepath):
+            delete_file(temp_path)
+        else:
+            # Atomically move the complete file into place
+            os.replace(temp_path, filepath)
+    except BaseException:
+        delete_file(temp_path)
+        raise
     
-    # Generate unique filename
-    filename = generate_filename(file.filename)
-    filepath = os.path.join(upload_dir, filename)
+    return filename, filepath, file_hash
+
+def store_file(source: BinaryIO, original_filename: str, upload_dir: str = None, max_size: int = None) -> tuple[str, str, str]:
+    """Copy a local file object into the content-addressed store and return filename, filepath and SHA-256 digest"""
+    if not upload_dir:
+        upload_dir = settings.upload_dir
+    Path(upload_dir).mkdir(parents=True, exist_ok=True)
     
-    # Save file
-    with open(filepath, "wb") as buffer:
-        buffer.write(content)
+    temp_path = os.path.join(upload_dir, f".{generate_filename(original_filename)}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(temp_path, "wb") as buffer:
+            while True:
+                chunk = source.read(settings.upload_chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_size and size > max_size:
+                    raise ValueError(f"File too large. Maximum size is {max_size} bytes")
+                digest.update(chunk)
+                buffer.write(chunk)
+        
+        file_hash = digest.hexdigest()
+        filename = generate_content_filename(file_hash, original_filename)
+        filepath = os.path.join(upload_dir, filename)
+        if os.path.exists(filepath):
+            delete_file(temp_path)
+        else:
+            os.replace(temp_path, filepath)
+    except BaseException:
+        delete_file(temp_path)
+        raise
     
-    return filename, filepath
+    return filename, filepath, file_hash
+
+def raise_file_too_large(max_size: int = None) -> None:
+    """Raise the standard 413 error for oversized uploads"""
+    raise HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum size is {max_size or settings.max_file_size} bytes"
+    )
 
 def validate_file_type(file: UploadFile, allowed_types: list = None) -> bool:
     """Validate file type"""
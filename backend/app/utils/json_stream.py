@@ -0,0 +1,92 @@
+from typing import List, Optional, Tuple
+
+ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+class JsonFieldStream:
+    """Incrementally decodes the top-level string fields of a JSON object as it streams in.
+
+    feed() takes raw completion text in arbitrary chunks and returns
+    (field, text) pieces of the string values decoded so far, so a client
+    can render a field before the object is complete. Text before the
+    opening brace (e.g. a code fence) is ignored, as are non-string values.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.string_is_key = False
+        self.expect_key = True
+        self.key_buffer: List[str] = []
+        self.current_key: Optional[str] = None
+        self.escape: Optional[str] = None  # Pending escape sequence after a backslash
+        self.high_surrogate: Optional[int] = None
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        pieces: List[Tuple[str, str]] = []
+        value: List[str] = []
+
+        def flush() -> None:
+            if value and self.current_key is not None:
+                pieces.append((self.current_key, "".join(value)))
+            value.clear()
+
+        for char in chunk:
+            if self.done:
+                break
+            if self.in_string:
+                decoded = self._string_char(char)
+                if decoded is not None:
+                    if self.string_is_key:
+                        self.key_buffer.append(decoded)
+                    elif self.depth == 1:
+                        value.append(decoded)
+                elif not self.in_string:
+                    flush()
+                continue
+            if char == '"':
+                self.in_string = True
+                self.string_is_key = self.depth == 1 and self.expect_key
+                if self.string_is_key:
+                    self.key_buffer = []
+            elif char in "{[":
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+                if self.depth == 0 and char == "}":
+                    self.done = True
+            elif self.depth == 1 and char == ":":
+                self.expect_key = False
+            elif self.depth == 1 and char == ",":
+                self.expect_key = True
+                self.current_key = None
+        flush()
+        return pieces
+
+    def _string_char(self, char: str) -> Optional[str]:
+        """Decoded text for one character inside a string (None if it only advances state)"""
+        if self.escape is not None:
+            self.escape += char
+            if self.escape[0] != "u":
+                sequence, self.escape = self.escape, None
+                return ESCAPES.get(sequence, sequence)
+            if len(self.escape) < 5:
+                return None
+            code, self.escape = int(self.escape[1:], 16), None
+            if 0xD800 <= code < 0xDC00:
+                self.high_surrogate = code
+                return None
+            if 0xDC00 <= code < 0xE000 and self.high_surrogate is not None:
+                code = 0x10000 + ((self.high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+            self.high_surrogate = None
+            return chr(code)
+        if char == "\\":
+            self.escape = ""
+            return None
+        if char == '"':
+            self.in_string = False
+            if self.string_is_key:
+                self.current_key = "".join(self.key_buffer)
+                self.expect_key = False
+            return None
+        return char
@@ -0,0 +1,219 @@
+import asyncio
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds; anything slower lands in the +Inf bucket
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STAGE_METRIC = "stage_duration_seconds"
+
+# Stage timings of the current request, for the Server-Timing header (None when not collecting)
+_collected: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("collected_timings", default=None)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values (Prometheus semantics: bucket counts values <= bound)"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self) -> Dict[str, object]:
+        """Consistent copy: cumulative bucket counts, total count and sum"""
+        with self._lock:
+            counts = list(self.counts)
+            count, total = self.count, self.sum
+        cumulative = []
+        running = 0
+        for bucket_count in counts:
+            running += bucket_count
+            cumulative.append(running)
+        return {"bounds": self.buckets, "buckets": cumulative, "count": count, "sum": total}
+
+class MetricsRegistry:
+    """In-process metrics, rendered in the Prometheus text format.
+
+    Each process (API worker, Celery worker) keeps its own registry; scrape
+    every process to see the whole system.
+    """
+
+    def __init__(self, namespace: str = "genai"):
+        self.namespace = namespace
+        self._histograms: Dict[str, Dict[LabelSet, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelSet, float]] = {}
+        self._gauges: Dict[str, Dict[LabelSet, Callable[[], float]]] = {}
+        self._help: Dict[str, str] = {}
+        self._buckets: Dict[str, Sequence[float]] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str, buckets: Optional[Sequence[float]] = None) -> None:
+        """Help text of a metric and, for histograms not measuring seconds, their bucket bounds"""
+        self._help[name] = help_text
+        if buckets is not None:
+            self._buckets[name] = tuple(buckets)
+
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        """The histogram of a metric for one label set, created on first use"""
+        key = tuple(sorted(labels.items()))
+        series = self._histograms.get(name)
+        if series is None or key not in series:
+            with self._lock:
+                series = self._histograms.setdefault(name, {})
+                if key not in series:
+                    series[key] = Histogram(self._buckets.get(name, DEFAULT_BUCKETS))
+        return series[key]
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        self.histogram(name, **labels).observe(value)
+
+    def increment(self, name: str, amount: float = 1, **labels: str) -> None:
+        """Add to a monotonically increasing counter"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def counter_value(self, name: str, **labels: str) -> float:
+        return self._counters.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def gauge(self, name: str, function: Callable[[], float], **labels: str) -> None:
+        """A value that can go up and down, read from `function` whenever it is rendered (e.g. a pool's size)"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = function
+
+    def gauge_value(self, name: str, **labels: str) -> float:
+        function = self._gauges.get(name, {}).get(tuple(sorted(labels.items())))
+        return function() if function is not None else 0
+
+    def snapshot(self) -> Dict[str, Dict[LabelSet, Dict[str, object]]]:
+        with self._lock:
+            metrics = {name: dict(series) for name, series in self._histograms.items()}
+        return {name: {key: histogram.snapshot() for key, histogram in series.items()} for name, series in metrics.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms = {}
+            self._counters = {}
+
+    def _header(self, lines: List[str], name: str, metric_type: str) -> str:
+        full_name = f"{self.namespace}_{name}"
+        if name in self._help:
+            lines.append(f"# HELP {full_name} {self._help[name]}")
+        lines.append(f"# TYPE {full_name} {metric_type}")
+        return full_name
+
+    def render(self) -> str:
+        """Prometheus text exposition of every counter, gauge and histogram"""
+        lines: List[str] = []
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            functions = {name: dict(series) for name, series in self._gauges.items()}
+        gauges = {name: {key: function() for key, function in series.items()} for name, series in functions.items()}
+        for metric_type, values in (("counter", counters), ("gauge", gauges)):
+            for name, series in sorted(values.items()):
+                full_name = self._header(lines, name, metric_type)
+                for key, value in sorted(series.items()):
+                    lines.append(f"{full_name}{_format_labels(key)} {_format_value(value)}")
+        for name, series in sorted(self.snapshot().items()):
+            full_name = self._header(lines, name, "histogram")
+            for key, data in sorted(series.items()):
+                bounds = [_format_value(bound) for bound in data["bounds"]] + ["+Inf"]
+                for bound, count in zip(bounds, data["buckets"]):
+                    lines.append(f"{full_name}_bucket{_format_labels(key + (('le', bound),))} {count}")
+                lines.append(f"{full_name}_sum{_format_labels(key)} {data['sum']:.6f}")
+                lines.append(f"{full_name}_count{_format_labels(key)} {data['count']}")
+        return "\n".join(lines) + "\n"
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+def _format_labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+metrics = MetricsRegistry()
+metrics.describe(STAGE_METRIC, "Wall-clock duration of instrumented pipeline stages")
+
+def record(stage: str, seconds: float) -> None:
+    """Record one stage duration in the histograms and, if collecting, for the current request"""
+    metrics.observe(STAGE_METRIC, seconds, stage=stage)
+    collected = _collected.get()
+    if collected is not None:
+        collected.append((stage, seconds))
+
+def record_all(timings: Sequence[Tuple[str, float]]) -> None:
+    """Record durations measured elsewhere (e.g. in a parser process)"""
+    for stage, seconds in timings:
+        record(stage, seconds)
+
+@contextmanager
+def collect_timings() -> Iterator[List[Tuple[str, float]]]:
+    """Collect the (stage, seconds) pairs recorded in this context"""
+    timings: List[Tuple[str, float]] = []
+    token = _collected.set(timings)
+    try:
+        yield timings
+    finally:
+        _collected.reset(token)
+
+def server_timing_header(timings: Sequence[Tuple[str, float]], total: Optional[float] = None) -> str:
+    """Server-Timing header value; repeated stages are summed"""
+    durations: Dict[str, float] = {}
+    for stage, seconds in timings:
+        durations[stage] = durations.get(stage, 0.0) + seconds
+    entries = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in durations.items()]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+class StageTimer:
+    """Times a block (`with timer("stage"):`) or every call of a sync or async function (`@timer("stage")`)"""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._start = 0.0
+
+    def __enter__(self) -> "StageTimer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        record(self.stage, time.perf_counter() - self._start)
+        return False
+
+    def __call__(self, func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with StageTimer(self.stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with StageTimer(self.stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+def timer(stage: str) -> StageTimer:
+    return StageTimer(stage)
@@ -0,0 +1,57 @@
+import hashlib
+import zlib
+from typing import List, Optional
+import numpy as np
+from .text_processing import tokenize
+
+# Changing any of these invalidates stored signatures and buckets (run rebuild_duplicate_index.py)
+NUM_PERMUTATIONS = 128
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // NUM_BANDS  # A pair with Jaccard s shares a bucket with p = 1 - (1 - s^8)^16
+SHINGLE_SIZE = 3
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64(0xFFFFFFFF)
+
+_permutations = np.random.RandomState(1)
+PERMUTATION_A = _permutations.randint(1, (1 << 61) - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+PERMUTATION_B = _permutations.randint(0, (1 << 61) - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+def shingles(text: str) -> np.ndarray:
+    """Distinct 32-bit hashes of the text's word shingles (stopwords dropped)"""
+    tokens = tokenize(text)
+    if len(tokens) < SHINGLE_SIZE:
+        grams = [" ".join(tokens)] if tokens else []
+    else:
+        grams = [" ".join(tokens[index:index + SHINGLE_SIZE]) for index in range(len(tokens) - SHINGLE_SIZE + 1)]
+    return np.unique(np.array([zlib.crc32(gram.encode("utf-8")) for gram in grams], dtype=np.uint64))
+
+def signature(text: str) -> Optional[bytes]:
+    """MinHash signature of the text, encoded for storage; None for empty text"""
+    hashes = shingles(text)
+    if not len(hashes):
+        return None
+    # Universal hashing (a * x + b) mod p per permutation, minimised over all shingles
+    with np.errstate(over="ignore"):
+        permuted = ((hashes[:, None] * PERMUTATION_A + PERMUTATION_B) % MERSENNE_PRIME) & MAX_HASH
+    return permuted.min(axis=0).astype("<u4").tobytes()
+
+def decode_signature(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4")
+
+def band_buckets(data: bytes) -> List[int]:
+    """LSH bucket of each band: a signed 64-bit digest of the band number and its rows"""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                bytes([band]) + data[band * ROWS_PER_BAND * 4:(band + 1) * ROWS_PER_BAND * 4], digest_size=8
+            ).digest(),
+            "big",
+            signed=True
+        )
+        for band in range(NUM_BANDS)
+    ]
+
+def similarity(first: bytes, second: bytes) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return float(np.mean(decode_signature(first) == decode_signature(second)))
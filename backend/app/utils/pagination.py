@@ -0,0 +1,28 @@
+import base64
+import json
+from typing import Any, List
+from sqlalchemy import and_, or_
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor"""
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor produced by encode_cursor; raises ValueError if it is malformed"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+def keyset_after(column, id_column, last_value: Any, last_id: int, descending: bool):
+    """Filter for rows after (last_value, last_id) in ORDER BY column [DESC] NULLS LAST, id.
+
+    Rows with a NULL column sort last and are paged by id alone.
+    """
+    if last_value is None:
+        return and_(column.is_(None), id_column > last_id)
+    beyond = column < last_value if descending else column > last_value
+    return or_(beyond, and_(column == last_value, id_column > last_id), column.is_(None))
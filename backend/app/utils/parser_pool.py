@@ -0,0 +1,155 @@
+import asyncio
+import atexit
+import multiprocessing
+import queue
+import threading
+from typing import Dict, Any, Optional
+from ..config import settings
+from .resume_parser import parse_resume
+from .skill_taxonomy import get_skill_taxonomy
+from .metrics import collect_timings, record_all, timer
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ResumeParseError(Exception):
+    """Raised when a resume could not be parsed (timeout or crashed worker)"""
+    pass
+
+def _worker_main(conn) -> None:
+    """Worker process loop: receive (file_path, filename, max_pages), send back the parse result and stage timings"""
+    # Compile the taxonomy once per worker, before the first document arrives
+    get_skill_taxonomy()
+    while True:
+        try:
+            file_path, filename, max_pages = conn.recv()
+        except (EOFError, OSError):
+            break
+        # Stage timings are recorded by the parent; this process's registry is never scraped
+        with collect_timings() as timings:
+            try:
+                result = ("ok", parse_resume(file_path, filename, max_pages))
+            except Exception as e:
+                result = ("error", str(e))
+        conn.send(result + (timings,))
+
+class _ParserWorker:
+    """A single parser process and the parent end of its pipe"""
+
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        try:
+            self.process.kill()
+            self.process.join(timeout=5)
+        finally:
+            self.conn.close()
+
+class ResumeParserPool:
+    """Fixed-size pool of parser processes with a hard wall-clock timeout per document"""
+
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = None, max_pages: Optional[int] = None):
+        self.workers = workers or settings.resume_parser_workers
+        self.timeout = timeout or settings.resume_parse_timeout
+        self.max_pages = max_pages or settings.resume_max_pages
+        self._ctx = multiprocessing.get_context("spawn")
+        # Idle workers; None is a shutdown sentinel that wakes blocked callers
+        self._idle: "queue.Queue[Optional[_ParserWorker]]" = queue.Queue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._started = False
+
+    def _ensure_started(self) -> None:
+        """Start worker processes on first use so importing this module stays cheap"""
+        if self._started:
+            return
+        with self._lock:
+            if self._started:
+                return
+            self._drain()
+            for _ in range(self.workers):
+                worker = _ParserWorker(self._ctx)
+                self._all.append(worker)
+                self._idle.put(worker)
+            self._started = True
+
+    def _drain(self) -> None:
+        """Empty the idle queue (workers and leftover sentinels)"""
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                return
+
+    def _replace(self, worker: _ParserWorker) -> _ParserWorker:
+        """Kill a hung or crashed worker and start a fresh one in its place"""
+        worker.kill()
+        replacement = _ParserWorker(self._ctx)
+        with self._lock:
+            if not self._started or worker not in self._all:
+                # The pool was shut down meanwhile; don't leak the new process
+                replacement.kill()
+                raise ResumeParseError("Resume parser pool was shut down")
+            self._all = [w for w in self._all if w is not worker] + [replacement]
+        return replacement
+
+    def _release(self, worker: _ParserWorker) -> None:
+        """Return a worker to the idle queue, or stop it if it no longer belongs to the pool"""
+        with self._lock:
+            if self._started and worker in self._all:
+                self._idle.put(worker)
+                return
+        worker.kill()
+
+    @timer("parser_pool.parse")
+    def parse_sync(self, file_path: str, filename: str) -> Dict[str, Any]:
+        """Parse a resume in a worker process, blocking the calling thread only"""
+        self._ensure_started()
+        worker = self._idle.get()
+        if worker is None:
+            # Pass the sentinel on to the next blocked caller
+            self._idle.put(None)
+            raise ResumeParseError("Resume parser pool was shut down")
+        try:
+            if not self._started:
+                raise ResumeParseError("Resume parser pool was shut down")
+            if not worker.process.is_alive():
+                worker = self._replace(worker)
+            worker.conn.send((file_path, filename, self.max_pages))
+            if not worker.conn.poll(self.timeout):
+                worker = self._replace(worker)
+                raise ResumeParseError(f"Parsing {filename} timed out after {self.timeout}s")
+            status, payload, timings = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            worker = self._replace(worker)
+            raise ResumeParseError(f"Parser worker crashed while parsing {filename}: {e}")
+        finally:
+            self._release(worker)
+
+        record_all(timings)
+        if status != "ok":
+            raise ResumeParseError(f"Error parsing {filename}: {payload}")
+        return payload
+
+    async def parse(self, file_path: str, filename: str) -> Dict[str, Any]:
+        """Parse a resume without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.parse_sync, file_path, filename)
+
+    def shutdown(self) -> None:
+        """Stop all worker processes; callers waiting for a worker get ResumeParseError"""
+        with self._lock:
+            self._started = False
+            workers, self._all = self._all, []
+            self._drain()
+            self._idle.put(None)
+        for worker in workers:
+            worker.kill()
+
+# Create global parser pool instance
+resume_parser_pool = ResumeParserPool()
+atexit.register(resume_parser_pool.shutdown)
@@ -0,0 +1,179 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+import httpx
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency that is currently failing"""
+    pass
+
+class ConcurrencyTimeoutError(Exception):
+    """Raised when no concurrency slot frees up in time"""
+    pass
+
+def status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status behind an exception, if it carries one"""
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+def is_retryable(exc: BaseException, transient: Tuple[Type[BaseException], ...] = ()) -> bool:
+    """Whether a failed call may succeed if repeated"""
+    if isinstance(exc, (CircuitOpenError, ConcurrencyTimeoutError)):
+        return False
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError, httpx.TransportError) + tuple(transient)):
+        return True
+    code = status_code(exc)
+    return code in RETRYABLE_STATUS if code is not None else False
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Server-requested wait from Retry-After(-Ms) response headers, if any"""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return max(float(headers["retry-after-ms"]) / 1000, 0.0)
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            retry_at = parsedate_to_datetime(value)
+            return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff; a Retry-After hint sets the floor (plus jitter so waiters spread out)"""
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = retry_after + random.uniform(0, base)
+    return delay
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+
+    Callers that arrive while a call is running await the same task and get
+    its result or exception. The task is shielded, so a caller that goes
+    away (e.g. a closed request) doesn't cancel it for the others.
+    """
+
+    def __init__(self):
+        # Tasks belong to one event loop; Celery threads may each run their own
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = weakref.WeakKeyDictionary()
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Result of the call for this key and whether it was shared with an earlier caller"""
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+        task = calls.get(key)
+        shared = task is not None
+        if task is None:
+            task = loop.create_task(call())
+            calls[key] = task
+
+            def forget(finished: asyncio.Task) -> None:
+                if calls.get(key) is finished:
+                    del calls[key]
+                if not finished.cancelled():
+                    # Mark the exception retrieved even if every caller went away
+                    finished.exception()
+
+            task.add_done_callback(forget)
+        return await asyncio.shield(task), shared
+
+class ConcurrencyLimiter:
+    """Allows at most `limit` concurrent holders in the process, waiting at most `timeout` seconds for a slot.
+
+    The slots are a threading semaphore, so the cap holds across the event
+    loops of worker threads too. Waiters poll it with short sleeps rather
+    than block their loop.
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, limit: int, timeout: Optional[float] = None):
+        self.limit = limit
+        self.timeout = timeout
+        self._semaphore = threading.BoundedSemaphore(limit)
+
+    async def acquire(self) -> None:
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        delay = 0.001
+        while not self._semaphore.acquire(blocking=False):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise ConcurrencyTimeoutError(f"No free slot among {self.limit} within {self.timeout}s")
+            await asyncio.sleep(delay if deadline is None else min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * 2, self.POLL_INTERVAL)
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+class CircuitBreaker:
+    """Stops calling a dependency after consecutive failures.
+
+    After `failure_threshold` failures in a row the circuit opens and
+    allow() returns False. Once `reset_timeout` seconds have passed, one
+    call at a time is let through as a probe (half-open): success closes
+    the circuit, another failure keeps it open for a further reset_timeout.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "open" if time.monotonic() - self.opened_at < self.reset_timeout else "half_open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at >= self.reset_timeout:
+                # This caller probes; the rest keep failing fast for another window
+                self.opened_at = now
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info(f"Circuit {self.name} closed")
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning(f"Circuit {self.name} opened after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
@@ -1,18 +1,31 @@
 import re
 import PyPDF2
 from docx import Document
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from .skill_taxonomy import get_skill_taxonomy
+from .resume_sections import tokenize_resume, classify_header
+from .metrics import timer
 import logging
 
 logger = logging.getLogger(__name__)
 
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF file"""
+# Bump whenever extraction output changes so cached parse results are invalidated
+PARSER_VERSION = "6"
+
+def get_parser_version() -> str:
+    """Parser version including the loaded taxonomy version, used to key cached results"""
+    return f"{PARSER_VERSION}.{get_skill_taxonomy().version}"
+
+def extract_text_from_pdf(file_path: str, max_pages: Optional[int] = None) -> str:
+    """Extract text from PDF file, reading at most max_pages pages"""
     try:
         with open(file_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
             text = ""
-            for page in pdf_reader.pages:
+            for page_number, page in enumerate(pdf_reader.pages):
+                if max_pages is not None and page_number >= max_pages:
+                    logger.info(f"PDF {file_path} truncated at {max_pages} pages")
+                    break
                 text += page.extract_text()
         return text
     except Exception as e:
@@ -32,102 +45,42 @@ def extract_text_from_docx(file_path: str) -> str:
         return ""
 
 def extract_skills(text: str) -> List[str]:
-    """Extract skills from resume text"""
-    # Common technical skills
-    skills_patterns = [
-        r'\b(?:Python|Java|JavaScript|TypeScript|C\+\+|C#|PHP|Ruby|Go|Rust|Swift|Kotlin)\b',
-        r'\b(?:React|Angular|Vue|Node\.js|Express|Django|Flask|Spring|Laravel)\b',
-        r'\b(?:MySQL|PostgreSQL|MongoDB|Redis|Elasticsearch|Cassandra)\b',
-        r'\b(?:AWS|Azure|GCP|Docker|Kubernetes|Jenkins|Git|GitHub)\b',
-        r'\b(?:HTML|CSS|Bootstrap|Tailwind|Sass|Less)\b',
-        r'\b(?:Machine Learning|AI|Data Science|Analytics|Statistics)\b',
-        r'\b(?:Linux|Unix|Windows|MacOS)\b',
-        r'\b(?:API|REST|GraphQL|Microservices|DevOps|Agile|Scrum)\b'
-    ]
-    
-    skills = []
-    for pattern in skills_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        skills.extend(matches)
-    
-    return list(set(skills))
+    """Extract canonical skill names from resume text"""
+    return get_skill_taxonomy().skills.find(text)
 
 def extract_experience(text: str) -> List[Dict[str, Any]]:
-    """Extract work experience from resume text"""
-    experience = []
-    
-    # Look for common job title patterns
-    job_patterns = [
-        r'(?:Software Engineer|Developer|Programmer|Architect|Manager|Lead|Senior|Junior|Intern)',
-        r'(?:Data Scientist|Analyst|Researcher|Consultant|Specialist)',
-        r'(?:Designer|Product Manager|Project Manager|Team Lead)'
-    ]
-    
-    # Look for date patterns (years)
-    date_pattern = r'\b(?:20\d{2}|19\d{2})\b'
-    dates = re.findall(date_pattern, text)
-    
-    # Simple experience extraction (can be enhanced with NLP)
-    lines = text.split('\n')
-    for i, line in enumerate(lines):
-        for pattern in job_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                # Try to extract company and duration
-                experience_entry = {
-                    'title': line.strip(),
-                    'company': '',
-                    'duration': '',
-                    'description': ''
-                }
-                
-                # Look for company in next few lines
-                for j in range(i+1, min(i+3, len(lines))):
-                    if lines[j].strip() and not re.search(date_pattern, lines[j]):
-                        experience_entry['company'] = lines[j].strip()
-                        break
-                
-                experience.append(experience_entry)
-                break
-    
-    return experience
+    """Extract work experience entries (title, company, date range) from resume text"""
+    return tokenize_resume(text)['experience']
 
 def extract_education(text: str) -> List[Dict[str, Any]]:
-    """Extract education information from resume text"""
-    education = []
-    
-    # Common degree patterns
-    degree_patterns = [
-        r'\b(?:Bachelor|Master|PhD|Doctorate|B\.S\.|M\.S\.|B\.A\.|M\.A\.|B\.Tech|M\.Tech)\b',
-        r'\b(?:Computer Science|Engineering|Mathematics|Business|MBA)\b'
-    ]
-    
-    lines = text.split('\n')
-    for line in lines:
-        for pattern in degree_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                education.append({
-                    'degree': line.strip(),
-                    'institution': '',
-                    'year': ''
-                })
-                break
-    
-    return education
+    """Extract education entries (degree, institution, year) from resume text"""
+    return tokenize_resume(text)['education']
 
 def extract_certifications(text: str) -> List[str]:
-    """Extract certifications from resume text"""
-    cert_patterns = [
-        r'\b(?:AWS Certified|Azure Certified|Google Cloud Certified)\b',
-        r'\b(?:PMP|Scrum Master|Product Owner)\b',
-        r'\b(?:CISSP|CompTIA|Cisco|Microsoft Certified)\b'
-    ]
-    
-    certifications = []
-    for pattern in cert_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        certifications.extend(matches)
-    
-    return list(set(certifications))
+    """Extract canonical certification names from resume text"""
+    return get_skill_taxonomy().certifications.find(text)
+
+EMAIL_PATTERN = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+PHONE_PATTERN = re.compile(r'(?:\+\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b')
+NAME_PATTERN = re.compile(r"^[A-Za-z][A-Za-z.'-]*(?:\s+[A-Za-z][A-Za-z.'-]*){1,3}$")
+
+def extract_contact_info(text: str) -> Dict[str, str]:
+    """Extract candidate name, email and phone from the top of the resume"""
+    email = EMAIL_PATTERN.search(text)
+    phone = PHONE_PATTERN.search(text)
+    
+    # The name is usually the first short, letters-only line
+    name = ''
+    for line in [line.strip() for line in text.split('\n') if line.strip()][:5]:
+        if NAME_PATTERN.match(line) and not classify_header(line):
+            name = line
+            break
+    
+    return {
+        'name': name,
+        'email': email.group(0) if email else '',
+        'phone': phone.group(0).strip() if phone else ''
+    }
 
 def calculate_ats_score(text: str, filename: str) -> float:
     """Calculate ATS compatibility score"""
@@ -155,30 +108,44 @@ def calculate_ats_score(text: str, filename: str) -> float:
     
     return min(score, 100.0)
 
-def parse_resume(file_path: str, filename: str) -> Dict[str, Any]:
+def empty_parse_result() -> Dict[str, Any]:
+    """Parse result for files that could not be read"""
+    return {
+        'parsed_skills': [],
+        'parsed_experience': [],
+        'parsed_education': [],
+        'parsed_certifications': [],
+        'ats_score': 0.0,
+        'contact': {'name': '', 'email': '', 'phone': ''},
+        'raw_text': ''
+    }
+
+@timer("parse_resume")
+def parse_resume(file_path: str, filename: str, max_pages: Optional[int] = None) -> Dict[str, Any]:
     """Parse resume and extract relevant information"""
     try:
         # Extract text based on file type
-        if filename.lower().endswith('.pdf'):
-            text = extract_text_from_pdf(file_path)
-        elif filename.lower().endswith('.docx'):
-            text = extract_text_from_docx(file_path)
-        else:
-            return {
-                'parsed_skills': [],
-                'parsed_experience': [],
-                'parsed_education': [],
-                'parsed_certifications': [],
-                'ats_score': 0.0,
-                'raw_text': ''
-            }
+        with timer("parse_resume.extract_text"):
+            if filename.lower().endswith('.pdf'):
+                text = extract_text_from_pdf(file_path, max_pages)
+            elif filename.lower().endswith('.docx'):
+                text = extract_text_from_docx(file_path)
+            else:
+                return empty_parse_result()
         
         # Extract information
-        skills = extract_skills(text)
-        experience = extract_experience(text)
-        education = extract_education(text)
-        certifications = extract_certifications(text)
-        ats_score = calculate_ats_score(text, filename)
+        with timer("parse_resume.skills"):
+            skills = extract_skills(text)
+        with timer("parse_resume.sections"):
+            tokens = tokenize_resume(text)
+        experience = tokens['experience']
+        education = tokens['education']
+        with timer("parse_resume.certifications"):
+            certifications = extract_certifications(text)
+        with timer("parse_resume.ats_score"):
+            ats_score = calculate_ats_score(text, filename)
+        with timer("parse_resume.contact"):
+            contact = extract_contact_info(text)
         
         return {
             'parsed_skills': skills,
@@ -186,16 +153,10 @@ def parse_resume(file_path: str, filename: str) -> Dict[str, Any]:
             'parsed_education': education,
             'parsed_certifications': certifications,
             'ats_score': ats_score,
-            'raw_text': text[:1000]  # First 1000 chars for reference
+            'contact': contact,
+            'raw_text': text
         }
         
     except Exception as e:
         logger.error(f"Error parsing resume: {e}")
-        return {
-            'parsed_skills': [],
-            'parsed_experience': [],
-            'parsed_education': [],
-            'parsed_certifications': [],
-            'ats_score': 0.0,
-            'raw_text': ''
-        }
+        return empty_parse_result()
@@ -0,0 +1,142 @@
+import re
+from typing import Dict, List, Any, Optional
+
+# Section headers, matched against a whole (short) line
+SECTION_HEADERS = {
+    'experience': r'(?:work |professional |relevant )?experience|employment(?: history)?|work history|career history',
+    'education': r'education(?:al background)?|academic (?:background|qualifications)|qualifications',
+    'skills': r'(?:technical |core |key )?skills|technologies|tech stack|competencies',
+    'certifications': r'certifications?|licen[cs]es?(?: (?:&|and) certifications)?',
+    'summary': r'summary|professional summary|profile|about me|objective|career objective',
+    'projects': r'projects|personal projects|key projects',
+    'other': r'awards|honou?rs|publications|languages|interests|hobbies|references|volunteering|activities',
+}
+SECTION_HEADER_PATTERN = re.compile(
+    r'^\s*(?:' + '|'.join(f'(?P<{name}>{pattern})' for name, pattern in SECTION_HEADERS.items()) + r')\s*:?\s*$',
+    re.IGNORECASE
+)
+MAX_HEADER_LENGTH = 40
+
+JOB_TITLE_PATTERN = re.compile(
+    r'(?:Software Engineer|Developer|Programmer|Architect|Manager|Lead|Senior|Junior|Intern'
+    r'|Data Scientist|Analyst|Researcher|Consultant|Specialist'
+    r'|Designer|Product Manager|Project Manager|Team Lead)',
+    re.IGNORECASE
+)
+DEGREE_PATTERN = re.compile(
+    r'\b(?:Bachelor|Master|PhD|Doctorate|B\.S\.|M\.S\.|B\.A\.|M\.A\.|B\.Tech|M\.Tech'
+    r'|Computer Science|Engineering|Mathematics|Business|MBA)\b',
+    re.IGNORECASE
+)
+
+MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+DATE = rf'(?:(?:{MONTH}\s+)?(?:19|20)\d{{2}}|\d{{1,2}}/(?:19|20)\d{{2}})'
+DATE_RANGE_PATTERN = re.compile(
+    rf'(?P<start>{DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{DATE}|present|current|now|today)',
+    re.IGNORECASE
+)
+YEAR_PATTERN = re.compile(r'\b(?:19|20)\d{2}\b')
+
+def classify_header(line: str) -> Optional[str]:
+    """Return the section name if the line is a section header"""
+    if len(line) > MAX_HEADER_LENGTH:
+        return None
+    match = SECTION_HEADER_PATTERN.match(line)
+    return match.lastgroup if match else None
+
+def _apply_date_range(entry: Dict[str, Any], line: str) -> str:
+    """Fill duration/start/end from a date range on the line and return the rest of the line"""
+    match = DATE_RANGE_PATTERN.search(line)
+    if not match or entry['duration']:
+        return line
+    entry['duration'] = match.group(0)
+    entry['start'] = match.group('start')
+    entry['end'] = match.group('end')
+    return (line[:match.start()] + line[match.end():]).strip(' ,-–—|()')
+
+def _new_experience(line: str) -> Dict[str, Any]:
+    entry = {
+        'title': line,
+        'company': '',
+        'duration': '',
+        'start': '',
+        'end': '',
+        'description': ''
+    }
+    _apply_date_range(entry, line)
+    return entry
+
+def _new_education(line: str) -> Dict[str, Any]:
+    year = YEAR_PATTERN.search(line)
+    return {
+        'degree': line,
+        'institution': '',
+        'year': year.group(0) if year else ''
+    }
+
+def tokenize_resume(text: str) -> Dict[str, Any]:
+    """Classify resume lines in a single pass and emit structured entries.
+
+    Returns the section each line belongs to plus experience and education
+    entries with date ranges. When a resume has no recognisable Experience or
+    Education header, every line is considered for that entry type.
+    """
+    sections: Dict[str, List[str]] = {}
+    experience: List[Dict[str, Any]] = []
+    education: List[Dict[str, Any]] = []
+    loose_experience: List[Dict[str, Any]] = []
+    loose_education: List[Dict[str, Any]] = []
+
+    section = 'header'
+    current_experience: Optional[Dict[str, Any]] = None
+    current_education: Optional[Dict[str, Any]] = None
+
+    for raw_line in text.split('\n'):
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        header = classify_header(line)
+        if header:
+            section = header
+            sections.setdefault(section, [])
+            current_experience = current_education = None
+            continue
+
+        sections.setdefault(section, []).append(line)
+
+        if section == 'experience':
+            if JOB_TITLE_PATTERN.search(line):
+                current_experience = _new_experience(line)
+                experience.append(current_experience)
+            elif current_experience is not None:
+                remainder = _apply_date_range(current_experience, line)
+                if not remainder:
+                    continue
+                if not current_experience['company'] and not YEAR_PATTERN.search(remainder):
+                    current_experience['company'] = remainder
+                else:
+                    separator = ' ' if current_experience['description'] else ''
+                    current_experience['description'] += separator + remainder
+        elif section == 'education':
+            if DEGREE_PATTERN.search(line):
+                current_education = _new_education(line)
+                education.append(current_education)
+            elif current_education is not None:
+                year = YEAR_PATTERN.search(line)
+                if year and not current_education['year']:
+                    current_education['year'] = year.group(0)
+                if not current_education['institution']:
+                    current_education['institution'] = YEAR_PATTERN.sub('', line).strip(' ,-–—|')
+        else:
+            # Kept in case the resume has no headers for these sections
+            if JOB_TITLE_PATTERN.search(line):
+                loose_experience.append(_new_experience(line))
+            if DEGREE_PATTERN.search(line):
+                loose_education.append(_new_education(line))
+
+    return {
+        'sections': sections,
+        'experience': experience if 'experience' in sections else loose_experience,
+        'education': education if 'education' in sections else loose_education
+    }
@@ -0,0 +1,108 @@
+import math
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from scipy import sparse
+
+# Tokens are hashed into a fixed space so no vocabulary has to be stored or kept in sync
+FEATURE_BITS = 18
+NUM_FEATURES = 1 << FEATURE_BITS
+
+def feature_index(token: str) -> int:
+    """Hashed feature of a token"""
+    return zlib.crc32(token.encode("utf-8")) & (NUM_FEATURES - 1)
+
+def hashed_frequencies(term_frequencies: Dict[str, int]) -> Dict[int, int]:
+    """Fold token counts into hashed feature counts"""
+    features: Dict[int, int] = {}
+    for token, count in term_frequencies.items():
+        feature = feature_index(token)
+        features[feature] = features.get(feature, 0) + count
+    return features
+
+def idf(document_count: int, total_documents: int) -> float:
+    """Smoothed inverse document frequency (never zero, so shared terms still count)"""
+    return math.log((1 + total_documents) / (1 + document_count)) + 1.0
+
+def tf_vector(features: Dict[int, int]) -> bytes:
+    """Sublinear term frequencies of a document, encoded for storage; IDF is applied when scoring"""
+    indices = np.array(sorted(features), dtype=np.int32)
+    values = np.array([1.0 + math.log(features[feature]) for feature in indices.tolist()], dtype=np.float64)
+    return encode_vector(indices, values)
+
+def idf_weights(document_counts: Dict[int, int], total_documents: int) -> np.ndarray:
+    """Dense IDF of every hashed feature; features without a count get the weight of an unseen term"""
+    weights = np.full(NUM_FEATURES, idf(0, total_documents))
+    if document_counts:
+        features = np.fromiter(document_counts.keys(), dtype=np.int64, count=len(document_counts))
+        counts = np.fromiter(document_counts.values(), dtype=np.float64, count=len(document_counts))
+        weights[features] = np.log((1 + total_documents) / (1 + counts)) + 1.0
+    return weights
+
+def apply_idf(data: bytes, weights: np.ndarray) -> bytes:
+    """L2-normalized TF-IDF vector from a stored tf_vector and idf_weights"""
+    indices, values = decode_vector(data)
+    return _normalized(indices, values.astype(np.float64) * weights[indices])
+
+def tfidf_vector(features: Dict[int, int], document_counts: Dict[int, int], total_documents: int) -> bytes:
+    """L2-normalized sublinear TF-IDF vector of a document, as apply_idf would produce it"""
+    indices, values = decode_vector(tf_vector(features))
+    weights = [idf(document_counts.get(feature, 0), total_documents) for feature in indices.tolist()]
+    return _normalized(indices, values.astype(np.float64) * np.array(weights, dtype=np.float64))
+
+def _normalized(indices: np.ndarray, values: np.ndarray) -> bytes:
+    norm = np.linalg.norm(values)
+    if norm > 0:
+        values = values / norm
+    return encode_vector(indices, values.astype(np.float32))
+
+def encode_vector(indices: np.ndarray, values: np.ndarray) -> bytes:
+    """Pack sorted int32 feature indices followed by their float32 weights"""
+    return indices.astype(np.int32).tobytes() + values.astype(np.float32).tobytes()
+
+def decode_vector(data: bytes):
+    """Inverse of encode_vector: (indices, values)"""
+    size = len(data) // 8
+    return np.frombuffer(data, dtype=np.int32, count=size), np.frombuffer(data, dtype=np.float32, offset=size * 4, count=size)
+
+def stack_vectors(vectors: Sequence[Optional[bytes]]) -> sparse.csr_matrix:
+    """Build a (documents x features) CSR matrix; missing vectors become empty rows"""
+    indptr = [0]
+    indices: List[np.ndarray] = []
+    values: List[np.ndarray] = []
+    for data in vectors:
+        if data:
+            row_indices, row_values = decode_vector(data)
+            indices.append(row_indices)
+            values.append(row_values)
+            indptr.append(indptr[-1] + len(row_indices))
+        else:
+            indptr.append(indptr[-1])
+    return sparse.csr_matrix(
+        (
+            np.concatenate(values) if values else np.zeros(0, dtype=np.float32),
+            np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32),
+            np.array(indptr, dtype=np.int64)
+        ),
+        shape=(len(vectors), NUM_FEATURES)
+    )
+
+@lru_cache(maxsize=16)
+def _dense_query(query: bytes) -> np.ndarray:
+    """Dense float64 copy of a query vector, reused while one job's cohort is scored"""
+    query_indices, query_values = decode_vector(query)
+    dense_query = np.zeros(NUM_FEATURES, dtype=np.float64)
+    dense_query[query_indices] = query_values
+    dense_query.flags.writeable = False
+    return dense_query
+
+def cosine_similarities(query: Optional[bytes], vectors: Sequence[Optional[bytes]]) -> np.ndarray:
+    """Cosine similarity (0-100) of each stored vector to the query; 0 where either is missing.
+
+    Both sides are already unit length, so this is one sparse matrix-vector product.
+    """
+    if not query or not vectors:
+        return np.zeros(len(vectors))
+    similarities = stack_vectors(vectors).astype(np.float64) @ _dense_query(query)
+    return np.clip(similarities, 0.0, 1.0) * 100
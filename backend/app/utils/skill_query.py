@@ -0,0 +1,126 @@
+import re
+from typing import List, Tuple, Union
+from .skill_taxonomy import get_skill_taxonomy, normalize_text
+
+# Parsed query nodes: ("term", skill_key) | ("and", [nodes]) | ("or", [nodes]) | ("not", node)
+SkillQuery = Tuple[str, Union[str, list, tuple]]
+
+MAX_QUERY_TERMS = 50
+
+TOKEN_PATTERN = re.compile(r'\s*(?:(?P<lparen>\()|(?P<rparen>\))|(?P<comma>,)|(?P<bang>!)|"(?P<quoted>[^"]*)"|(?P<word>[^\s(),"!][^\s(),"]*))')
+OPERATORS = {"and", "or", "not", "&&", "||"}
+
+class SkillQueryError(ValueError):
+    """Raised for malformed skill search queries"""
+    pass
+
+def skill_key(skill: str) -> str:
+    """Index key for a skill: its lowercased canonical name"""
+    return normalize_text(get_skill_taxonomy().canonicalize(skill)).strip()
+
+def _tokenize(query: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = TOKEN_PATTERN.match(query, position)
+        if not match or match.end() == position:
+            raise SkillQueryError(f"Unexpected character at position {position}")
+        position = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "word" and value.lower() in OPERATORS:
+            tokens.append(("op", {"&&": "and", "||": "or"}.get(value, value.lower())))
+        elif kind == "bang":
+            # Also when written against the skill, as in "!php"
+            tokens.append(("op", "not"))
+        elif kind == "comma":
+            # Comma-separated skills are all required
+            tokens.append(("op", "and"))
+        elif kind in ("word", "quoted"):
+            if value.strip():
+                tokens.append(("term", value.strip()))
+        else:
+            tokens.append((kind, value))
+    return tokens
+
+class _Parser:
+    """Recursive descent: or_expr := and_expr (OR and_expr)*; and_expr := not_expr ([AND] not_expr)*"""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+        self.terms = 0
+
+    def peek(self) -> Tuple[str, str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else ("end", "")
+
+    def take(self) -> Tuple[str, str]:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse_or(self) -> SkillQuery:
+        nodes = [self.parse_and()]
+        while self.peek() == ("op", "or"):
+            self.take()
+            nodes.append(self.parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and(self) -> SkillQuery:
+        nodes = [self.parse_not()]
+        while True:
+            token = self.peek()
+            if token == ("op", "and"):
+                self.take()
+            elif not (token[0] in ("term", "lparen") or token == ("op", "not")):
+                break
+            nodes.append(self.parse_not())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_not(self) -> SkillQuery:
+        if self.peek() == ("op", "not"):
+            self.take()
+            return ("not", self.parse_not())
+        return self.parse_atom()
+
+    def parse_atom(self) -> SkillQuery:
+        kind, value = self.take()
+        if kind == "term":
+            self.terms += 1
+            if self.terms > MAX_QUERY_TERMS:
+                raise SkillQueryError(f"Too many skills in query (maximum {MAX_QUERY_TERMS})")
+            return ("term", skill_key(value))
+        if kind == "lparen":
+            node = self.parse_or()
+            if self.take()[0] != "rparen":
+                raise SkillQueryError("Missing closing parenthesis")
+            return node
+        raise SkillQueryError(f"Expected a skill, got {value or 'end of query'!r}")
+
+def parse_skill_query(query: str) -> SkillQuery:
+    """Parse a boolean skill query such as 'kubernetes AND (go OR rust) NOT java'.
+
+    Adjacent terms and commas mean AND; multi-word skills can be quoted.
+    Terms are mapped to canonical taxonomy names.
+    """
+    tokens = _tokenize(query or "")
+    if not tokens:
+        raise SkillQueryError("Empty skill query")
+    parser = _Parser(tokens)
+    node = parser.parse_or()
+    if parser.peek()[0] != "end":
+        raise SkillQueryError(f"Unexpected {parser.peek()[1]!r}")
+    return node
+
+def positive_terms(node: SkillQuery, negated: bool = False) -> List[str]:
+    """Skill keys the query asks for (not under a NOT), used to rank by overlap"""
+    kind, value = node
+    if kind == "term":
+        return [] if negated else [value]
+    if kind == "not":
+        return positive_terms(value, not negated)
+    terms = []
+    for child in value:
+        terms.extend(term for term in positive_terms(child, negated) if term not in terms)
+    return terms
@@ -0,0 +1,162 @@
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional
+from ..config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).resolve().parent.parent / "data" / "skill_taxonomy.json"
+
+# A term must not be glued to surrounding letters/digits ("java" in "javascript", "c" in "c++")
+BOUNDARY_BEFORE = r"(?<![a-z0-9])"
+BOUNDARY_AFTER = r"(?![a-z0-9+#])"
+# Case-sensitive terms are also kept apart from hyphenated words ("Go-to-market")
+EXACT_BOUNDARY_BEFORE = r"(?<![A-Za-z0-9])"
+EXACT_BOUNDARY_AFTER = r"(?![A-Za-z0-9+#-])"
+SENTENCE_ENDINGS = (". ", "! ", "? ")
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so multi-word terms match across line breaks"""
+    return WHITESPACE_PATTERN.sub(" ", text.lower())
+
+def build_trie_pattern(terms: Iterable[str]) -> str:
+    """Build a regex alternation shaped like a trie, so each position is tried once per prefix
+    instead of once per term, and longer terms win over their prefixes"""
+    trie: Dict[str, Any] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 and "" not in node else f"(?:{'|'.join(branches)})"
+        return f"{body}?" if "" in node else body
+
+    return build(trie)
+
+class TermMatcher:
+    """Finds canonical names for a set of surface terms in a single linear scan.
+
+    `surface_forms` are lowercased and match in any case. `exact_forms` are
+    terms that are also everyday words ("go", "spark", "ml"): they match only
+    as written ("Go", "Spark", "ML"), and a capitalized one not at the start
+    of a sentence, where any word is capitalized.
+    """
+
+    def __init__(self, surface_forms: Dict[str, str], exact_forms: Optional[Dict[str, str]] = None):
+        self.surface_forms = surface_forms
+        self.exact_forms = exact_forms or {}
+        self.pattern = None
+        self.exact_pattern = None
+        if surface_forms:
+            self.pattern = re.compile(
+                BOUNDARY_BEFORE + "(" + build_trie_pattern(surface_forms) + ")" + BOUNDARY_AFTER
+            )
+        if self.exact_forms:
+            self.exact_pattern = re.compile(
+                EXACT_BOUNDARY_BEFORE + "(" + build_trie_pattern(self.exact_forms) + ")" + EXACT_BOUNDARY_AFTER
+            )
+
+    def find(self, text: str) -> List[str]:
+        """Return canonical names in order of first appearance"""
+        if not text:
+            return []
+        text = WHITESPACE_PATTERN.sub(" ", text)
+        matches = []
+        if self.pattern:
+            matches.extend(
+                (match.start(), self.surface_forms[match.group(1)]) for match in self.pattern.finditer(text.lower())
+            )
+        if self.exact_pattern:
+            for match in self.exact_pattern.finditer(text):
+                term = match.group(1)
+                if term[1:].islower() and text[max(match.start() - 2, 0):match.start()] in SENTENCE_ENDINGS:
+                    continue
+                matches.append((match.start(), self.exact_forms[term]))
+        found: Dict[str, None] = {}
+        for _, canonical in sorted(matches, key=lambda match: match[0]):
+            found.setdefault(canonical, None)
+        return list(found)
+
+def _spelling_variants(key: str) -> List[str]:
+    """The term plus its spaced and hyphenated spellings if it is a ".js" name ("node.js" -> "node js", "node-js")"""
+    for suffix in (".js", "js"):
+        if key.endswith(suffix) and len(key) > len(suffix) + 1:
+            stem = key[:-len(suffix)].rstrip(" -")
+            return [key, f"{stem} js", f"{stem}-js"]
+    return [key]
+
+def _surface_forms(entries: Dict[str, List[str]], ambiguous: Iterable[str]) -> Dict[str, str]:
+    """Map every lowercased synonym (and the canonical name, unless ambiguous) to its canonical name.
+
+    ".js" names also get their spaced spellings, which the "js" synonym of
+    JavaScript would otherwise claim.
+    """
+    ambiguous = set(ambiguous)
+    forms: Dict[str, str] = {}
+    for canonical, synonyms in entries.items():
+        terms = list(synonyms) if canonical in ambiguous else [canonical, *synonyms]
+        for term in terms:
+            for key in _spelling_variants(normalize_text(term).strip()):
+                if key and key not in forms:
+                    forms[key] = canonical
+    return forms
+
+def _split_exact_forms(forms: Dict[str, str], case_sensitive: Iterable[str]) -> Dict[str, str]:
+    """Move case-sensitive terms out of `forms`, returning them keyed by their exact spelling"""
+    exact: Dict[str, str] = {}
+    for term in case_sensitive:
+        key = normalize_text(term).strip()
+        if key in forms:
+            exact[term] = forms.pop(key)
+    return exact
+
+class SkillTaxonomy:
+    """Skill and certification vocabulary compiled into single-pass matchers"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.version = str(data.get("version", "0"))
+        ambiguous = data.get("ambiguous", [])
+        case_sensitive = data.get("case_sensitive", [])
+        skill_forms = _surface_forms(data.get("skills", {}), ambiguous)
+        cert_forms = _surface_forms(data.get("certifications", {}), ambiguous)
+
+        # Lookup for user-supplied names, including ambiguous and case-sensitive terms
+        self._canonical = {**cert_forms, **skill_forms}
+
+        self.skills = TermMatcher(skill_forms, _split_exact_forms(skill_forms, case_sensitive))
+        self.certifications = TermMatcher(cert_forms, _split_exact_forms(cert_forms, case_sensitive))
+
+        for canonical in [*data.get("skills", {}), *data.get("certifications", {})]:
+            self._canonical.setdefault(normalize_text(canonical).strip(), canonical)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "SkillTaxonomy":
+        """Load a taxonomy JSON file ({"version", "ambiguous", "case_sensitive", "skills", "certifications"})"""
+        taxonomy_path = Path(path) if path else DEFAULT_TAXONOMY_PATH
+        with open(taxonomy_path, encoding="utf-8") as file:
+            taxonomy = cls(json.load(file))
+        logger.info(
+            f"Loaded skill taxonomy v{taxonomy.version} from {taxonomy_path}: "
+            f"{len(taxonomy.skills.surface_forms) + len(taxonomy.skills.exact_forms)} skill terms, "
+            f"{len(taxonomy.certifications.surface_forms)} certification terms"
+        )
+        return taxonomy
+
+    def canonicalize(self, term: str) -> str:
+        """Return the canonical name for a skill or certification, or the input if unknown"""
+        return self._canonical.get(normalize_text(term).strip(), term.strip())
+
+@lru_cache(maxsize=1)
+def get_skill_taxonomy() -> SkillTaxonomy:
+    """Load and compile the configured taxonomy once per process"""
+    return SkillTaxonomy.load(settings.skill_taxonomy_path)
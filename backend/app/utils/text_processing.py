@@ -0,0 +1,40 @@
+import json
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List, Any
+
+# Keeps tech tokens intact: "c++", "c#", "node.js", "ci/cd" split only on real separators
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by for from had has have he her his i in into is it its me my of on or our
+she so such than that the their them then there these they this to was we were which while who will with
+you your
+""".split())
+
+COMPRESSION_LEVEL = 6
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split into tokens and drop stopwords"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+def term_frequencies(tokens: List[str]) -> Dict[str, int]:
+    """Count occurrences of each token"""
+    return dict(Counter(tokens))
+
+def compress_text(text: str) -> bytes:
+    """Compress text for storage"""
+    return zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL)
+
+def decompress_text(data: bytes) -> str:
+    """Inverse of compress_text"""
+    return zlib.decompress(data).decode("utf-8")
+
+def compress_json(value: Any) -> bytes:
+    """Serialize and compress a JSON value for storage"""
+    return compress_text(json.dumps(value, separators=(",", ":")))
+
+def decompress_json(data: bytes) -> Any:
+    """Inverse of compress_json"""
+    return json.loads(decompress_text(data))
@@ -0,0 +1,97 @@
+import re
+import textwrap
+from typing import Dict, List, Sequence
+
+# Close to the pre-tokenization of OpenAI's BPE encodings: contractions, letter runs
+# (with their leading space), up to three digits, punctuation runs, whitespace
+TOKEN_PATTERN = re.compile(r"'(?:[sdmt]|ll|ve|re)| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+(?!\S)|\s+")
+# Chat format tokens around each message and before the reply
+MESSAGE_OVERHEAD = 4
+REPLY_OVERHEAD = 3
+ELLIPSIS = " …"
+
+def piece_tokens(piece: str) -> int:
+    """Approximate BPE tokens in one pre-tokenized piece, erring high"""
+    word = piece.strip()
+    if not word:
+        return 1
+    if not word.isascii():
+        # Non-Latin scripts run about a token per character
+        return len(word)
+    if word[0].isalpha():
+        # Common words are one token; long or rare ones split every few letters
+        return 1 + len(word) // 6
+    if word[0].isdigit():
+        return 1
+    return (len(word) + 1) // 2
+
+def count_tokens(text: str) -> int:
+    """Approximate token count of text, without downloading a tokenizer"""
+    if not text:
+        return 0
+    return sum(piece_tokens(piece) for piece in TOKEN_PATTERN.findall(text))
+
+def count_message_tokens(messages: Sequence[Dict[str, str]]) -> int:
+    """Approximate prompt tokens of a chat completion request"""
+    return sum(count_tokens(message["content"]) + MESSAGE_OVERHEAD for message in messages) + REPLY_OVERHEAD
+
+def compact(text: str) -> str:
+    """Dedent, strip trailing spaces, collapse runs of spaces and blank lines"""
+    lines = [re.sub(r"(?<=\S)[ \t]{2,}", " ", line.rstrip()) for line in textwrap.dedent(text).splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+def truncate(text: str, max_tokens: int) -> str:
+    """Longest word-aligned prefix of text within max_tokens, marked with an ellipsis if anything was cut.
+
+    Empty if not even the first word fits beside the ellipsis (e.g. a zero or negative budget).
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    budget = max_tokens - count_tokens(ELLIPSIS)
+    kept: List[str] = []
+    for piece in TOKEN_PATTERN.findall(text):
+        budget -= piece_tokens(piece)
+        if budget < 0:
+            break
+        kept.append(piece)
+    prefix = "".join(kept).rstrip()
+    return prefix + ELLIPSIS if prefix else ""
+
+def truncate_items(items: Sequence[str], max_tokens: int, separator: str = ", ") -> List[str]:
+    """Leading items that fit in max_tokens when joined, plus a count of the ones left out"""
+    kept: List[str] = []
+    used = 0
+    for index, item in enumerate(items):
+        cost = count_tokens(item) + (count_tokens(separator) if kept else 0)
+        if used + cost > max_tokens:
+            shortened = truncate(item, max_tokens) if not kept else ""
+            if shortened:
+                kept.append(shortened)
+                index += 1
+            if index < len(items):
+                kept.append(f"and {len(items) - index} more")
+            break
+        kept.append(item)
+        used += cost
+    return kept
+
+class PromptBudget:
+    """Splits a model's context window between a prompt and its completion.
+
+    The completion gets up to `max_completion_tokens`, less if the prompt
+    leaves less room; a prompt that leaves under `min_completion_tokens`
+    is too long and has to be cut by `overflow()` tokens.
+    """
+
+    def __init__(self, context_tokens: int, max_completion_tokens: int, min_completion_tokens: int):
+        self.context_tokens = context_tokens
+        self.max_completion_tokens = max_completion_tokens
+        self.min_completion_tokens = min(min_completion_tokens, max_completion_tokens)
+
+    def overflow(self, prompt_tokens: int) -> int:
+        """Tokens the prompt must lose to leave the minimum completion room"""
+        return max(0, prompt_tokens + self.min_completion_tokens - self.context_tokens)
+
+    def completion_tokens(self, prompt_tokens: int) -> int:
+        """max_tokens for a completion after this prompt"""
+        return max(0, min(self.max_completion_tokens, self.context_tokens - prompt_tokens))
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal, create_tables
+from app.services.scoring_service import ScoringService
+
+def backfill_current_scores():
+    create_tables()
+    db = SessionLocal()
+    
+    try:
+        print("Copying latest scores onto applications without a current score...")
+        filled = ScoringService().backfill_current_scores(db)
+        print(f"Backfilled current scores for {filled} applications")
+    except Exception as e:
+        print(f"Error backfilling current scores: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    backfill_current_scores()
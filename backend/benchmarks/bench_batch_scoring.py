@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized cohort scoring (BatchScoringService) versus scoring
+applications one at a time with ScoringService.build_score.
+
+Before timing, every score record and status produced by the batch path is
+checked field by field against the per-application path; any difference
+aborts the run.
+
+With --semantic-weight the cohort also gets random TF-IDF resume and job
+description vectors, so the semantic similarity component is compared and
+timed as well.
+
+Usage: python benchmarks/bench_batch_scoring.py [--candidates N ...] [--seed S] [--semantic-weight W]
+"""
+
+import argparse
+import random
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.job import Job
+from app.models.application import Application
+from app.services.scoring_service import ScoringService
+from app.services.batch_scoring import BatchScoringService
+from app.services.semantic_match import SemanticInputs
+from app.utils.skill_taxonomy import get_skill_taxonomy
+from app.utils.semantic_vectors import hashed_frequencies, tf_vector, tfidf_vector
+
+SCORE_FIELDS = [
+    "match_score", "ats_score", "final_score", "skills_match", "experience_match", "education_match",
+    "certification_match", "semantic_match", "ats_format_score", "ats_keywords_score", "ats_structure_score",
+    "scoring_details", "ai_feedback", "inputs_hash"
+]
+DEGREES = ["Bachelor of Science", "Master of Science", "MBA", "PhD in Physics", "B.Tech", ""]
+
+def random_features(words, rng: random.Random):
+    """Hashed frequencies of a random bag of words"""
+    return hashed_frequencies({word: rng.randint(1, 5) for word in rng.sample(words, rng.randint(20, 200))})
+
+def make_cohort(count: int, rng: random.Random):
+    """A job plus count applications with varied (and some empty or odd-cased) parsed data,
+    and the TF-IDF vectors of the job and the resumes (some missing)"""
+    taxonomy = get_skill_taxonomy()
+    skills = sorted(set(taxonomy.skills.surface_forms.values()))
+    certifications = sorted(set(taxonomy.certifications.surface_forms.values()))
+
+    job_skills = rng.sample(skills, 8)
+    # Duplicates and mixed case in the job's list exercise the denominator rules
+    job = Job(id=1, key_skills=job_skills + [job_skills[0].upper()], certifications=rng.sample(certifications, 3))
+
+    words = [f"term{index}" for index in range(5000)] + [skill.lower() for skill in skills]
+    document_counts = {feature: rng.randint(1, 1000) for feature in hashed_frequencies({word: 1 for word in words})}
+    job_features = random_features(words, rng)
+    job.description_vector = tf_vector(job_features)
+    resume_vectors = {}
+
+    applications = []
+    for index in range(count):
+        if rng.random() < 0.95:
+            resume_vectors[f"resume-{index}"] = tfidf_vector(random_features(words, rng), document_counts, 1000)
+        pool = job_skills + rng.sample(skills, 20)
+        applications.append(Application(
+            id=index + 1,
+            job_id=1,
+            resume_filename=rng.choice(["resume.pdf", "resume.DOCX", "resume.doc", "resume.txt"]),
+            resume_hash=f"resume-{index}",
+            parsed_skills=rng.choice([None, []]) if rng.random() < 0.1 else [
+                rng.choice([s, s.lower(), s.upper()]) for s in rng.sample(pool, rng.randint(1, 15))
+            ],
+            parsed_experience=[{"title": "Engineer"}] * rng.randint(0, 4),
+            parsed_education=[{"degree": rng.choice(DEGREES)} for _ in range(rng.randint(0, 2))],
+            parsed_certifications=rng.sample(job.certifications + certifications[:5], rng.randint(0, 3))
+        ))
+    return job, applications, SemanticInputs(tfidf_vector(job_features, document_counts, 1000), resume_vectors)
+
+def check_equivalence(job, applications, semantic, scoring_service, batch_service) -> None:
+    batch = batch_service.build_scores(job, applications, semantic)
+    for application, (score, status) in zip(applications, batch):
+        expected = scoring_service.build_score(job, application, semantic)
+        expected_status = scoring_service.determine_candidate_status(expected.final_score)[1]
+        for field in SCORE_FIELDS:
+            got, want = getattr(score, field), getattr(expected, field)
+            if got != want or type(got) is not type(want):
+                raise AssertionError(f"Application {application.id}: {field} = {got!r}, expected {want!r}")
+        if status != expected_status:
+            raise AssertionError(f"Application {application.id}: status {status}, expected {expected_status}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--semantic-weight", type=float, default=None, help="Override SEMANTIC_SCORE_WEIGHT")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    scoring_service = ScoringService()
+    if args.semantic_weight is not None:
+        scoring_service.semantic_weight = args.semantic_weight
+    batch_service = BatchScoringService(scoring_service)
+
+    print(f"{'candidates':>10} {'per-application (ms)':>21} {'batch (ms)':>11} {'speedup':>8} {'batch compute only (ms)':>24}")
+    for count in args.candidates:
+        job, applications, semantic = make_cohort(count, rng)
+        check_equivalence(job, applications, semantic, scoring_service, batch_service)
+
+        start = time.perf_counter()
+        for application in applications:
+            score = scoring_service.build_score(job, application, semantic)
+            scoring_service.determine_candidate_status(score.final_score)
+        single_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        batch_service.build_scores(job, applications, semantic)
+        batch_ms = (time.perf_counter() - start) * 1000
+
+        # Array work alone, without building ApplicationScore objects
+        start = time.perf_counter()
+        batch_service.compute(job, applications, semantic)
+        compute_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{count:>10} {single_ms:>21.2f} {batch_ms:>11.2f} {single_ms / batch_ms:>7.1f}x {compute_ms:>24.2f}")
+
+    print("\nBatch results identical to per-application scoring for all cohorts")
+
+if __name__ == "__main__":
+    main()
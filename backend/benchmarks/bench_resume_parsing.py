@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark: resume parsing cost per stage and end-to-end throughput.
+
+Times each stage of parse_resume separately (text extraction, skills,
+experience, education, certifications, calculate_ats_score) on a synthetic
+corpus and reports p50/p95 per stage, then measures files/second through
+ResumeParserPool with 1..N worker processes. Results are written as JSON so
+runs can be compared.
+
+Usage: python benchmarks/bench_resume_parsing.py [--count N] [--max-workers N]
+                                                 [--corpus DIR] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Callable
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.resume_parser import (
+    extract_text_from_pdf, extract_text_from_docx, extract_skills, extract_experience,
+    extract_education, extract_certifications, calculate_ats_score, parse_resume, get_parser_version
+)
+from app.utils.parser_pool import ResumeParserPool
+from resume_corpus import generate_corpus
+
+def percentile(values: List[float], q: float) -> float:
+    """Linear-interpolated percentile of values, q in [0, 100]"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(samples_ms),
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "mean_ms": round(sum(samples_ms) / len(samples_ms), 3) if samples_ms else 0.0,
+        "total_ms": round(sum(samples_ms), 3)
+    }
+
+def timed(func: Callable, *args) -> tuple:
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def bench_stages(corpus: List[Dict[str, Any]], max_pages: int) -> Dict[str, Any]:
+    """Time each parse stage in-process, one document at a time"""
+    samples: Dict[str, List[float]] = {
+        "extract_text_pdf": [], "extract_text_docx": [], "skills": [], "experience": [],
+        "education": [], "certifications": [], "ats_score": [], "parse_resume": []
+    }
+    for entry in corpus:
+        if entry["format"] == "pdf":
+            text, elapsed = timed(extract_text_from_pdf, entry["path"], max_pages)
+            samples["extract_text_pdf"].append(elapsed)
+        else:
+            text, elapsed = timed(extract_text_from_docx, entry["path"])
+            samples["extract_text_docx"].append(elapsed)
+
+        samples["skills"].append(timed(extract_skills, text)[1])
+        samples["experience"].append(timed(extract_experience, text)[1])
+        samples["education"].append(timed(extract_education, text)[1])
+        samples["certifications"].append(timed(extract_certifications, text)[1])
+        samples["ats_score"].append(timed(calculate_ats_score, text, entry["filename"])[1])
+        samples["parse_resume"].append(timed(parse_resume, entry["path"], entry["filename"], max_pages)[1])
+
+    return {stage: summarize(values) for stage, values in samples.items() if values}
+
+def bench_throughput(corpus: List[Dict[str, Any]], workers: int, max_pages: int) -> Dict[str, Any]:
+    """Parse the whole corpus through a pool of the given size and report files/second"""
+    pool = ResumeParserPool(workers=workers, max_pages=max_pages)
+    try:
+        # Start the processes (and load the taxonomy) outside the timed region
+        pool.parse_sync(corpus[0]["path"], corpus[0]["filename"])
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            start = time.perf_counter()
+            list(executor.map(lambda entry: pool.parse_sync(entry["path"], entry["filename"]), corpus))
+            elapsed = time.perf_counter() - start
+    finally:
+        pool.shutdown()
+    return {
+        "workers": workers,
+        "files": len(corpus),
+        "seconds": round(elapsed, 3),
+        "files_per_second": round(len(corpus) / elapsed, 2)
+    }
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)), text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=60, help="Resumes to generate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-doc-pages", type=int, default=4, help="Largest generated resume, in pages")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="Largest pool to measure")
+    parser.add_argument("--corpus", default=None, help="Reuse/keep the corpus in this directory")
+    parser.add_argument("--output", default=None, help="JSON results file (default: print to stdout)")
+    args = parser.parse_args()
+
+    max_pages = 20
+    with tempfile.TemporaryDirectory() as temp_dir:
+        corpus_dir = args.corpus or temp_dir
+        corpus = generate_corpus(corpus_dir, args.count, args.seed, args.max_doc_pages)
+
+        stages = bench_stages(corpus, max_pages)
+        for stage, stats in stages.items():
+            print(f"{stage:>18}: p50 {stats['p50_ms']:>9.3f} ms   p95 {stats['p95_ms']:>9.3f} ms", file=sys.stderr)
+
+        worker_counts = sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i < args.max_workers], args.max_workers})
+        throughput = []
+        for workers in worker_counts:
+            result = bench_throughput(corpus, workers, max_pages)
+            throughput.append(result)
+            print(f"{workers:>3} workers: {result['files_per_second']:>8.2f} files/s", file=sys.stderr)
+
+    results = {
+        "benchmark": "resume_parsing",
+        "timestamp": datetime.utcnow().isoformat(),
+        "git_revision": git_revision(),
+        "parser_version": get_parser_version(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "corpus": {
+            "count": len(corpus),
+            "seed": args.seed,
+            "pdf": sum(1 for entry in corpus if entry["format"] == "pdf"),
+            "docx": sum(1 for entry in corpus if entry["format"] == "docx"),
+            "pages": sum(entry["pages"] for entry in corpus),
+            "bytes": sum(entry["bytes"] for entry in corpus)
+        },
+        "stages": stages,
+        "throughput": throughput
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: what-if scoring simulation over stored score components.
+
+Builds a throwaway SQLite database with N scored applications in one company,
+then times ScoreSimulatorService loading the components and evaluating 1, 10
+and 50 candidate configs. The simulated "current" statuses are checked
+against ScoringService.determine_candidate_status on the stored final scores.
+
+Usage: python benchmarks/bench_score_simulation.py [--applications N] [--jobs J]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import Company, User, Job, Application
+from app.services.scoring_service import ScoringService
+from app.services.score_simulator import ScoreSimulatorService, STATUSES
+
+def populate(session, applications: int, jobs: int, rng: random.Random) -> None:
+    scoring_service = ScoringService()
+    session.execute(insert(Company), [{"id": 1, "name": "company"}])
+    session.execute(insert(User), [{"id": 1, "email": "bench@example.com", "full_name": "Bench", "hashed_password": "x", "user_type": "admin"}])
+    session.execute(insert(Job), [
+        {"id": j + 1, "title": f"job {j}", "description": "x", "company_id": 1, "created_by": 1, "status": "published"}
+        for j in range(jobs)
+    ])
+
+    chunk = 20_000
+    for start in range(0, applications, chunk):
+        rows = []
+        for application_id in range(start + 1, min(start + chunk, applications) + 1):
+            match_score = rng.choice([0.0, rng.uniform(20, 100)])
+            ats_score = rng.uniform(30, 100)
+            final_score = scoring_service.calculate_final_score({"match": match_score}, {"ats": ats_score})
+            rows.append({
+                "id": application_id, "reference_number": f"REF-{application_id}", "full_name": f"candidate {application_id}",
+                "email": "x@example.com", "resume_filename": "r.pdf", "resume_path": "r.pdf", "job_id": rng.randint(1, jobs),
+                "match_score": match_score, "ats_score": ats_score, "final_score": final_score,
+                "status": scoring_service.determine_candidate_status(final_score)[1], "processing_status": "done"
+            })
+        session.execute(insert(Application), rows)
+    session.commit()
+
+def random_configs(count: int, rng: random.Random):
+    configs = []
+    for index in range(count):
+        match_weight = round(rng.uniform(0.2, 0.8), 2)
+        shortlist = rng.randint(70, 90)
+        configs.append({
+            "name": f"config_{index + 1}",
+            "match_score_weight": match_weight,
+            "ats_score_weight": round(1 - match_weight, 2),
+            "semantic_score_weight": 0.0,
+            "shortlist_threshold": shortlist,
+            "requalify_threshold": rng.randint(40, shortlist)
+        })
+    return configs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applications", type=int, default=100_000)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(temp_dir, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+
+        start = time.perf_counter()
+        populate(session, args.applications, args.jobs, rng)
+        print(f"Populated {args.applications} applications in {time.perf_counter() - start:.1f}s\n")
+
+        service = ScoreSimulatorService()
+        start = time.perf_counter()
+        components = service.load_components(session, company_id=1)
+        load_ms = (time.perf_counter() - start) * 1000
+        print(f"Loaded components in {load_ms:.1f} ms")
+
+        result = service.simulate(session, components, random_configs(1, rng))
+        stored = {status: 0 for status in STATUSES}
+        for (status,) in session.query(Application.status):
+            stored[status] += 1
+        if result["current"]["counts"] != stored:
+            raise AssertionError(f"Simulated current counts {result['current']['counts']} differ from stored {stored}")
+
+        print(f"{'configs':>8} {'simulate (ms)':>14} {'load + simulate (ms)':>21}")
+        for count in (1, 10, 50):
+            configs = random_configs(count, rng)
+            start = time.perf_counter()
+            service.simulate(session, components, configs)
+            simulate_ms = (time.perf_counter() - start) * 1000
+            print(f"{count:>8} {simulate_ms:>14.1f} {load_ms + simulate_ms:>21.1f}")
+
+        print("\nSimulated current statuses match the stored statuses")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: taxonomy-backed single-pass skill/certification extraction
+versus the original per-pattern re.findall implementation.
+
+Usage: python benchmarks/bench_skill_extraction.py [--repeat N]
+"""
+
+import argparse
+import random
+import re
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.resume_parser import extract_skills, extract_certifications
+from app.utils.skill_taxonomy import get_skill_taxonomy, TermMatcher
+
+# Original implementation, kept here as the baseline
+LEGACY_SKILL_PATTERNS = [
+    r'\b(?:Python|Java|JavaScript|TypeScript|C\+\+|C#|PHP|Ruby|Go|Rust|Swift|Kotlin)\b',
+    r'\b(?:React|Angular|Vue|Node\.js|Express|Django|Flask|Spring|Laravel)\b',
+    r'\b(?:MySQL|PostgreSQL|MongoDB|Redis|Elasticsearch|Cassandra)\b',
+    r'\b(?:AWS|Azure|GCP|Docker|Kubernetes|Jenkins|Git|GitHub)\b',
+    r'\b(?:HTML|CSS|Bootstrap|Tailwind|Sass|Less)\b',
+    r'\b(?:Machine Learning|AI|Data Science|Analytics|Statistics)\b',
+    r'\b(?:Linux|Unix|Windows|MacOS)\b',
+    r'\b(?:API|REST|GraphQL|Microservices|DevOps|Agile|Scrum)\b'
+]
+
+LEGACY_CERT_PATTERNS = [
+    r'\b(?:AWS Certified|Azure Certified|Google Cloud Certified)\b',
+    r'\b(?:PMP|Scrum Master|Product Owner)\b',
+    r'\b(?:CISSP|CompTIA|Cisco|Microsoft Certified)\b'
+]
+
+def legacy_extract(text: str):
+    skills = []
+    for pattern in LEGACY_SKILL_PATTERNS:
+        skills.extend(re.findall(pattern, text, re.IGNORECASE))
+    certifications = []
+    for pattern in LEGACY_CERT_PATTERNS:
+        certifications.extend(re.findall(pattern, text, re.IGNORECASE))
+    return list(set(skills)), list(set(certifications))
+
+def taxonomy_extract(text: str):
+    return extract_skills(text), extract_certifications(text)
+
+FILLER = (
+    "Led a cross-functional team delivering customer facing features on schedule. "
+    "Improved reliability of the platform and reduced operating costs significantly. "
+    "Worked closely with stakeholders to gather requirements and plan releases. "
+)
+
+def make_resume(target_chars: int, terms, rng: random.Random) -> str:
+    """Build a resume-like text of roughly target_chars with skills sprinkled in"""
+    parts = []
+    size = 0
+    while size < target_chars:
+        line = FILLER + " Used " + ", ".join(rng.sample(terms, 5)) + ".\n"
+        parts.append(line)
+        size += len(line)
+    return "".join(parts)
+
+def time_call(func, text: str, repeat: int) -> float:
+    """Best-of-repeat wall time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    taxonomy = get_skill_taxonomy()
+    terms = sorted(taxonomy.skills.surface_forms)
+
+    print(f"Taxonomy v{taxonomy.version}: {len(taxonomy.skills.surface_forms)} skill terms, "
+          f"{len(taxonomy.certifications.surface_forms)} certification terms\n")
+
+    print(f"{'resume size':>12} {'legacy (ms)':>12} {'taxonomy (ms)':>14} {'legacy terms':>13} {'taxonomy terms':>15}")
+    for size in (5_000, 50_000, 500_000):
+        text = make_resume(size, terms, rng)
+        legacy_ms = time_call(legacy_extract, text, args.repeat)
+        taxonomy_ms = time_call(taxonomy_extract, text, args.repeat)
+        legacy_found = sum(len(found) for found in legacy_extract(text))
+        taxonomy_found = sum(len(found) for found in taxonomy_extract(text))
+        print(f"{len(text):>12} {legacy_ms:>12.2f} {taxonomy_ms:>14.2f} {legacy_found:>13} {taxonomy_found:>15}")
+
+    # Scan cost should stay flat as the vocabulary grows
+    print(f"\n{'taxonomy terms':>15} {'scan 50k chars (ms)':>20}")
+    text = make_resume(50_000, terms, rng)
+    for count in (50, 200, len(terms)):
+        subset = {term: taxonomy.skills.surface_forms[term] for term in terms[:count]}
+        matcher = TermMatcher(subset)
+        print(f"{count:>15} {time_call(matcher.find, text, args.repeat):>20.2f}")
+
+if __name__ == "__main__":
+    main()
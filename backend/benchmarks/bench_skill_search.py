@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: boolean skill search over the application_skills inverted index.
+
+Builds a throwaway SQLite database with N synthetic applications spread over
+several companies, then times SkillIndexService.search for a set of queries
+(company-scoped, as HR users run them). Postgres with the same indexes
+behaves similarly or better.
+
+Usage: python benchmarks/bench_skill_search.py [--applications N] [--repeat R]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import Company, User, Job, Application, ApplicationSkill
+from app.services.skill_index import SkillIndexService
+from app.utils.skill_query import skill_key
+from app.utils.skill_taxonomy import get_skill_taxonomy
+
+QUERIES = [
+    "kubernetes AND go NOT java",
+    "python, docker",
+    "(react OR vue) AND typescript",
+    "\"machine learning\" AND NOT (java OR c#)",
+    "rust",
+]
+
+def populate(session, applications: int, companies: int, rng: random.Random) -> None:
+    skills = sorted(set(get_skill_taxonomy().skills.surface_forms.values()))
+    popular = ["Kubernetes", "Go", "Java", "Python", "Docker", "React", "TypeScript", "Machine Learning", "Rust", "Vue.js"]
+    skills = popular + [skill for skill in skills if skill not in popular]
+    # Popular skills show up far more often, like in real resumes
+    weights = [1.0 / (rank + 1) for rank in range(len(skills))]
+    keys = {skill: skill_key(skill) for skill in skills}
+
+    session.execute(insert(Company), [{"id": c + 1, "name": f"company {c}"} for c in range(companies)])
+    session.execute(insert(User), [{"id": 1, "email": "bench@example.com", "full_name": "Bench", "hashed_password": "x", "user_type": "admin"}])
+    session.execute(insert(Job), [
+        {"id": c + 1, "title": f"job {c}", "description": "x", "company_id": c + 1, "created_by": 1, "status": "published"}
+        for c in range(companies)
+    ])
+
+    chunk = 20_000
+    for start in range(0, applications, chunk):
+        app_rows, skill_rows = [], []
+        for application_id in range(start + 1, min(start + chunk, applications) + 1):
+            job_id = rng.randint(1, companies)
+            # One skill per index key, as SkillIndexService.skill_rows does
+            chosen = {keys[skill]: skill for skill in rng.choices(skills, weights=weights, k=rng.randint(3, 15))}
+            app_rows.append({
+                "id": application_id, "reference_number": f"REF-{application_id}", "full_name": "x", "email": "x@example.com",
+                "resume_filename": "r.pdf", "resume_path": "r.pdf", "job_id": job_id, "parsed_skills": sorted(chosen.values()),
+                "final_score": rng.uniform(0, 100), "processing_status": "done", "status": "under_review"
+            })
+            skill_rows.extend(
+                {"application_id": application_id, "skill_key": key, "skill": skill, "job_id": job_id, "company_id": job_id}
+                for key, skill in chosen.items()
+            )
+        session.execute(insert(Application), app_rows)
+        session.execute(insert(ApplicationSkill), skill_rows)
+    session.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applications", type=int, default=200_000)
+    parser.add_argument("--companies", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(temp_dir, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+
+        start = time.perf_counter()
+        populate(session, args.applications, args.companies, random.Random(args.seed))
+        print(f"Populated {args.applications} applications in {time.perf_counter() - start:.1f}s\n")
+
+        service = SkillIndexService()
+        print(f"{'query':<45} {'matches':>8} {'best (ms)':>10}")
+        for query in QUERIES:
+            best = float("inf")
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                total, rows, _ = service.search(session, query, company_id=1, limit=50)
+                best = min(best, time.perf_counter() - started)
+                session.expunge_all()
+            print(f"{query:<45} {total:>8} {best * 1000:>10.2f}")
+
+if __name__ == "__main__":
+    main()
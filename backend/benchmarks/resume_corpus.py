@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Synthetic resume corpus generator for parser benchmarks.
+
+Writes realistic PDF and DOCX resumes that vary in page count, which sections
+are present (and whether they have headers), and skill density. PDFs are
+written directly (single-font text pages) so no PDF library is required.
+
+Usage: python benchmarks/resume_corpus.py OUTPUT_DIR [--count N] [--seed S]
+"""
+
+import argparse
+import json
+import random
+import sys
+import os
+from typing import Dict, List, Any
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+from app.utils.skill_taxonomy import get_skill_taxonomy
+
+FIRST_NAMES = ["Jane", "John", "Priya", "Wei", "Carlos", "Amara", "Lukas", "Sofia", "Omar", "Hana", "Noah", "Fatima"]
+LAST_NAMES = ["Doe", "Smith", "Sharma", "Chen", "Garcia", "Okafor", "Muller", "Rossi", "Haddad", "Sato", "Brown", "Khan"]
+TITLES = [
+    "Senior Software Engineer", "Backend Developer", "Data Scientist", "Product Manager",
+    "DevOps Engineer", "Frontend Developer", "Team Lead", "Business Analyst", "Solutions Architect"
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Analytics", "Vandelay"]
+DEGREES = [
+    "Bachelor of Science in Computer Science", "Master of Science in Data Science",
+    "B.Tech in Information Technology", "MBA", "PhD in Mathematics", "Bachelor of Engineering"
+]
+SCHOOLS = ["State University", "Institute of Technology", "City College", "National University"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+SENTENCES = [
+    "Designed and operated services handling millions of requests per day.",
+    "Led a cross-functional team delivering customer facing features on schedule.",
+    "Reduced infrastructure costs by consolidating workloads and tuning queries.",
+    "Mentored junior engineers and ran the weekly architecture review.",
+    "Worked closely with stakeholders to gather requirements and plan releases.",
+    "Improved test coverage and introduced continuous delivery for the platform.",
+    "Built dashboards and reports used by the executive team every week.",
+]
+
+# Roughly 55 lines of 10pt text fit on a US Letter page
+LINES_PER_PAGE = 55
+
+def generate_resume_lines(rng: random.Random, pages: int, skill_density: float, headers: bool) -> List[str]:
+    """Build the lines of one resume.
+
+    skill_density is the probability that a description line mentions skills;
+    headers=False drops the section headers to exercise the parser's fallbacks.
+    """
+    taxonomy = get_skill_taxonomy()
+    skills = sorted(taxonomy.skills.surface_forms.values())
+    certifications = sorted(set(taxonomy.certifications.surface_forms.values()))
+
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@example.com | +1 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+    ]
+
+    def header(title: str) -> None:
+        if headers:
+            lines.append(title)
+
+    header("Summary")
+    lines.append(f"{rng.choice(TITLES)} with {rng.randint(2, 20)} years of experience. {rng.choice(SENTENCES)}")
+
+    header("Experience")
+    year = 2024
+    target = pages * LINES_PER_PAGE
+    while len(lines) < target - 12:
+        start = year - rng.randint(1, 4)
+        lines.append(rng.choice(TITLES))
+        lines.append(rng.choice(COMPANIES))
+        lines.append(f"{rng.choice(MONTHS)} {start} - {rng.choice(MONTHS)} {year}" if year < 2024 else f"{rng.choice(MONTHS)} {start} - Present")
+        for _ in range(rng.randint(3, 8)):
+            line = rng.choice(SENTENCES)
+            if rng.random() < skill_density:
+                line += " Used " + ", ".join(rng.sample(skills, rng.randint(1, 4))) + "."
+            lines.append(line)
+        year = start if start > 1985 else 2024
+
+    header("Education")
+    for _ in range(rng.randint(1, 2)):
+        lines.append(rng.choice(DEGREES))
+        lines.append(f"{rng.choice(SCHOOLS)} {rng.randint(1990, 2022)}")
+
+    header("Skills")
+    lines.append(", ".join(rng.sample(skills, max(3, int(25 * skill_density)))))
+
+    if rng.random() < 0.6:
+        header("Certifications")
+        lines.extend(rng.sample(certifications, rng.randint(1, 3)))
+
+    return lines
+
+def _pdf_escape(line: str) -> str:
+    line = line.encode("latin-1", "replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def write_pdf(path: str, lines: List[str]) -> None:
+    """Write lines as a minimal multi-page text PDF (Helvetica 10pt, US Letter)"""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    font_id = 3
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page_lines in pages:
+        content = "BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(f"({_pdf_escape(line)}) Tj T*" for line in page_lines) + " ET"
+        content_bytes = content.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content_bytes) + content_bytes + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (font_id, content_id)
+        )
+        page_ids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(page_ids)
+    )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+    with open(path, "wb") as file:
+        file.write(output)
+
+def write_docx(path: str, lines: List[str]) -> None:
+    """Write lines as DOCX paragraphs"""
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+def generate_corpus(output_dir: str, count: int, seed: int = 42, max_pages: int = 4) -> List[Dict[str, Any]]:
+    """Write count resumes (alternating PDF/DOCX) and return their descriptors"""
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(count):
+        pages = rng.randint(1, max_pages)
+        skill_density = round(rng.choice([0.1, 0.3, 0.6, 0.9]), 2)
+        headers = rng.random() < 0.85
+        fmt = "pdf" if index % 2 == 0 else "docx"
+        filename = f"resume_{index:05d}_{pages}p.{fmt}"
+        path = os.path.join(output_dir, filename)
+
+        lines = generate_resume_lines(rng, pages, skill_density, headers)
+        (write_pdf if fmt == "pdf" else write_docx)(path, lines)
+        corpus.append({
+            "filename": filename,
+            "path": path,
+            "format": fmt,
+            "pages": pages,
+            "skill_density": skill_density,
+            "headers": headers,
+            "bytes": os.path.getsize(path)
+        })
+    return corpus
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_dir")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-pages", type=int, default=4)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.output_dir, args.count, args.seed, args.max_pages)
+    with open(os.path.join(args.output_dir, "corpus.json"), "w") as file:
+        json.dump(corpus, file, indent=2)
+    print(f"Wrote {len(corpus)} resumes to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
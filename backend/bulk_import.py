@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import asyncio
+import json
+from app.database import SessionLocal
+from app.services.bulk_import import BulkImportService
+
+def print_progress(report):
+    print(
+        f"  {report['processed']}/{report['total']} processed "
+        f"({report['imported']} imported, {report['skipped']} skipped, {report['failed']} failed) "
+        f"- {report['files_per_second']} files/s"
+    )
+
+def bulk_import(source, job_id, workers=None, batch_size=None, report_path=None):
+    if not os.path.exists(source):
+        print(f"Source not found: {source}")
+        return 1
+    
+    db = SessionLocal()
+    try:
+        service = BulkImportService(workers=workers, batch_size=batch_size)
+        print(f"Importing {source} into job {job_id} with {service.workers} parser processes...")
+        report = asyncio.run(service.run(db, job_id, source, on_progress=print_progress))
+    finally:
+        db.close()
+    
+    for error in report["errors"]:
+        print(f"  [{error['status']}] {error['file']}: {error['error']}")
+    print(f"\nImport {report['import_id']} {report['status']}: {report['imported']} of {report['total']} files imported")
+    
+    if report_path:
+        with open(report_path, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Report written to {report_path}")
+    
+    return 0 if report["status"] == "completed" else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a directory or ZIP of resumes as applications for a job")
+    parser.add_argument("source", help="Directory or .zip file containing PDF/DOCX resumes")
+    parser.add_argument("--job-id", type=int, required=True, help="Job to apply the candidates to")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: one per CPU core)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Files per database transaction")
+    parser.add_argument("--report", default=None, help="Write the JSON report to this file")
+    args = parser.parse_args()
+    sys.exit(bulk_import(args.source, args.job_id, args.workers, args.batch_size, args.report))
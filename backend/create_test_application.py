@@ -86,6 +86,13 @@ def create_test_applications():
             )
             
             db.add(score)
+            
+            # Current score is read from the application itself
+            application.final_score = score.final_score
+            application.match_score = score.match_score
+            application.ats_score = score.ats_score
+            application.ai_feedback = score.ai_feedback
+            application.scored_at = datetime.utcnow()
             db.commit()
             
             print(f"Created application: {application.full_name} -> {job.title} (Ref: {reference_number})")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI-compatible chat completion server for offline load tests.
+
+Serves POST /v1/chat/completions (plain and streamed) with the stub
+provider's canned JSON answers, latency and injected failures. Point the
+API at it to exercise the real OpenAI client, connection pool, retries
+and circuit breaker without calling OpenAI:
+
+    python llm_stub_server.py --port 8001 --latency 0.5 --failure-rate 0.05
+    LLM_BASE_URL=http://localhost:8001/v1 uvicorn app.main:app
+"""
+
+import argparse
+import json
+import sys
+import os
+import time
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.services.llm_providers import StubProvider, StubProviderError
+
+app = FastAPI(title="LLM stub server")
+provider = StubProvider()
+
+def error_response(error: StubProviderError) -> JSONResponse:
+    return JSONResponse(
+        status_code=error.status_code,
+        content={"error": {"message": str(error), "type": "stub_error"}},
+        headers=dict(error.response.headers)
+    )
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "stub")
+    messages = body.get("messages", [])
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    created = int(time.time())
+
+    try:
+        if not body.get("stream"):
+            completion = await provider.complete(model, messages)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": completion.content}, "finish_reason": "stop"}],
+                "usage": {
+                    "prompt_tokens": completion.prompt_tokens,
+                    "completion_tokens": completion.completion_tokens,
+                    "total_tokens": completion.prompt_tokens + completion.completion_tokens
+                }
+            }
+        pieces = await provider.stream(model, messages)
+    except StubProviderError as e:
+        return error_response(e)
+
+    async def events():
+        async for text in pieces:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        done = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+        }
+        yield f"data: {json.dumps(done)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=None, help="Seconds before the first token (default LLM_STUB_LATENCY)")
+    parser.add_argument("--token-latency", type=float, default=None, help="Seconds per streamed piece")
+    parser.add_argument("--failure-rate", type=float, default=None, help="Fraction of calls answered with a 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=None, help="Fraction of calls answered with a 429")
+    args = parser.parse_args()
+
+    global provider
+    provider = StubProvider(args.latency, args.token_latency, args.failure_rate, args.rate_limit_rate)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
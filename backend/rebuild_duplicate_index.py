@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal, create_tables
+from app.services.duplicate_detection import DuplicateDetectionService
+
+def rebuild_duplicate_index():
+    create_tables()
+    db = SessionLocal()
+    
+    try:
+        print("Rebuilding near-duplicate resume index...")
+        counts = DuplicateDetectionService().rebuild(db)
+        print(f"Indexed {counts['indexed']} applications, {counts['flagged']} flagged as near-duplicates")
+    except Exception as e:
+        print(f"Error rebuilding duplicate index: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_duplicate_index()
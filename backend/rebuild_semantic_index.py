@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal, create_tables
+from app.services.semantic_match import SemanticMatchService
+
+def rebuild_semantic_index():
+    create_tables()
+    db = SessionLocal()
+    
+    try:
+        print("Rebuilding document frequencies and semantic vectors...")
+        counts = SemanticMatchService().rebuild(db)
+        print(f"Vectorized {counts['resumes']} resumes and {counts['jobs']} published jobs")
+    except Exception as e:
+        print(f"Error rebuilding semantic index: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_semantic_index()
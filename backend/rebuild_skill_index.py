@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal, create_tables
+from app.services.skill_index import SkillIndexService
+
+def rebuild_skill_index():
+    create_tables()
+    db = SessionLocal()
+    
+    try:
+        print("Rebuilding application skill index...")
+        indexed = SkillIndexService().rebuild(db)
+        print(f"Indexed skills for {indexed} applications")
+    except Exception as e:
+        print(f"Error rebuilding skill index: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_skill_index()
@@ -0,0 +1,104 @@
+import random
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from app.models.job import Job
+from app.models.application import Application
+from app.services.scoring_service import ScoringService
+from app.services.batch_scoring import BatchScoringService
+from app.services.semantic_match import SemanticInputs
+from app.utils.semantic_vectors import hashed_frequencies, tf_vector, tfidf_vector
+
+SCORE_FIELDS = [
+    "match_score", "ats_score", "final_score", "skills_match", "experience_match", "education_match",
+    "certification_match", "semantic_match", "ats_format_score", "ats_keywords_score", "ats_structure_score",
+    "scoring_details", "ai_feedback", "inputs_hash"
+]
+SKILLS = ["Python", "Go", "Docker", "Kubernetes", "AWS", "React", "SQL", "Terraform", "Java", "Rust", "Kafka", "Redis"]
+CERTIFICATIONS = ["AWS Certified", "CKA", "PMP", "CISSP", "Scrum Master"]
+DEGREES = ["Bachelor of Science", "Master of Science", "MBA", "PhD in Physics", "B.Tech", ""]
+WORDS = [f"term{index}" for index in range(500)] + [skill.lower() for skill in SKILLS]
+
+def random_features(rng: random.Random):
+    return hashed_frequencies({word: rng.randint(1, 5) for word in rng.sample(WORDS, rng.randint(5, 60))})
+
+def make_cohort(count: int, seed: int):
+    """A job and applications with varied, sometimes empty or odd-cased parsed data, plus their TF-IDF vectors"""
+    rng = random.Random(seed)
+    job_skills = rng.sample(SKILLS, 6)
+    # Duplicates and mixed case in the job's list exercise the denominator rules
+    job = Job(id=1, key_skills=job_skills + [job_skills[0].upper()], certifications=rng.sample(CERTIFICATIONS, 2))
+    document_counts = {feature: rng.randint(1, 1000) for feature in hashed_frequencies({word: 1 for word in WORDS})}
+    job_features = random_features(rng)
+    job.description_vector = tf_vector(job_features)
+
+    applications, resume_vectors = [], {}
+    for index in range(count):
+        if rng.random() < 0.9:
+            resume_vectors[f"resume-{index}"] = tfidf_vector(random_features(rng), document_counts, 1000)
+        applications.append(Application(
+            id=index + 1,
+            job_id=1,
+            resume_filename=rng.choice(["resume.pdf", "resume.DOCX", "resume.doc", "resume.txt"]),
+            resume_hash=f"resume-{index}",
+            parsed_skills=rng.choice([None, []]) if rng.random() < 0.1 else [
+                rng.choice([skill, skill.lower(), skill.upper()]) for skill in rng.sample(SKILLS, rng.randint(1, 12))
+            ],
+            parsed_experience=[{"title": "Engineer"}] * rng.randint(0, 4),
+            parsed_education=[{"degree": rng.choice(DEGREES)} for _ in range(rng.randint(0, 2))],
+            parsed_certifications=rng.sample(CERTIFICATIONS, rng.randint(0, 3))
+        ))
+    return job, applications, SemanticInputs(tfidf_vector(job_features, document_counts, 1000), resume_vectors)
+
+@pytest.mark.parametrize("semantic_weight", [0.0, 0.2])
+def test_batch_scores_match_per_application_scores(semantic_weight):
+    scoring_service = ScoringService()
+    scoring_service.semantic_weight = semantic_weight
+    batch_service = BatchScoringService(scoring_service)
+    job, applications, semantic = make_cohort(500, seed=7)
+
+    batch = batch_service.build_scores(job, applications, semantic)
+
+    assert len(batch) == len(applications)
+    for application, (score, status) in zip(applications, batch):
+        expected = scoring_service.build_score(job, application, semantic)
+        for field in SCORE_FIELDS:
+            got, want = getattr(score, field), getattr(expected, field)
+            assert got == want and type(got) is type(want), f"application {application.id}: {field}"
+        assert status == scoring_service.determine_candidate_status(expected.final_score)[1]
+
+def test_empty_cohort():
+    assert BatchScoringService(ScoringService()).build_scores(Job(id=1, key_skills=["Go"]), []) == []
+
+def test_final_score_is_weighted_average_of_components():
+    scoring_service = ScoringService()
+    scoring_service.match_weight, scoring_service.ats_weight, scoring_service.semantic_weight = 0.5, 0.5, 0.5
+    job, applications, semantic = make_cohort(200, seed=11)
+
+    for score, _ in BatchScoringService(scoring_service).build_scores(job, applications, semantic):
+        expected = (score.match_score + score.ats_score + score.semantic_match) / 3
+        assert score.final_score == pytest.approx(expected, abs=0.01)
+        assert 0 <= score.final_score <= 100
+
+def test_rescoring_keeps_statuses_set_by_hand():
+    scoring_service = ScoringService()
+    job, applications, semantic = make_cohort(3, seed=3)
+    applications[0].status = "under_review"
+    applications[1].status = "interview_scheduled"
+    applications[2].status, applications[2].status_manual = "shortlisted", True
+
+    for application, (score, _) in zip(applications, BatchScoringService(scoring_service).build_scores(job, applications, semantic)):
+        scoring_service.save_score(SimpleNamespace(add=lambda row: None), application, score, "rejected")
+
+    assert [application.status for application in applications] == ["rejected", "interview_scheduled", "shortlisted"]
+
+def test_rescoring_keeps_llm_feedback():
+    scoring_service = ScoringService()
+    job, applications, semantic = make_cohort(2, seed=5)
+    applications[0].ai_feedback, applications[0].ai_feedback_generated_at = "Written by the model.", datetime(2024, 1, 1)
+
+    for application, (score, status) in zip(applications, BatchScoringService(scoring_service).build_scores(job, applications, semantic)):
+        scoring_service.save_score(SimpleNamespace(add=lambda row: None), application, score, status)
+
+    assert applications[0].ai_feedback == "Written by the model."
+    assert applications[1].ai_feedback and applications[1].ai_feedback != "Written by the model."
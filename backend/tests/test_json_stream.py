@@ -0,0 +1,38 @@
+from collections import defaultdict
+from app.utils.json_stream import JsonFieldStream
+
+COMPLETION = (
+    '```json\n{"title": "Senior \\"Go\\" dev\\n", "count": 3, "meta": {"title": "nested"}, '
+    '"tags": ["a", "b"], "summary": "caf\\u00e9 \\ud83d\\ude00 \\/ \\t"}\n```'
+)
+
+def decode(chunks):
+    stream = JsonFieldStream()
+    fields = defaultdict(str)
+    for chunk in chunks:
+        for field, text in stream.feed(chunk):
+            fields[field] += text
+    return dict(fields)
+
+def test_top_level_string_fields_are_decoded():
+    assert decode([COMPLETION]) == {"title": 'Senior "Go" dev\n', "summary": "caf\u00e9 \U0001F600 / \t"}
+
+def test_any_chunk_boundary_decodes_the_same():
+    expected = decode([COMPLETION])
+    assert decode(list(COMPLETION)) == expected
+    for size in (2, 3, 5, 7):
+        assert decode([COMPLETION[i:i + size] for i in range(0, len(COMPLETION), size)]) == expected
+
+def test_escape_split_across_chunks():
+    assert decode(['{"a": "x\\', 'ny\\u00', 'e9\\ud83d', '\\ude00"}']) == {"a": "x\ny\u00e9\U0001F600"}
+
+def test_values_stream_before_the_object_is_complete():
+    stream = JsonFieldStream()
+    assert stream.feed('{"title": "Back') == [("title", "Back")]
+    assert stream.feed('end", "desc') == [("title", "end")]
+    assert stream.feed('ription": "Builds') == [("description", "Builds")]
+
+def test_text_after_the_object_is_ignored():
+    stream = JsonFieldStream()
+    assert stream.feed('{"a": "b"} {"c": "d"}') == [("a", "b")]
+    assert stream.feed('"e"') == []
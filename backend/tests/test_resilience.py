@@ -0,0 +1,117 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+import httpx
+import pytest
+from app.utils.resilience import (
+    CircuitBreaker, ConcurrencyLimiter, ConcurrencyTimeoutError, backoff_delay, retry_after_seconds
+)
+
+def rate_limited(headers):
+    return SimpleNamespace(response=httpx.Response(429, headers=headers))
+
+def test_concurrency_limit_holds_across_event_loops():
+    limiter = ConcurrencyLimiter(2, timeout=5)
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    async def hold():
+        nonlocal active, peak
+        async with limiter.slot():
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            with lock:
+                active -= 1
+
+    async def several():
+        await asyncio.gather(*(hold() for _ in range(3)))
+
+    # One loop per thread, as in worker threads running tasks
+    threads = [threading.Thread(target=asyncio.run, args=(several(),)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak == 2
+
+def test_concurrency_limiter_times_out_and_keeps_slots():
+    limiter = ConcurrencyLimiter(1, timeout=0.05)
+
+    async def run():
+        async with limiter.slot():
+            with pytest.raises(ConcurrencyTimeoutError):
+                async with limiter.slot():
+                    pass
+        # The slot is free again once released
+        async with limiter.slot():
+            pass
+
+    asyncio.run(run())
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("llm", failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+def test_half_open_breaker_lets_one_probe_through():
+    breaker = CircuitBreaker("llm", failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    breaker.opened_at -= 60
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    # Everyone else keeps failing fast while the probe runs
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+def test_failed_probe_reopens_and_successful_probe_closes():
+    breaker = CircuitBreaker("llm", failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    breaker.opened_at -= 60
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    breaker.opened_at -= 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+    assert breaker.allow()
+
+def test_retry_after_seconds_and_milliseconds():
+    assert retry_after_seconds(rate_limited({"Retry-After": "7"})) == 7.0
+    assert retry_after_seconds(rate_limited({"retry-after": "1.5"})) == 1.5
+    # The millisecond header is more precise and wins
+    assert retry_after_seconds(rate_limited({"Retry-After": "7", "Retry-After-Ms": "250"})) == 0.25
+    assert retry_after_seconds(rate_limited({"Retry-After": "-3"})) == 0.0
+
+def test_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 <= retry_after_seconds(rate_limited({"Retry-After": format_datetime(retry_at, usegmt=True)})) <= 30
+    past = datetime.now(timezone.utc) - timedelta(minutes=5)
+    assert retry_after_seconds(rate_limited({"Retry-After": format_datetime(past, usegmt=True)})) == 0.0
+
+@pytest.mark.parametrize("exc", [
+    rate_limited({}),
+    rate_limited({"Retry-After": "soon"}),
+    rate_limited({"Retry-After-Ms": "later"}),
+    ValueError("no response"),
+    SimpleNamespace(response=None),
+])
+def test_missing_or_malformed_retry_after_is_ignored(exc):
+    assert retry_after_seconds(exc) is None
+
+def test_backoff_respects_retry_after_floor_and_cap():
+    for attempt in range(8):
+        assert 0 <= backoff_delay(attempt, base=0.5, cap=4) <= 4
+        assert 10 <= backoff_delay(attempt, base=0.5, cap=4, retry_after=10) <= 10.5
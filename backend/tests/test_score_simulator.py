@@ -0,0 +1,33 @@
+import numpy as np
+from app.services.score_simulator import ScoreSimulatorService
+
+def components(semantic, has_semantic):
+    count = len(semantic)
+    return {
+        "ids": np.arange(1, count + 1),
+        "job_ids": np.ones(count, dtype=np.int64),
+        "match_score": np.linspace(40, 95, count),
+        "ats_score": np.linspace(50, 90, count),
+        "semantic_match": np.array(semantic, dtype=np.float64),
+        "has_semantic": np.array(has_semantic)
+    }
+
+def test_semantic_weight_leaves_out_applications_scored_without_it():
+    simulator = ScoreSimulatorService()
+    simulator.scoring_service.match_weight, simulator.scoring_service.ats_weight, simulator.scoring_service.semantic_weight = 0.5, 0.5, 0.0
+    configs = simulator.resolve_configs([{"semantic_score_weight": 0.5}])
+
+    result = simulator.simulate(None, components([0.0] * 20, [False] * 20), configs, max_flipped=0)
+
+    assert result["missing_semantic_match"] == 20
+    assert result["results"][0]["flipped_total"] == 0
+
+def test_semantic_weight_counts_where_stored():
+    simulator = ScoreSimulatorService()
+    simulator.scoring_service.match_weight, simulator.scoring_service.ats_weight, simulator.scoring_service.semantic_weight = 0.5, 0.5, 0.0
+    configs = simulator.resolve_configs([{"semantic_score_weight": 1.0}])
+
+    result = simulator.simulate(None, components([0.0] * 10 + [100.0] * 10, [True] * 20), configs, max_flipped=0)
+
+    assert result["missing_semantic_match"] == 0
+    assert result["results"][0]["flipped_total"] > 0
@@ -0,0 +1,29 @@
+import numpy as np
+from app.utils.semantic_vectors import (
+    apply_idf, cosine_similarities, decode_vector, hashed_frequencies, idf_weights, tf_vector, tfidf_vector
+)
+
+RESUME = hashed_frequencies({"python": 3, "kubernetes": 1, "team": 2, "the": 9})
+JOB = hashed_frequencies({"python": 1, "kubernetes": 2, "the": 5})
+
+def test_idf_applied_at_scoring_matches_direct_tfidf():
+    document_counts = {feature: count for feature, count in zip(sorted(RESUME), [40, 3, 700, 999])}
+
+    weighted = apply_idf(tf_vector(RESUME), idf_weights(document_counts, 1000))
+    direct = tfidf_vector(RESUME, document_counts, 1000)
+
+    (weighted_indices, weighted_values), (direct_indices, direct_values) = decode_vector(weighted), decode_vector(direct)
+    assert weighted_indices.tolist() == direct_indices.tolist()
+    assert np.allclose(weighted_values, direct_values, atol=1e-6)
+
+def test_stored_vectors_follow_document_frequency_changes():
+    resume, job = tf_vector(RESUME), tf_vector(JOB)
+
+    def similarity(document_counts):
+        weights = idf_weights(document_counts, 1000)
+        return cosine_similarities(apply_idf(job, weights), [apply_idf(resume, weights)])[0]
+
+    # Once "the" turns out to be in every document, it counts for less in the same stored vectors
+    rare = similarity({})
+    common = similarity({next(iter(hashed_frequencies({"the": 1}))): 1000})
+    assert common < rare
@@ -0,0 +1,42 @@
+import pytest
+from app.utils.skill_query import MAX_QUERY_TERMS, SkillQueryError, parse_skill_query, positive_terms
+
+def test_precedence_and_grouping():
+    assert parse_skill_query("kubernetes AND (go OR rust) NOT java") == ("and", [
+        ("term", "kubernetes"),
+        ("or", [("term", "go"), ("term", "rust")]),
+        ("not", ("term", "java"))
+    ])
+    # AND binds tighter than OR
+    assert parse_skill_query("python docker or java") == ("or", [
+        ("and", [("term", "python"), ("term", "docker")]),
+        ("term", "java")
+    ])
+
+def test_symbol_operators_commas_and_quoted_skills():
+    assert parse_skill_query('python, "machine learning" || !php') == ("or", [
+        ("and", [("term", "python"), ("term", "machine learning")]),
+        ("not", ("term", "php"))
+    ])
+    assert parse_skill_query("c++ && ! c#") == ("and", [("term", "c++"), ("not", ("term", "c#"))])
+
+def test_terms_map_to_canonical_skills():
+    assert parse_skill_query("golang") == ("term", "go")
+    assert parse_skill_query("K8s") == ("term", "kubernetes")
+
+def test_positive_terms_skip_negated_skills():
+    query = parse_skill_query("(python OR go) NOT (java OR NOT rust) python")
+    assert positive_terms(query) == ["python", "go", "rust"]
+
+@pytest.mark.parametrize("query", [
+    "", "   ", '""', "(python", "python)", "python AND", "OR python", "NOT", "()", '"machine learning',
+    "python AND AND go", "python (", ",",
+])
+def test_malformed_queries_are_rejected(query):
+    with pytest.raises(SkillQueryError):
+        parse_skill_query(query)
+
+def test_query_size_is_capped():
+    parse_skill_query(" ".join(["python"] * MAX_QUERY_TERMS))
+    with pytest.raises(SkillQueryError):
+        parse_skill_query(" ".join(["python"] * (MAX_QUERY_TERMS + 1)))
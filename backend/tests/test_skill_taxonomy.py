@@ -0,0 +1,36 @@
+from app.utils.resume_parser import extract_skills
+from app.utils.skill_taxonomy import get_skill_taxonomy
+
+def test_everyday_words_are_not_skills():
+    prose = (
+        "I will go to the office with a spark of creativity, rails on the stairs, "
+        "a lambda expression, the rag was wet, node in a graph, ml of water, qa session, ux"
+    )
+    assert extract_skills(prose) == []
+
+def test_case_sensitive_terms_match_as_written():
+    skills = extract_skills("Skills: Go, Spark, Rails, Node, Lambda, RAG, ML, QA, UX")
+    assert skills == [
+        "Go", "Apache Spark", "Ruby on Rails", "Node.js", "AWS Lambda",
+        "Retrieval-Augmented Generation", "Machine Learning", "Quality Assurance", "UX Design"
+    ]
+
+def test_capitalized_term_at_sentence_start_or_hyphenated_is_ignored():
+    assert extract_skills("Shipped the release. Go-to-market plan agreed. Spark joy.") == []
+
+def test_unambiguous_synonyms_still_match_in_any_case():
+    assert extract_skills("golang, PySpark, node.js and machine learning") == [
+        "Go", "Apache Spark", "Node.js", "Machine Learning"
+    ]
+
+def test_canonicalize_accepts_case_sensitive_terms_in_any_case():
+    taxonomy = get_skill_taxonomy()
+    assert taxonomy.canonicalize("go") == "Go"
+    assert taxonomy.canonicalize("ml") == "Machine Learning"
+
+def test_spaced_js_names_are_not_taken_for_javascript():
+    for spelling in ("Node JS", "node js", "Node-JS", "NodeJS", "Node.js"):
+        assert extract_skills(f"Wrote it in {spelling}") == ["Node.js"]
+    assert extract_skills("React JS, Next JS and D3 JS") == ["React", "Next.js", "D3.js"]
+    assert extract_skills("JS and TypeScript") == ["JavaScript", "TypeScript"]
+    assert get_skill_taxonomy().canonicalize("node js") == "Node.js"
@@ -0,0 +1,58 @@
+import pytest
+from app.utils.token_budget import ELLIPSIS, PromptBudget, count_message_tokens, count_tokens, truncate, truncate_items
+
+TEXT = "Designs and operates Kubernetes clusters for payment services across three regions"
+
+def test_text_within_budget_is_unchanged():
+    assert truncate(TEXT, count_tokens(TEXT)) == TEXT
+    assert truncate("", 0) == ""
+
+def test_truncate_keeps_a_word_aligned_prefix_within_budget():
+    first_word = count_tokens("Designs") + count_tokens(ELLIPSIS)
+    for max_tokens in range(first_word, count_tokens(TEXT)):
+        shortened = truncate(TEXT, max_tokens)
+        assert shortened.endswith(ELLIPSIS)
+        assert count_tokens(shortened) <= max_tokens
+        kept = shortened[:-len(ELLIPSIS)]
+        assert TEXT.startswith(kept)
+        assert TEXT[len(kept)] == " "
+
+@pytest.mark.parametrize("max_tokens", [2, 1, 0, -1, -50])
+def test_budget_without_room_for_a_word_gives_empty_text(max_tokens):
+    # "Designs" alone is two tokens, plus one for the ellipsis
+    assert truncate(TEXT, max_tokens) == ""
+
+def test_truncate_items_reports_what_was_left_out():
+    skills = ["Python", "Go", "Kubernetes", "PostgreSQL"]
+    assert truncate_items(skills, 100) == skills
+    assert truncate_items(skills, 4) == ["Python", "and 3 more"]
+    assert truncate_items(skills, 5) == ["Python", "Go", "and 2 more"]
+    assert truncate_items([], 3) == []
+
+def test_truncate_items_shortens_an_oversized_first_item():
+    assert truncate_items([TEXT, "Go"], 3) == [truncate(TEXT, 3), "and 1 more"]
+
+@pytest.mark.parametrize("max_tokens", [1, 0, -5])
+def test_truncate_items_without_budget_only_counts(max_tokens):
+    assert truncate_items(["Python", "Go"], max_tokens) == ["and 2 more"]
+
+def test_message_tokens_include_chat_overhead():
+    messages = [{"role": "system", "content": ""}, {"role": "user", "content": TEXT}]
+    assert count_message_tokens(messages) > count_tokens(TEXT)
+
+def test_completion_room_shrinks_with_the_prompt():
+    budget = PromptBudget(context_tokens=1000, max_completion_tokens=300, min_completion_tokens=100)
+    assert budget.completion_tokens(500) == 300
+    assert budget.completion_tokens(800) == 200
+    assert budget.overflow(800) == 0
+    assert budget.overflow(950) == 50
+    # A prompt filling or exceeding the context leaves nothing, never a negative max_tokens
+    assert budget.completion_tokens(1000) == 0
+    assert budget.completion_tokens(1200) == 0
+    assert budget.overflow(1200) == 300
+
+def test_minimum_completion_never_exceeds_the_maximum():
+    budget = PromptBudget(context_tokens=1000, max_completion_tokens=50, min_completion_tokens=200)
+    assert budget.min_completion_tokens == 50
+    assert budget.overflow(950) == 0
+    assert budget.overflow(960) == 10